@@ -0,0 +1,303 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from webagent.tools.storage import get_cache_dir
+
+
+# Whether runs evicted from memory are written to disk instead of being dropped
+SPILL_ENABLED = os.environ.get("WEBAGENT_ARTIFACT_SPILL", "true").lower() in ("1", "true", "yes")
+
+# Megabytes of reports and task outputs kept in memory before the oldest runs are spilled or dropped
+DEFAULT_MEMORY_MB = float(os.environ.get("WEBAGENT_ARTIFACT_MEMORY_MB", "64"))
+
+# Maximum number of runs kept in memory
+DEFAULT_MAX_RUNS = int(os.environ.get("WEBAGENT_ARTIFACT_RUNS", "100"))
+
+# Hours a spilled run is kept on disk
+DEFAULT_RETENTION_HOURS = float(os.environ.get("WEBAGENT_ARTIFACT_RETENTION_HOURS", "24"))
+
+# Seconds between sweeps of expired runs off the disk
+PRUNE_INTERVAL = 600
+
+# Name of the final report among a run's artifacts; the others are named after their task
+REPORT = "report"
+
+
+@dataclass
+class _Run:
+    created_at: float = field(default_factory=time.time)
+    artifacts: Dict[str, str] = field(default_factory=dict)
+    size: int = 0
+
+
+def new_run_id() -> str:
+    """
+    Create an ID for a research run.
+
+    Returns:
+        A random hexadecimal ID
+    """
+    return uuid.uuid4().hex
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    # Write to a temporary file next to the target and rename it over, so
+    # readers never see a partial file
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(descriptor, "wb") as f:
+            f.write(data)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+class ArtifactStore:
+    """
+    Keep each research run's report and task outputs, keyed by run ID.
+
+    Runs live in memory, so concurrent runs never overwrite each other and
+    callers get their results without a disk round-trip. Once the store
+    holds more than max_runs runs or memory_mb megabytes, the runs written
+    to least recently are spilled to a content-addressed directory: every artifact is stored
+    once under the SHA-256 of its content, with one JSON manifest per run
+    mapping artifact names to digests. All files are written atomically.
+    Spilled runs stay readable until they are retention_hours old; writing
+    to a spilled run brings its earlier artifacts back into memory.
+    """
+
+    def __init__(
+        self,
+        spill_dir: Optional[str] = None,
+        memory_mb: float = DEFAULT_MEMORY_MB,
+        max_runs: int = DEFAULT_MAX_RUNS,
+        retention_hours: float = DEFAULT_RETENTION_HOURS,
+    ):
+        """
+        Create an empty store.
+
+        Args:
+            spill_dir: Directory that evicted runs are written to, or None to drop them
+            memory_mb: Megabytes of artifacts kept in memory
+            max_runs: Maximum number of runs kept in memory
+            retention_hours: Hours a spilled run is kept on disk
+        """
+        self.spill_dir = spill_dir
+        self.memory_bytes = int(memory_mb * 1024 * 1024)
+        self.max_runs = max(1, max_runs)
+        self.retention_seconds = retention_hours * 3600
+        self._runs: "OrderedDict[str, _Run]" = OrderedDict()
+        # Runs evicted from memory whose files are still being written
+        self._spilling: Dict[str, _Run] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        # Serializes spilling and pruning, so a sweep never deletes an artifact a manifest is about to name
+        self._disk_lock = threading.Lock()
+        self._last_prune = 0.0
+        self._counters = {"artifacts_stored": 0, "runs_spilled": 0, "runs_dropped": 0, "runs_expired": 0}
+
+    def put(self, run_id: str, name: str, content: str) -> None:
+        """
+        Store an artifact of a run, replacing any artifact of the same name.
+
+        Args:
+            run_id: The ID of the run
+            name: The artifact name, e.g. a task name or REPORT
+            content: The artifact content
+        """
+        with self._lock:
+            evicted = run_id not in self._runs and run_id not in self._spilling
+        # A run evicted while it was still being written to picks up where it left off
+        earlier = self._load(run_id) if evicted else None
+
+        spilled = []
+        with self._lock:
+            run = self._runs.get(run_id)
+            if run is None:
+                earlier = self._spilling.get(run_id) or earlier
+                run = self._runs[run_id] = _Run()
+                if earlier is not None:
+                    run.created_at = earlier.created_at
+                    run.artifacts = dict(earlier.artifacts)
+                    run.size = sum(len(artifact) for artifact in run.artifacts.values())
+                    self._size += run.size
+            # Runs are evicted least recently written first, so a running job keeps its place
+            self._runs.move_to_end(run_id)
+            previous = run.artifacts.get(name)
+            change = len(content) - (len(previous) if previous is not None else 0)
+            run.artifacts[name] = content
+            run.size += change
+            self._size += change
+            self._counters["artifacts_stored"] += 1
+
+            # Evict the least recently written runs; the one just written to is last
+            while (len(self._runs) > self.max_runs or self._size > self.memory_bytes) and len(self._runs) > 1:
+                oldest_id = next(iter(self._runs))
+                oldest = self._runs.pop(oldest_id)
+                self._size -= oldest.size
+                self._spilling[oldest_id] = oldest
+                spilled.append((oldest_id, oldest))
+
+        # Disk writes happen outside the lock so readers of other runs are not held up
+        for spilled_id, spilled_run in spilled:
+            self._spill(spilled_id, spilled_run)
+
+    def get(self, run_id: str, name: str) -> Optional[str]:
+        """
+        Get an artifact of a run.
+
+        Args:
+            run_id: The ID of the run
+            name: The artifact name
+
+        Returns:
+            The artifact content, or None if the run or artifact is unknown or expired
+        """
+        return self.get_run(run_id).get(name)
+
+    def get_run(self, run_id: str) -> Dict[str, str]:
+        """
+        Get every artifact of a run.
+
+        Args:
+            run_id: The ID of the run
+
+        Returns:
+            The artifacts by name, in the order they were stored; empty if the run is unknown or expired
+        """
+        with self._lock:
+            run = self._runs.get(run_id) or self._spilling.get(run_id)
+            if run is not None:
+                return dict(run.artifacts)
+        run = self._load(run_id)
+        return run.artifacts if run is not None else {}
+
+    def _manifest_path(self, run_id: str) -> str:
+        return os.path.join(self.spill_dir, "runs", f"{run_id}.json")
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.spill_dir, "objects", digest[:2], digest[2:])
+
+    def _spill(self, run_id: str, run: _Run) -> None:
+        try:
+            if self.spill_dir is None:
+                with self._lock:
+                    self._counters["runs_dropped"] += 1
+                return
+
+            manifest = {"created_at": run.created_at, "artifacts": {}}
+            with self._disk_lock:
+                for name, content in run.artifacts.items():
+                    data = content.encode("utf-8", "surrogatepass")
+                    digest = hashlib.sha256(data).hexdigest()
+                    # Identical content is stored once, whichever run or task produced it
+                    if not os.path.exists(self._blob_path(digest)):
+                        _atomic_write(self._blob_path(digest), data)
+                    manifest["artifacts"][name] = digest
+                _atomic_write(self._manifest_path(run_id), json.dumps(manifest).encode("utf-8"))
+            with self._lock:
+                self._counters["runs_spilled"] += 1
+        finally:
+            with self._lock:
+                self._spilling.pop(run_id, None)
+
+        if time.time() - self._last_prune > PRUNE_INTERVAL:
+            self.prune()
+
+    def _load(self, run_id: str) -> Optional[_Run]:
+        if self.spill_dir is None:
+            return None
+        try:
+            with open(self._manifest_path(run_id), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if time.time() - manifest["created_at"] > self.retention_seconds:
+                return None
+            run = _Run(created_at=manifest["created_at"])
+            for name, digest in manifest["artifacts"].items():
+                with open(self._blob_path(digest), "rb") as f:
+                    run.artifacts[name] = f.read().decode("utf-8", "surrogatepass")
+            return run
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def prune(self) -> int:
+        """
+        Delete spilled runs older than the retention period, and artifacts no remaining run refers to.
+
+        Returns:
+            The number of runs deleted
+        """
+        if self.spill_dir is None:
+            return 0
+        runs_dir = os.path.join(self.spill_dir, "runs")
+        objects_dir = os.path.join(self.spill_dir, "objects")
+        cutoff = time.time() - self.retention_seconds
+        expired = 0
+        referenced = set()
+        with self._disk_lock:
+            self._last_prune = time.time()
+            for entry in os.scandir(runs_dir) if os.path.isdir(runs_dir) else ():
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    with open(entry.path, "r", encoding="utf-8") as f:
+                        manifest = json.load(f)
+                    if manifest["created_at"] < cutoff:
+                        os.unlink(entry.path)
+                        expired += 1
+                    else:
+                        referenced.update(manifest["artifacts"].values())
+                except (OSError, ValueError, KeyError):
+                    continue
+
+            if expired:
+                for prefix in os.scandir(objects_dir) if os.path.isdir(objects_dir) else ():
+                    for entry in os.scandir(prefix.path):
+                        if not entry.name.startswith(".tmp-") and prefix.name + entry.name not in referenced:
+                            os.unlink(entry.path)
+        with self._lock:
+            self._counters["runs_expired"] += expired
+        return expired
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get store counters.
+
+        Returns:
+            Artifacts stored, runs spilled, dropped and expired, and runs and bytes held in memory
+        """
+        with self._lock:
+            stats: Dict[str, float] = dict(self._counters)
+            stats["runs_in_memory"] = len(self._runs)
+            stats["memory_bytes"] = self._size
+        return stats
+
+
+_store: Optional[ArtifactStore] = None
+_store_lock = threading.Lock()
+
+
+def get_artifact_store() -> ArtifactStore:
+    """
+    Get the process-wide artifact store.
+
+    Returns:
+        The shared ArtifactStore, spilling to artifacts in the cache directory unless spilling is disabled
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ArtifactStore(os.path.join(get_cache_dir(), "artifacts") if SPILL_ENABLED else None)
+    return _store
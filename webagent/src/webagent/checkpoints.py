@@ -0,0 +1,170 @@
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from webagent.tools.storage import connect
+
+
+# Hours the completed tasks of an unfinished run are kept for it to be resumed
+DEFAULT_RETENTION_HOURS = float(os.environ.get("WEBAGENT_CHECKPOINT_RETENTION_HOURS", "24"))
+
+
+@dataclass
+class Checkpoint:
+    """The saved progress of an unfinished research run."""
+
+    run_id: str
+    query: str
+    days: int
+    outputs: Dict[str, str] = field(default_factory=dict)
+    updated_at: float = 0.0
+
+
+class CheckpointStore:
+    """
+    Durable record of the tasks each research run has completed.
+
+    Every task output is committed to SQLite as soon as the task finishes,
+    so a run that fails or is cancelled, or whose process dies, can be
+    resumed from the tasks it had not completed instead of starting over.
+    A run's checkpoint is deleted once the run succeeds; unfinished runs are
+    pruned after the retention period.
+    """
+
+    def __init__(self, path: str = "checkpoints.sqlite3", retention_hours: float = DEFAULT_RETENTION_HOURS):
+        self.retention_seconds = retention_hours * 3600
+        self._lock = threading.Lock()
+        self._connection = connect(path)
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                days INTEGER NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS task_outputs (
+                run_id TEXT NOT NULL,
+                task_name TEXT NOT NULL,
+                output TEXT NOT NULL,
+                completed_at REAL NOT NULL,
+                PRIMARY KEY (run_id, task_name)
+            ) WITHOUT ROWID;
+            """
+        )
+        self._connection.commit()
+        self._counters = {"runs_started": 0, "runs_resumed": 0, "tasks_saved": 0}
+
+    def start(self, run_id: str, query: str, days: int) -> None:
+        """
+        Record a run that is about to execute, keeping any tasks it completed before.
+
+        Args:
+            run_id: The ID of the run
+            query: The research query
+            days: Number of days to look back for news articles
+        """
+        now = time.time()
+        with self._lock:
+            # Expired checkpoints go first, so a run is never resumed from one
+            self._connection.execute(
+                "DELETE FROM task_outputs WHERE run_id IN (SELECT run_id FROM runs WHERE updated_at < ?)",
+                (now - self.retention_seconds,)
+            )
+            self._connection.execute("DELETE FROM runs WHERE updated_at < ?", (now - self.retention_seconds,))
+            cursor = self._connection.execute(
+                "INSERT INTO runs (run_id, query, days, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(run_id) DO NOTHING",
+                (run_id, query, days, now)
+            )
+            if not cursor.rowcount:
+                self._connection.execute("UPDATE runs SET updated_at = ? WHERE run_id = ?", (now, run_id))
+                self._counters["runs_resumed"] += 1
+            self._connection.commit()
+            self._counters["runs_started"] += 1
+
+    def save(self, run_id: str, task_name: str, output: str) -> None:
+        """
+        Record that a task of a run has completed.
+
+        Args:
+            run_id: The ID of the run
+            task_name: The name of the completed task
+            output: Its raw output
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO task_outputs (run_id, task_name, output, completed_at) VALUES (?, ?, ?, ?)",
+                (run_id, task_name, output, now)
+            )
+            self._connection.execute("UPDATE runs SET updated_at = ? WHERE run_id = ?", (now, run_id))
+            self._connection.commit()
+            self._counters["tasks_saved"] += 1
+
+    def load(self, run_id: str) -> Optional[Checkpoint]:
+        """
+        Get the saved progress of a run.
+
+        Args:
+            run_id: The ID of the run
+
+        Returns:
+            The run's query, look-back window and completed task outputs, or None if nothing is saved for it
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT query, days, updated_at FROM runs WHERE run_id = ? AND updated_at >= ?",
+                (run_id, time.time() - self.retention_seconds)
+            ).fetchone()
+            if row is None:
+                return None
+            outputs = dict(self._connection.execute(
+                "SELECT task_name, output FROM task_outputs WHERE run_id = ? ORDER BY completed_at", (run_id,)
+            ).fetchall())
+        return Checkpoint(run_id=run_id, query=row[0], days=row[1], outputs=outputs, updated_at=row[2])
+
+    def finish(self, run_id: str) -> None:
+        """
+        Delete the checkpoint of a run that has succeeded.
+
+        Args:
+            run_id: The ID of the run
+        """
+        with self._lock:
+            self._connection.execute("DELETE FROM task_outputs WHERE run_id = ?", (run_id,))
+            self._connection.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+            self._connection.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get checkpoint counters.
+
+        Returns:
+            Runs started and resumed, tasks saved, and runs whose checkpoint is kept
+        """
+        with self._lock:
+            stats: Dict[str, float] = dict(self._counters)
+            stats["unfinished_runs"] = self._connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+        return stats
+
+
+_store: Optional[CheckpointStore] = None
+_store_lock = threading.Lock()
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """
+    Get the process-wide checkpoint store.
+
+    Returns:
+        The shared CheckpointStore
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = CheckpointStore()
+    return _store
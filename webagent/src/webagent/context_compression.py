@@ -0,0 +1,189 @@
+import json
+import math
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Set
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+# Token budget for each upstream task output passed on to the next agent; 0 disables compression
+DEFAULT_CONTEXT_TOKEN_BUDGET = int(os.environ.get("WEBAGENT_CONTEXT_TOKEN_BUDGET", "2000"))
+
+# tiktoken encoding used to measure context size
+TOKEN_ENCODING = os.environ.get("WEBAGENT_TOKEN_ENCODING", "cl100k_base")
+
+# Rough characters per token, used when tiktoken or its encoding files are unavailable
+CHARS_PER_TOKEN = 4
+
+# Separator between upstream outputs, the same one crewai uses
+CONTEXT_DIVIDER = "\n\n----------\n\n"
+
+# Short lines matching this are site chrome rather than content
+BOILERPLATE_PATTERN = re.compile(
+    r"^\W*(?:accept (?:all )?cookies|we use cookies|cookie (?:policy|settings|preferences)|"
+    r"subscribe\b|sign (?:in|up)\b|log ?in\b|share (?:this|on)\b|follow us\b|all rights reserved|"
+    r"©|copyright\b|privacy policy|terms of (?:use|service)|skip to (?:main )?content|"
+    r"advertisement\b|related (?:articles|posts)\b|read more\b|click here\b)",
+    re.IGNORECASE,
+)
+
+# Only lines up to this length are checked for boilerplate
+MAX_BOILERPLATE_LINE = 120
+
+# Lines shorter than this (headings, separators, list markers) are never dropped as duplicates
+MIN_DEDUPE_LINE = 20
+
+WHITESPACE = re.compile(r"\s+")
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        with _encoding_lock:
+            if not _encoding_loaded:
+                if tiktoken is not None:
+                    try:
+                        _encoding = tiktoken.get_encoding(TOKEN_ENCODING)
+                    except Exception:
+                        # The encoding files are downloaded on first use and may be unreachable
+                        _encoding = None
+                _encoding_loaded = True
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens in a text.
+
+    Args:
+        text: The text to measure
+
+    Returns:
+        The exact count with tiktoken, or an estimate from the text length without it
+    """
+    encoding = _get_encoding()
+    if encoding is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """
+    Cut a text down to a token budget, preferring to end at a line break.
+
+    Args:
+        text: The text to shorten
+        budget: Maximum number of tokens to keep
+
+    Returns:
+        The text itself if it fits, otherwise its head plus a note of how much was cut
+    """
+    total = count_tokens(text)
+    if total <= budget:
+        return text
+
+    encoding = _get_encoding()
+    if encoding is None:
+        head = text[:budget * CHARS_PER_TOKEN]
+    else:
+        head = encoding.decode(encoding.encode(text, disallowed_special=())[:budget])
+
+    # Drop a partial last line unless that would throw away most of the head
+    line_end = head.rfind("\n")
+    if line_end > len(head) * 0.8:
+        head = head[:line_end]
+
+    return f"{head.rstrip()}\n[... {total - count_tokens(head)} more tokens trimmed]"
+
+
+def _compact_json(text: str) -> Optional[str]:
+    stripped = text.strip()
+    if not stripped or stripped[0] not in "{[":
+        return None
+    try:
+        return json.dumps(json.loads(stripped), ensure_ascii=False, separators=(",", ":"))
+    except ValueError:
+        return None
+
+
+def strip_boilerplate(text: str, seen: Optional[Set[str]] = None) -> str:
+    """
+    Remove whitespace padding, site chrome and repeated lines from a text.
+
+    JSON documents are re-serialized without indentation instead.
+
+    Args:
+        text: The text to clean
+        seen: Normalized lines already kept elsewhere in the same context; updated in place
+
+    Returns:
+        The cleaned text
+    """
+    compact = _compact_json(text)
+    if compact is not None:
+        return compact
+
+    seen = set() if seen is None else seen
+    lines: List[str] = []
+    for line in text.splitlines():
+        line = line.rstrip()
+        stripped = line.strip()
+        if not stripped:
+            # Collapse runs of blank lines into one
+            if lines and lines[-1]:
+                lines.append("")
+            continue
+        if len(stripped) <= MAX_BOILERPLATE_LINE and BOILERPLATE_PATTERN.match(stripped):
+            continue
+        if len(stripped) >= MIN_DEDUPE_LINE:
+            key = WHITESPACE.sub(" ", stripped.lower())
+            if key in seen:
+                continue
+            seen.add(key)
+        lines.append(line)
+    return "\n".join(lines).strip()
+
+
+@dataclass
+class CompressedContext:
+    """A compressed task context and its size before and after compression."""
+    text: str
+    tokens_before: int
+    tokens_after: int
+
+
+def compress_context(outputs: List[str], budget: int = DEFAULT_CONTEXT_TOKEN_BUDGET) -> CompressedContext:
+    """
+    Compress upstream task outputs into the context for the next task.
+
+    Each output is cleaned of boilerplate and of lines an earlier output
+    already contained, then trimmed to the token budget on its own, so one
+    long output cannot crowd out the others.
+
+    Args:
+        outputs: The raw outputs of the upstream tasks, in order
+        budget: Maximum tokens kept per output
+
+    Returns:
+        The compressed context with token counts before and after
+    """
+    seen: Set[str] = set()
+    parts = []
+    for output in outputs:
+        cleaned = strip_boilerplate(output, seen)
+        if cleaned:
+            parts.append(truncate_to_tokens(cleaned, budget))
+
+    original = CONTEXT_DIVIDER.join(outputs)
+    text = CONTEXT_DIVIDER.join(parts)
+    return CompressedContext(text=text, tokens_before=count_tokens(original), tokens_after=count_tokens(text))
@@ -0,0 +1,314 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from crewai import LLM, Agent, Task
+from crewai.crews.crew_output import CrewOutput
+from crewai.llms.base_llm import BaseLLM
+from crewai.tools import BaseTool
+from crewai.utilities.llm_utils import create_llm
+
+from webagent.task_graph import TaskGraph
+from webagent.tools import WebSearchTool, WebScraperTool, ContentAnalyzerTool, NewsAggregatorTool, ResearchMemoryTool
+from webagent.tools.research_memory import get_research_memory
+
+
+# Maximum number of idle crews kept for reuse; one is needed per concurrent query
+DEFAULT_POOL_SIZE = int(os.environ.get("WEBAGENT_CREW_POOL_SIZE", "4"))
+
+# Bound into the web search task when research memory has nothing on the query
+NO_MEMORY_NOTES = "(no earlier research on this topic)"
+
+# Whether the report writer's LLM streams the report token by token as it is written
+STREAM_REPORT = os.environ.get("WEBAGENT_STREAM_REPORT", "true").lower() in ("1", "true", "yes")
+
+# The task whose output is streamed to the user while it is being written
+STREAMED_TASK = "report_creation_task"
+
+# Task outputs kept in research memory, by task name, with the kind they are stored as
+REMEMBERED_TASKS = {"web_scraping_task": "page", "news_aggregation_task": "news"}
+
+
+def research_inputs(query: str, days: int = 7, memory: str = "") -> Dict[str, Any]:
+    """
+    Build the kickoff inputs bound into the task templates.
+
+    Args:
+        query: The user's research query
+        days: Number of days to look back for news articles
+        memory: Notes recalled from earlier research on the query
+
+    Returns:
+        The inputs for TaskGraph.kickoff()
+    """
+    return {"query": query, "days": days, "memory": memory or NO_MEMORY_NOTES}
+
+
+class CrewFactory:
+    """
+    Build the web research crew once and reuse it across queries.
+
+    Tools are stateless and shared by every crew in the process. Agents, their
+    LLM clients and the task graph are built once per pool slot; a query checks
+    a crew out, binds its query and look-back window into the task templates
+    at kickoff, and hands the crew back. Concurrent queries each get their own
+    crew, so agents are never shared between two running queries.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE):
+        self.pool_size = max(1, pool_size)
+        self._lock = threading.Lock()
+        self._tools: Optional[Dict[str, BaseTool]] = None
+        self._idle: List[TaskGraph] = []
+        self._counters = {"builds": 0, "reuses": 0}
+        self._timings = {
+            "tools_seconds": 0.0,
+            "build_seconds_total": 0.0,
+            "last_build_seconds": 0.0,
+            "last_checkout_seconds": 0.0,
+        }
+
+    def _get_tools(self) -> Dict[str, BaseTool]:
+        with self._lock:
+            if self._tools is None:
+                start = time.perf_counter()
+                self._tools = {
+                    "web_search": WebSearchTool(),
+                    "web_scraper": WebScraperTool(),
+                    "content_analyzer": ContentAnalyzerTool(),
+                    "news_aggregator": NewsAggregatorTool(),
+                    "research_memory": ResearchMemoryTool(),
+                }
+                self._timings["tools_seconds"] = time.perf_counter() - start
+            return self._tools
+
+    @staticmethod
+    def _report_llm() -> Optional[BaseLLM]:
+        # The model every agent gets from the environment, with streaming switched on
+        llm = create_llm()
+        if STREAM_REPORT and isinstance(llm, LLM):
+            llm.stream = True
+        return llm
+
+    def build(self) -> TaskGraph:
+        """
+        Create a new crew whose task descriptions are templates over {query} and {days}.
+
+        Returns:
+            A TaskGraph that runs the crew's tasks as a dependency graph
+        """
+        tools = self._get_tools()
+        start = time.perf_counter()
+
+        # Create agents
+        web_researcher = Agent(
+            role="Web Researcher",
+            goal="Search the web for relevant information about the given topic",
+            backstory="You are an expert web researcher with years of experience in finding accurate and relevant information online.",
+            tools=[tools["research_memory"], tools["web_search"], tools["web_scraper"], tools["news_aggregator"]],
+            verbose=True
+        )
+
+        content_analyzer = Agent(
+            role="Content Analyzer",
+            goal="Analyze and extract key information from web content",
+            backstory="You are a skilled content analyst who can identify the most important information from various sources.",
+            tools=[tools["content_analyzer"]],
+            verbose=True
+        )
+
+        report_writer = Agent(
+            role="Report Writer",
+            goal="Compile research findings into a comprehensive report",
+            backstory="You are a professional report writer who can synthesize information from multiple sources into a clear, well-structured report.",
+            llm=self._report_llm(),
+            verbose=True
+        )
+
+        # Create tasks
+        web_search_task = Task(
+            name="web_search_task",
+            description=(
+                "Search the web for information about: {query}\n\n"
+                "Notes from earlier research that may already answer part of it:\n{memory}\n\n"
+                "Only search the web for what these notes do not cover, and include the relevant notes "
+                "with their sources in your answer."
+            ),
+            agent=web_researcher,
+            expected_output="A list of relevant web pages and their content related to the query."
+        )
+
+        web_scraping_task = Task(
+            name="web_scraping_task",
+            description=(
+                "Extract detailed information from the web pages found about: {query}. "
+                "Pass all of the URLs to the Web Scraper Tool in a single call using its 'urls' list "
+                "so the pages are fetched concurrently."
+            ),
+            agent=web_researcher,
+            expected_output="Detailed information extracted from the web pages.",
+            context=[web_search_task]
+        )
+
+        news_aggregation_task = Task(
+            name="news_aggregation_task",
+            description="Find recent news articles (within the last {days} days) about: {query}",
+            agent=web_researcher,
+            expected_output="A summary of recent news articles related to the query."
+        )
+
+        content_analysis_task = Task(
+            name="content_analysis_task",
+            description=(
+                "Analyze the content gathered about: {query}. "
+                "Pass each scraped page and news article to the Content Analyzer Tool as a separate "
+                "entry of its 'documents' list, with its URL, so results stay attributed to their sources."
+            ),
+            agent=content_analyzer,
+            expected_output="Key insights and information extracted from the content.",
+            context=[web_scraping_task, news_aggregation_task]
+        )
+
+        report_creation_task = Task(
+            name="report_creation_task",
+            description="Create a comprehensive research report about: {query}",
+            agent=report_writer,
+            expected_output="A well-structured research report that answers the query.",
+            context=[content_analysis_task]
+        )
+
+        # Independent branches (search -> scrape and news) run concurrently
+        crew = TaskGraph(
+            agents=[web_researcher, content_analyzer, report_writer],
+            tasks=[web_search_task, web_scraping_task, news_aggregation_task, content_analysis_task, report_creation_task],
+            verbose=True
+        )
+
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._counters["builds"] += 1
+            self._timings["build_seconds_total"] += elapsed
+            self._timings["last_build_seconds"] = elapsed
+        return crew
+
+    @contextmanager
+    def crew(self) -> Iterator[TaskGraph]:
+        """
+        Check out an idle crew, building one if none is available.
+
+        Yields:
+            A TaskGraph reserved for the caller until the block exits
+        """
+        start = time.perf_counter()
+        with self._lock:
+            crew = self._idle.pop() if self._idle else None
+            if crew is not None:
+                self._counters["reuses"] += 1
+        if crew is None:
+            crew = self.build()
+        with self._lock:
+            self._timings["last_checkout_seconds"] = time.perf_counter() - start
+
+        try:
+            yield crew
+        finally:
+            with self._lock:
+                if len(self._idle) < self.pool_size:
+                    self._idle.append(crew)
+
+    def kickoff(
+        self,
+        query: str,
+        days: int = 7,
+        task_callbacks: Optional[List[Callable[[Any, Task], Any]]] = None,
+        start_callbacks: Optional[List[Callable[[Task], Any]]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        completed: Optional[Dict[str, str]] = None,
+    ) -> CrewOutput:
+        """
+        Run the research crew for a query.
+
+        Earlier research related to the query is recalled from research
+        memory and handed to the web search task; the pages, news and report
+        gathered by this run are remembered for later queries.
+
+        Args:
+            query: The user's research query
+            days: Number of days to look back for news articles
+            task_callbacks: Functions called with (task_output, task) as each task completes
+            start_callbacks: Functions called with the task as each task starts
+            cancel_event: When set, stops the run once its running tasks finish
+            completed: Raw outputs of tasks finished by an earlier attempt at the run, by task name;
+                they are not run again
+
+        Returns:
+            The crew output; its raw output is the final report
+
+        Raises:
+            RunCancelled: If cancel_event was set before the report was written
+        """
+        memory = get_research_memory()
+        callbacks = list(task_callbacks or [])
+        notes = ""
+        if memory is not None:
+            try:
+                notes = memory.recall_notes(query, days)
+            except Exception:
+                # Memory only saves work; research goes ahead without it
+                notes = ""
+
+            def remember(task_output: Any, task: Task) -> None:
+                kind = REMEMBERED_TASKS.get(task.name)
+                if kind is not None and task_output is not None:
+                    memory.remember_async(task_output.raw, task.name, kind, query)
+
+            callbacks.append(remember)
+
+        with self.crew() as crew:
+            result = crew.kickoff(
+                inputs=research_inputs(query, days, notes),
+                task_callbacks=callbacks,
+                start_callbacks=start_callbacks,
+                cancel_event=cancel_event,
+                completed=completed,
+            )
+
+        if memory is not None:
+            memory.remember_async(result.raw, "report", "report", query)
+        return result
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get construction counters and timings.
+
+        Returns:
+            Build and reuse counts, idle crews, and construction times in seconds
+        """
+        with self._lock:
+            stats: Dict[str, float] = {**self._counters, **self._timings}
+            stats["idle"] = len(self._idle)
+        stats["average_build_seconds"] = (
+            stats["build_seconds_total"] / stats["builds"] if stats["builds"] else 0.0
+        )
+        return stats
+
+
+_factory: Optional[CrewFactory] = None
+_factory_lock = threading.Lock()
+
+
+def get_crew_factory() -> CrewFactory:
+    """
+    Get the process-wide crew factory.
+
+    Returns:
+        The shared CrewFactory
+    """
+    global _factory
+    if _factory is None:
+        with _factory_lock:
+            if _factory is None:
+                _factory = CrewFactory()
+    return _factory
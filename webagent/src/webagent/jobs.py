@@ -0,0 +1,415 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from crewai import Task
+
+from webagent.artifacts import REPORT, get_artifact_store
+from webagent.checkpoints import get_checkpoint_store
+from webagent.crew_factory import DEFAULT_POOL_SIZE, STREAMED_TASK, get_crew_factory
+from webagent.report_cache import ReportCache, get_report_cache, normalize_question
+from webagent.streaming import TokenBuffer, get_token_streams
+from webagent.task_graph import RunCancelled
+
+
+# Maximum number of research jobs run at the same time; later submissions wait in a queue
+DEFAULT_MAX_JOBS = int(os.environ.get("WEBAGENT_MAX_RESEARCH_JOBS", str(DEFAULT_POOL_SIZE)))
+
+# Number of finished jobs kept in the job store so their results can still be picked up
+DEFAULT_JOB_HISTORY = int(os.environ.get("WEBAGENT_JOB_HISTORY", "100"))
+
+QUEUED = "queued"
+RUNNING = "running"
+CANCELLING = "cancelling"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+@dataclass
+class ResearchJob:
+    """
+    The state of one research run, as kept in the job store.
+
+    tasks maps each task that has started to 'running' or 'done', in start
+    order. draft is the report streamed so far while it is being written.
+    The finished report and task outputs are kept in the artifact store
+    under the job ID. cached_at and cached_query are set when the job was
+    answered from the report cache instead of being researched. follows is
+    the ID of the job researching the same question that this job waits
+    for, when it was submitted while that job was running.
+    """
+
+    job_id: str
+    query: str
+    days: int
+    status: str = QUEUED
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    tasks: Dict[str, str] = field(default_factory=dict)
+    draft: str = ""
+    cached_at: Optional[float] = None
+    cached_query: Optional[str] = None
+    error: Optional[str] = None
+    follows: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINISHED_STATES
+
+
+class JobManager:
+    """
+    Run research queries in the background on a bounded pool of workers.
+
+    The pool lives as long as the process, so a Streamlit rerun or a second
+    session never finds it shut down. Each submission gets a job ID; callers
+    poll get() for per-task progress, read the task outputs and final report
+    from the artifact store under the job ID, and may cancel a job that has
+    not finished yet.
+
+    A question answered recently is served from the report cache without
+    running the crew. If the cached report is stale it is still served, and
+    refreshed in the background for the next asker. A question asked again
+    while it is being researched follows the running job instead of starting
+    another crew, and gets its own copy of the results when it finishes.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_JOBS, history: int = DEFAULT_JOB_HISTORY):
+        self.history = max(1, history)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="webagent-job")
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, ResearchJob]" = OrderedDict()
+        self._futures: Dict[str, Future] = {}
+        self._cancel_events: Dict[str, threading.Event] = {}
+        self._drafts: Dict[str, TokenBuffer] = {}
+        # The job researching each question, and the jobs following it
+        self._inflight: Dict[Tuple[str, int], str] = {}
+        self._followers: Dict[str, List[str]] = {}
+        # Jobs cancelled by their submitter that keep running for their followers
+        self._withdrawn: Set[str] = set()
+        self._counters = {"submitted": 0, "followed": 0, "succeeded": 0, "failed": 0, "cancelled": 0}
+
+    def submit(self, query: str, days: int = 7) -> str:
+        """
+        Queue a research run.
+
+        If the same question is already being researched for the same
+        look-back window, the new job follows that run instead.
+
+        Args:
+            query: The user's research query
+            days: Number of days to look back for news articles
+
+        Returns:
+            The ID of the new job
+        """
+        job = ResearchJob(job_id=uuid.uuid4().hex, query=query, days=days)
+        key = (normalize_question(query), days)
+        with self._lock:
+            leader_id = self._inflight.get(key)
+            if leader_id is not None and not self._cancel_events[leader_id].is_set():
+                job.follows = leader_id
+                self._jobs[job.job_id] = job
+                self._followers.setdefault(leader_id, []).append(job.job_id)
+                self._counters["submitted"] += 1
+                self._counters["followed"] += 1
+            else:
+                self._enqueue(job)
+        return job.job_id
+
+    def resume(self, job_id: str) -> bool:
+        """
+        Run an unfinished job again from the tasks it had not completed.
+
+        Tasks are checkpointed as they finish, so a failed or cancelled job,
+        or one whose process died, does not repeat the work it already did.
+
+        Args:
+            job_id: The ID of the job
+
+        Returns:
+            True if the job was queued again; False if it is still running, succeeded or is unknown
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.status not in (FAILED, CANCELLED):
+                return False
+        checkpoint = get_checkpoint_store().load(job_id) if job is None else None
+        if job is None and checkpoint is None:
+            return False
+
+        query, days = (job.query, job.days) if job is not None else (checkpoint.query, checkpoint.days)
+        with self._lock:
+            current = self._jobs.get(job_id)
+            if current is not job:
+                # Resumed by someone else in the meantime
+                return False
+            self._jobs.pop(job_id, None)
+            self._enqueue(ResearchJob(job_id=job_id, query=query, days=days))
+        return True
+
+    def _enqueue(self, job: ResearchJob) -> None:
+        # Called with the lock held
+        self._jobs[job.job_id] = job
+        self._cancel_events[job.job_id] = threading.Event()
+        self._inflight.setdefault((normalize_question(job.query), job.days), job.job_id)
+        self._counters["submitted"] += 1
+        self._futures[job.job_id] = self._executor.submit(self._run, job.job_id)
+
+    def get(self, job_id: str) -> Optional[ResearchJob]:
+        """
+        Look up a job.
+
+        Args:
+            job_id: The ID returned by submit()
+
+        Returns:
+            A snapshot of the job that later progress does not change, or None if it is unknown or evicted
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job_id in self._withdrawn:
+                return replace(job, status=CANCELLED, tasks=dict(job.tasks), draft="")
+            leader = self._jobs.get(job.follows) if job.follows is not None and not job.done else None
+            if leader is not None:
+                # A follower shows the progress of the job it waits for, until it has its own copy of the results
+                draft = self._drafts.get(leader.job_id)
+                return replace(
+                    job,
+                    status=QUEUED if leader.status == QUEUED else RUNNING,
+                    started_at=leader.started_at,
+                    tasks=dict(leader.tasks),
+                    draft=draft.text() if draft is not None else leader.draft,
+                )
+            draft = self._drafts.get(job_id)
+            return replace(job, tasks=dict(job.tasks), draft=draft.text() if draft is not None else job.draft)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a job.
+
+        A queued job is dropped at once. A running job stops once its running
+        tasks finish, and is reported as cancelling until then. A job that
+        other jobs follow, or that follows another job, is only cancelled for
+        its own submitter; the research goes on while anyone still waits.
+
+        Args:
+            job_id: The ID returned by submit()
+
+        Returns:
+            True if the job had not finished yet
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.done or job_id in self._withdrawn:
+                return False
+            if job.follows is not None:
+                followers = self._followers.get(job.follows, [])
+                if job_id in followers:
+                    followers.remove(job_id)
+                self._finish(job, CANCELLED)
+                if job.follows in self._withdrawn and not followers:
+                    self._stop(self._jobs[job.follows])
+            elif self._followers.get(job_id):
+                self._withdrawn.add(job_id)
+            else:
+                self._stop(job)
+        return True
+
+    def _stop(self, job: ResearchJob) -> None:
+        # Called with the lock held
+        self._cancel_events[job.job_id].set()
+        if self._futures[job.job_id].cancel():
+            self._finish(job, CANCELLED)
+        else:
+            job.status = CANCELLING
+
+    def _run(self, job_id: str) -> None:
+        with self._lock:
+            job = self._jobs[job_id]
+            cancel_event = self._cancel_events[job_id]
+            if cancel_event.is_set():
+                self._finish(job, CANCELLED)
+                return
+            job.status = RUNNING
+            job.started_at = time.time()
+
+        artifacts = get_artifact_store()
+        cache = get_report_cache()
+        try:
+            cached = cache.get(job.query, job.days) if cache is not None else None
+        except Exception:
+            # A broken cache must not stop research
+            cached = None
+        if cached is not None:
+            for name, output in cached.outputs.items():
+                artifacts.put(job_id, name, output)
+            artifacts.put(job_id, REPORT, cached.report)
+            # A resumed job answered from the cache has nothing left to resume
+            get_checkpoint_store().finish(job_id)
+            with self._lock:
+                job.cached_at = cached.created_at
+                job.cached_query = cached.query
+                self._finish(job, SUCCEEDED)
+            self._release_followers(job, SUCCEEDED)
+            if cached.stale and cache.claim_refresh(job.query, job.days):
+                self._executor.submit(self._refresh, cache, job.query, job.days)
+            return
+
+        checkpoints = get_checkpoint_store()
+        restored: Dict[str, str] = {}
+        streams = get_token_streams()
+        streamed = []
+        outputs: Dict[str, str] = {}
+
+        def task_started(task: Task) -> None:
+            with self._lock:
+                job.tasks[task.name] = RUNNING
+                if task.name == STREAMED_TASK:
+                    self._drafts[job_id] = streams.subscribe(task)
+                    streamed.append(task)
+
+        def task_finished(task_output: Any, task: Task) -> None:
+            outputs[task.name] = task_output.raw if task_output is not None else ""
+            if task.name not in restored:
+                checkpoints.save(job_id, task.name, outputs[task.name])
+            artifacts.put(job_id, task.name, outputs[task.name])
+            with self._lock:
+                job.tasks[task.name] = "done"
+
+        status = FAILED
+        try:
+            # Tasks completed by an earlier attempt at this job are restored instead of run again
+            checkpoint = checkpoints.load(job_id)
+            if checkpoint is not None:
+                restored.update(checkpoint.outputs)
+            checkpoints.start(job_id, job.query, job.days)
+
+            result = get_crew_factory().kickoff(
+                job.query,
+                job.days,
+                task_callbacks=[task_finished],
+                start_callbacks=[task_started],
+                cancel_event=cancel_event,
+                completed=restored,
+            )
+            artifacts.put(job_id, REPORT, result.raw)
+            checkpoints.finish(job_id)
+            status = SUCCEEDED
+        except RunCancelled:
+            status = CANCELLED
+        except Exception as e:
+            with self._lock:
+                job.error = str(e)
+        finally:
+            for task in streamed:
+                streams.unsubscribe(task)
+
+        with self._lock:
+            self._finish(job, status)
+        self._release_followers(job, status)
+        if status == SUCCEEDED and cache is not None:
+            cache.put(job.query, job.days, result.raw, outputs)
+
+    def _release_followers(self, leader: ResearchJob, status: str) -> None:
+        # Give the jobs following a finished job its outcome, each with its own copy of the artifacts
+        with self._lock:
+            followers = [self._jobs[job_id] for job_id in self._followers.pop(leader.job_id, []) if job_id in self._jobs]
+        if not followers:
+            return
+        artifacts = get_artifact_store()
+        outputs = artifacts.get_run(leader.job_id)
+        for follower in followers:
+            for name, output in outputs.items():
+                artifacts.put(follower.job_id, name, output)
+        with self._lock:
+            for follower in followers:
+                if follower.done:
+                    # Cancelled while the artifacts were copied
+                    continue
+                follower.started_at = leader.started_at
+                follower.tasks = dict(leader.tasks)
+                follower.cached_at = leader.cached_at
+                follower.cached_query = leader.cached_query
+                follower.error = leader.error
+                self._finish(follower, status)
+
+    @staticmethod
+    def _refresh(cache: ReportCache, query: str, days: int) -> None:
+        # Research a stale cached question again; the asker was already served the stale report
+        outputs: Dict[str, str] = {}
+
+        def task_finished(task_output: Any, task: Task) -> None:
+            outputs[task.name] = task_output.raw if task_output is not None else ""
+
+        try:
+            result = get_crew_factory().kickoff(query, days, task_callbacks=[task_finished])
+            cache.put(query, days, result.raw, outputs)
+        except Exception:
+            # The stale report stays cached; the next asker triggers another refresh
+            pass
+        finally:
+            cache.release_refresh(query, days)
+
+    def _finish(self, job: ResearchJob, status: str) -> None:
+        # Called with the lock held
+        if job.job_id in self._withdrawn:
+            # Its submitter cancelled it while others still waited for the research
+            self._withdrawn.discard(job.job_id)
+            status = CANCELLED
+        job.status = status
+        job.finished_at = time.time()
+        self._counters[status] += 1
+        self._futures.pop(job.job_id, None)
+        self._cancel_events.pop(job.job_id, None)
+        self._drafts.pop(job.job_id, None)
+        key = (normalize_question(job.query), job.days)
+        if self._inflight.get(key) == job.job_id:
+            del self._inflight[key]
+
+        finished = [job_id for job_id, other in self._jobs.items() if other.done]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get job counters.
+
+        Returns:
+            Jobs submitted, following another, succeeded, failed and cancelled, and jobs currently queued and running
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats["queued"] = sum(1 for job in self._jobs.values() if job.status == QUEUED and job.follows is None)
+            stats["running"] = sum(1 for job in self._jobs.values() if job.status in (RUNNING, CANCELLING))
+        return stats
+
+
+_manager: Optional[JobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """
+    Get the process-wide research job manager.
+
+    Returns:
+        The shared JobManager
+    """
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = JobManager()
+    return _manager
@@ -3,7 +3,6 @@ import sys
 import warnings
 import streamlit as st
 from datetime import datetime
-import json
 import os
 import time
 from dotenv import load_dotenv
@@ -12,109 +11,55 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Import CrewAI components
-from crewai import Agent, Task, Crew, Process
-from webagent.tools import WebSearchTool, WebScraperTool, ContentAnalyzerTool, NewsAggregatorTool
+from webagent.artifacts import REPORT, get_artifact_store, new_run_id
+from webagent.checkpoints import get_checkpoint_store
+from webagent.crew_factory import get_crew_factory
+from webagent.jobs import CANCELLED, CANCELLING, FAILED, get_job_manager
+from webagent.report_cache import get_report_cache
+from webagent.tools.news_feeds import get_feed_poller
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
+# Seconds between progress refreshes while a research job runs; also paces the streamed report
+JOB_POLL_SECONDS = 0.25
+
+class ResearchFailed(Exception):
+    """Raised by run_web_research() when a run fails; pass its run_id back in to resume the run."""
+
+    def __init__(self, message, run_id):
+        super().__init__(message)
+        self.run_id = run_id
+
+
 # This main file is intended to be a way for you to run your
 # crew locally, so refrain from adding unnecessary logic into this file.
 # Replace with inputs you want to test with, it will automatically
 # interpolate any tasks and agents information
 
-def create_web_research_crew(query, days=7):
-    """
-    Create a web research crew with the necessary agents and tasks.
-    
-    Args:
-        query: The user's research query
-        days: Number of days to look back for news articles
-        
-    Returns:
-        A configured Crew object
+def run_web_research(query, days=7, show_intermediate=False, run_id=None):
     """
-    # Extract topic from query for better organization
-    topic = " ".join(query.split()[0:3])  # Use first few words as topic
-    
-    # Create agents
-    web_researcher = Agent(
-        role="Web Researcher",
-        goal="Search the web for relevant information about the given topic",
-        backstory="You are an expert web researcher with years of experience in finding accurate and relevant information online.",
-        tools=[WebSearchTool(), WebScraperTool(), NewsAggregatorTool()],
-        verbose=True
-    )
-    
-    content_analyzer = Agent(
-        role="Content Analyzer",
-        goal="Analyze and extract key information from web content",
-        backstory="You are a skilled content analyst who can identify the most important information from various sources.",
-        tools=[ContentAnalyzerTool()],
-        verbose=True
-    )
-    
-    report_writer = Agent(
-        role="Report Writer",
-        goal="Compile research findings into a comprehensive report",
-        backstory="You are a professional report writer who can synthesize information from multiple sources into a clear, well-structured report.",
-        verbose=True
-    )
-    
-    # Create tasks
-    web_search_task = Task(
-        description=f"Search the web for information about: {query}",
-        agent=web_researcher,
-        expected_output="A list of relevant web pages and their content related to the query."
-    )
-    
-    web_scraping_task = Task(
-        description=f"Extract detailed information from the web pages found about: {query}",
-        agent=web_researcher,
-        expected_output="Detailed information extracted from the web pages.",
-        context=[web_search_task]
-    )
-    
-    news_aggregation_task = Task(
-        description=f"Find recent news articles (within the last {days} days) about: {query}",
-        agent=web_researcher,
-        expected_output="A summary of recent news articles related to the query."
-    )
-    
-    content_analysis_task = Task(
-        description=f"Analyze the content gathered about: {query}",
-        agent=content_analyzer,
-        expected_output="Key insights and information extracted from the content.",
-        context=[web_scraping_task, news_aggregation_task]
-    )
-    
-    report_creation_task = Task(
-        description=f"Create a comprehensive research report about: {query}",
-        agent=report_writer,
-        expected_output="A well-structured research report that answers the query.",
-        context=[content_analysis_task]
-    )
+    Run the web research crew with a user query.
     
-    # Create crew
-    crew = Crew(
-        agents=[web_researcher, content_analyzer, report_writer],
-        tasks=[web_search_task, web_scraping_task, news_aggregation_task, content_analysis_task, report_creation_task],
-        process=Process.sequential,
-        verbose=True
-    )
+    The report and task outputs are also kept in the artifact store under the
+    run ID, so concurrent runs never overwrite each other's results. A fresh
+    report for the same question is served from the report cache instead of
+    running the crew again.
     
-    return crew
-
-def run_web_research(query, days=7, show_intermediate=False):
-    """
-    Run the web research crew with a user query.
+    Each task's output is checkpointed as it completes. Calling this again
+    with the run ID of a run that failed resumes it from the first task it
+    had not completed.
     
     Args:
         query: The user's research query
         days: Number of days to look back for news articles
-        show_intermediate: Whether to show intermediate results
+        show_intermediate: Whether to return intermediate results
+        run_id: ID to store the results under, or of an unfinished run to resume; a new one is created if not given
         
     Returns:
-        The path to the generated report and intermediate results if requested
+        The report, and the intermediate results by task name if requested
+        
+    Raises:
+        ResearchFailed: If the run fails; its run_id resumes the run
     """
     # Load environment variables from .env file
     load_dotenv()
@@ -126,67 +71,79 @@ def run_web_research(query, days=7, show_intermediate=False):
     # Set the model provider to NVIDIA
     os.environ["MODEL_PROVIDER"] = "nvidia"
     
-    # Create a directory for intermediate results if needed
+    artifacts = get_artifact_store()
+    run_id = run_id or new_run_id()
+    
+    # A stale report is not served here: nothing would be left running to refresh it
+    cache = get_report_cache()
+    cached = cache.get(query, days) if cache is not None else None
+    if cached is not None and not cached.stale:
+        for task_name, output in cached.outputs.items():
+            artifacts.put(run_id, task_name, output)
+        artifacts.put(run_id, REPORT, cached.report)
+        # A resumed run answered from the cache has nothing left to resume
+        get_checkpoint_store().finish(run_id)
+        if show_intermediate:
+            return cached.report, dict(cached.outputs)
+        else:
+            return cached.report
+    
     intermediate_results = {}
-    if show_intermediate:
-        os.makedirs("intermediate_results", exist_ok=True)
+    
+    # Tasks an earlier attempt at this run completed are not run again
+    checkpoints = get_checkpoint_store()
+    checkpoint = checkpoints.load(run_id)
+    completed = checkpoint.outputs if checkpoint is not None else {}
+    checkpoints.start(run_id, query, days)
     
     try:
-        # Create the crew
-        crew = create_web_research_crew(query, days)
+        # Reuse a pooled crew; only the query and look-back window are bound per run
+        factory = get_crew_factory()
         
-        # Run the crew with task callbacks if intermediate results are requested
-        if show_intermediate:
-            def task_callback(task_output, task):
-                task_name = task.name
-                # Convert task_output to string if it's not already
-                if not isinstance(task_output, str):
-                    task_output = str(task_output)
-                intermediate_results[task_name] = task_output
-                
-                # Save the intermediate result to a file
-                with open(f"intermediate_results/{task_name}.json", "w") as f:
-                    json.dump({"task": task_name, "output": task_output}, f, indent=2)
-                
-                return task_output
-            
-            result = crew.kickoff(task_callbacks=[task_callback])
-        else:
-            result = crew.kickoff()
+        def task_callback(task_output, task):
+            task_name = task.name
+            # Convert task_output to string if it's not already
+            if not isinstance(task_output, str):
+                task_output = str(task_output)
+            intermediate_results[task_name] = task_output
+            if task_name not in completed:
+                checkpoints.save(run_id, task_name, task_output)
+            artifacts.put(run_id, task_name, task_output)
+            return task_output
+        
+        result = factory.kickoff(query, days, task_callbacks=[task_callback], completed=completed)
         
         # Convert result to string if it's not already
         if not isinstance(result, str):
             result = str(result)
-        
-        # Save the result to a file
-        report_path = "research_report.md"
-        with open(report_path, "w") as f:
-            f.write(result)
-        
-        if show_intermediate:
-            return report_path, intermediate_results
-        else:
-            return report_path
+        artifacts.put(run_id, REPORT, result)
+        checkpoints.finish(run_id)
+        if cache is not None:
+            cache.put(query, days, result, intermediate_results)
     except Exception as e:
         # Handle the specific error we're seeing
         if "cannot schedule new futures after shutdown" in str(e):
             # Create a simple report with the error message
-            report_path = "research_report.md"
-            with open(report_path, "w") as f:
-                f.write(f"# Research Report\n\n")
-                f.write(f"## Error\n\n")
-                f.write(f"An error occurred while running the web research: {str(e)}\n\n")
-                f.write(f"## Possible Solutions\n\n")
-                f.write(f"1. Restart the Streamlit app\n")
-                f.write(f"2. Try a simpler query\n")
-                f.write(f"3. Check your NVIDIA NIM API key\n")
-            
-            if show_intermediate:
-                return report_path, {"error": str(e)}
-            else:
-                return report_path
+            result = (
+                f"# Research Report\n\n"
+                f"## Error\n\n"
+                f"An error occurred while running the web research: {str(e)}\n\n"
+                f"## Possible Solutions\n\n"
+                f"1. Restart the Streamlit app\n"
+                f"2. Try a simpler query\n"
+                f"3. Check your NVIDIA NIM API key\n"
+                f"4. Resume the research with run ID {run_id}\n"
+            )
+            intermediate_results = {"error": str(e)}
         else:
-            raise Exception(f"An error occurred while running the web research: {e}")
+            raise ResearchFailed(
+                f"An error occurred while running the web research (run ID {run_id}): {e}", run_id
+            ) from e
+    
+    if show_intermediate:
+        return result, intermediate_results
+    else:
+        return result
 
 def streamlit_app():
     """
@@ -215,6 +172,9 @@ def streamlit_app():
             st.error("NVIDIA NIM API key not found. Please set the NVIDIA_NIM_API_KEY environment variable.")
             st.stop()
         
+        # Set the model provider to NVIDIA for the background research jobs
+        os.environ["MODEL_PROVIDER"] = "nvidia"
+        
         # Advanced options
         days = st.slider("Look back period for news (days):", min_value=1, max_value=30, value=7)
         show_intermediate = st.checkbox("Show intermediate results", value=False)
@@ -227,6 +187,33 @@ def streamlit_app():
         
         The agent uses NVIDIA NIM models for processing and generating content.
         """)
+        
+        # Crew construction cost: built once per pool slot, then reused across queries
+        crew_stats = get_crew_factory().stats()
+        st.caption(
+            f"Crews built: {crew_stats['builds']} "
+            f"(avg {crew_stats['average_build_seconds']:.2f}s), reused: {crew_stats['reuses']}"
+        )
+        
+        # News ingestion: how far behind publication the local news index runs
+        news_stats = get_feed_poller().stats()
+        if news_stats["feeds"] and news_stats["polls"]:
+            caption = f"News feeds: {news_stats['feeds']}, articles indexed: {news_stats['articles_added']}"
+            if news_stats["lag_mean_seconds"] is not None:
+                caption += f", avg ingestion lag: {news_stats['lag_mean_seconds'] / 60:.0f} min"
+            st.caption(caption)
+        
+        # Background research: how many runs are in flight across all sessions
+        job_stats = get_job_manager().stats()
+        if job_stats["submitted"]:
+            st.caption(f"Research jobs running: {job_stats['running']}, queued: {job_stats['queued']}")
+        
+        # Questions answered from earlier reports instead of a new crew run
+        report_cache = get_report_cache()
+        if report_cache is not None:
+            cache_stats = report_cache.stats()
+            if cache_stats["hits"]:
+                st.caption(f"Answered from cached reports: {cache_stats['hits']} ({cache_stats['hit_ratio']:.0%})")
     
     # Main chat interface
     st.title("🔍 Web Research Agent")
@@ -237,8 +224,52 @@ def streamlit_app():
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
     
+    # The finished research's report download and intermediate results, straight from the artifact store
+    last_run_id = st.session_state.get("last_run_id")
+    artifacts = get_artifact_store().get_run(last_run_id) if last_run_id else {}
+    report_content = artifacts.pop(REPORT, None)
+    if report_content is not None:
+        # Download button for the report
+        st.download_button(
+            label="Download Report",
+            data=report_content,
+            file_name="research_report.md",
+            mime="text/markdown"
+        )
+        
+        # Display intermediate results if requested
+        if show_intermediate and artifacts:
+            with st.expander("View Research Process"):
+                # Create tabs for each intermediate result
+                tabs = st.tabs([f"Step {i+1}: {task_name}" for i, task_name in enumerate(artifacts.keys())])
+                
+                for i, (task_name, result) in enumerate(artifacts.items()):
+                    with tabs[i]:
+                        st.markdown(f"### {task_name}")
+                        st.text(result)
+                        
+                        # Download button for the intermediate result
+                        st.download_button(
+                            label=f"Download {task_name} Result",
+                            data=result,
+                            file_name=f"{task_name}.txt",
+                            mime="text/plain",
+                            key=f"download_{i}"
+                        )
+    
+    # Research runs as a background job; this session only follows its progress
+    manager = get_job_manager()
+    job_id = st.session_state.get("job_id")
+    
+    # A failed or cancelled run can pick up where it stopped, keeping the steps it completed
+    last_job = manager.get(last_run_id) if last_run_id and job_id is None else None
+    if last_job is not None and last_job.status in (FAILED, CANCELLED):
+        if st.button("Resume research from the last completed step"):
+            if manager.resume(last_run_id):
+                job_id = st.session_state.job_id = last_run_id
+    
     # Chat input
-    if prompt := st.chat_input("What would you like to know?"):
+    if prompt := st.chat_input("What would you like to know?", disabled=job_id is not None):
         # Add user message to chat history
         st.session_state.messages.append({"role": "user", "content": prompt})
         
@@ -246,57 +277,104 @@ def streamlit_app():
         with st.chat_message("user"):
             st.markdown(prompt)
         
+        job_id = st.session_state.job_id = manager.submit(prompt, days)
+        st.session_state.last_run_id = None
+    
+    if job_id is not None:
         # Display assistant response
         with st.chat_message("assistant"):
-            with st.spinner("Searching the web... This may take a few minutes."):
-                try:
-                    # Run the web research
-                    if show_intermediate:
-                        report_path, intermediate_results = run_web_research(prompt, days, show_intermediate=True)
-                    else:
-                        report_path = run_web_research(prompt, days)
-                    
-                    # Read the report
-                    with open(report_path, "r") as f:
-                        report_content = f.read()
-                    
-                    # Display the report
-                    st.markdown(report_content)
-                    
-                    # Add assistant message to chat history
-                    st.session_state.messages.append({"role": "assistant", "content": report_content})
-                    
-                    # Download button for the report
-                    st.download_button(
-                        label="Download Report",
-                        data=report_content,
-                        file_name="research_report.md",
-                        mime="text/markdown"
-                    )
-                    
-                    # Display intermediate results if requested
-                    if show_intermediate:
-                        with st.expander("View Research Process"):
-                            # Create tabs for each intermediate result
-                            tabs = st.tabs([f"Step {i+1}: {task_name}" for i, task_name in enumerate(intermediate_results.keys())])
-                            
-                            for i, (task_name, result) in enumerate(intermediate_results.items()):
-                                with tabs[i]:
-                                    st.markdown(f"### {task_name}")
-                                    st.text(result)
-                                    
-                                    # Download button for the intermediate result
-                                    st.download_button(
-                                        label=f"Download {task_name} Result",
-                                        data=result,
-                                        file_name=f"{task_name}.txt",
-                                        mime="text/plain",
-                                        key=f"download_{i}"
-                                    )
-                except Exception as e:
-                    error_message = f"An error occurred: {str(e)}"
-                    st.error(error_message)
-                    st.session_state.messages.append({"role": "assistant", "content": error_message})
+            job = follow_research_job(manager, job_id, show_intermediate)
+        
+        if job is None:
+            content = "An error occurred: the research job was lost. Please ask again."
+        elif job.status == FAILED:
+            content = f"An error occurred: {job.error}"
+        elif job.status == CANCELLED:
+            content = "Research cancelled."
+        else:
+            content = get_artifact_store().get(job_id, REPORT) or "The report is no longer available. Please ask again."
+            if job.cached_at is not None:
+                minutes = (time.time() - job.cached_at) / 60
+                source = f"research done {minutes:.0f} minutes ago"
+                if job.cached_query != job.query:
+                    source += f" for \"{job.cached_query}\""
+                content += f"\n\n*Answered from {source}.*"
+        
+        # Add assistant message to chat history and show it with the rest of the conversation
+        st.session_state.messages.append({"role": "assistant", "content": content})
+        st.session_state.last_run_id = job_id
+        del st.session_state.job_id
+        st.rerun()
+
+def follow_research_job(manager, job_id, show_intermediate=False):
+    """
+    Show a research job's progress until it finishes.
+    
+    The report is shown as it is written, and each step's output appears in
+    the research process view as soon as the step finishes. Any interaction
+    reruns the script and ends this wait, but not the job: the next run
+    picks the job up again from its ID.
+    
+    Args:
+        manager: The JobManager running the job
+        job_id: The ID of the job
+        show_intermediate: Whether to show each task's output as it finishes
+        
+    Returns:
+        The finished job, or None if it is no longer in the job store
+    """
+    cancel_slot = st.empty()
+    if cancel_slot.button("Cancel research", key=f"cancel_{job_id}"):
+        manager.cancel(job_id)
+    
+    status = st.status("Searching the web... This may take a few minutes.", expanded=False)
+    with status:
+        progress = st.empty()
+    draft_slot = st.empty()
+    if show_intermediate:
+        with st.expander("View Research Process"):
+            outputs_slot = st.empty()
+    
+    artifacts = get_artifact_store()
+    shown_steps = shown_outputs = shown_draft = shown_label = None
+    while True:
+        job = manager.get(job_id)
+        if job is None or job.done:
+            cancel_slot.empty()
+            status.update(state="error" if job is None or job.status == FAILED else "complete")
+            return job
+        
+        # Only redraw what changed, so long outputs are not resent on every poll
+        steps = [f"- {'✅' if state == 'done' else '⏳'} {task_name}" for task_name, state in job.tasks.items()]
+        if steps != shown_steps:
+            progress.markdown("\n".join(steps) or "Waiting for a free research worker...")
+            shown_steps = steps
+        
+        # A job following another run of the same question shows that run's steps
+        outputs = artifacts.get_run(job.follows or job_id)
+        if show_intermediate and outputs and list(outputs) != shown_outputs:
+            with outputs_slot.container():
+                tabs = st.tabs([f"Step {i+1}: {task_name}" for i, task_name in enumerate(outputs.keys())])
+                for tab, (task_name, result) in zip(tabs, outputs.items()):
+                    with tab:
+                        st.markdown(f"### {task_name}")
+                        st.text(result)
+            shown_outputs = list(outputs)
+        
+        if job.draft and job.draft != shown_draft:
+            draft_slot.markdown(job.draft + " ▌")
+            shown_draft = job.draft
+        
+        if job.status == CANCELLING:
+            label = "Cancelling once the running steps finish..."
+        elif job.draft:
+            label = "Writing the report..."
+        else:
+            label = f"Searching the web... {len(outputs)} steps done. This may take a few minutes."
+        if label != shown_label:
+            status.update(label=label)
+            shown_label = label
+        time.sleep(JOB_POLL_SECONDS)
 
 if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "streamlit":
@@ -322,11 +400,8 @@ if __name__ == "__main__":
             query = sys.argv[2] if len(sys.argv) > 2 else "What are the latest developments in AI LLMs?"
             
             try:
-                # Create the crew
-                crew = create_web_research_crew(query)
-                
                 # Run the crew
-                result = crew.kickoff()
+                result = get_crew_factory().kickoff(query)
                 
                 # Convert result to string if it's not already
                 if not isinstance(result, str):
@@ -0,0 +1,322 @@
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from webagent.tools.research_memory import get_research_memory
+from webagent.tools.storage import connect
+
+
+# Whether finished reports are cached and served again for the same question
+CACHE_ENABLED = os.environ.get("WEBAGENT_REPORT_CACHE", "true").lower() in ("1", "true", "yes")
+
+# Minutes a report stays fresh per day of news look-back: a question about the last day goes stale sooner
+DEFAULT_TTL_MINUTES_PER_DAY = float(os.environ.get("WEBAGENT_REPORT_TTL_MINUTES_PER_DAY", "15"))
+
+# A report past its TTL is still served, and refreshed in the background, until it is this many TTLs old; 1 disables
+DEFAULT_STALE_FACTOR = float(os.environ.get("WEBAGENT_REPORT_STALE_FACTOR", "4"))
+
+# Questions within this cosine distance of a cached one are answered with its report; 0 matches wordings exactly only
+DEFAULT_MAX_DISTANCE = float(os.environ.get("WEBAGENT_REPORT_MAX_DISTANCE", "0.1"))
+
+# Words that never change what a question asks. Interrogatives, negations and
+# auxiliaries are kept: "why did X fall" and "when did X fall" need different reports
+FILLER_WORDS = frozenset({"a", "an", "the", "please", "tell", "me", "you", "could", "us"})
+
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Words embeddings barely notice but that change what a question asks; a paraphrase must share them.
+# "didn't" splits into "didn" and "t", so the "t" marks every contracted negation
+QUESTION_WORDS = frozenset({"who", "whom", "whose", "what", "when", "where", "which", "why", "how"})
+NEGATION_WORDS = frozenset({"not", "no", "never", "nor", "none", "nothing", "cannot", "without", "t"})
+
+
+def question_intent(words: Iterable[str]) -> Tuple[FrozenSet[str], bool]:
+    """
+    Get what kind of question a wording asks.
+
+    Args:
+        words: The lowercased words of the question
+
+    Returns:
+        Its question words, and whether it is negated
+    """
+    words = list(words)
+    return frozenset(QUESTION_WORDS.intersection(words)), any(word in NEGATION_WORDS for word in words)
+
+
+def normalize_question(query: str) -> str:
+    """
+    Normalize a research question into a cache key.
+
+    Unlike search queries, questions keep their question and negation
+    words; only case, punctuation and filler words are ignored. Wordings
+    that differ otherwise are left to paraphrase matching.
+
+    Args:
+        query: The research question
+
+    Returns:
+        The normalized question
+    """
+    words = WORD_PATTERN.findall(query.lower())
+    meaningful = [word for word in words if word not in FILLER_WORDS]
+    return " ".join(meaningful or words)
+
+
+@dataclass
+class CachedReport:
+    """A cached research result, and whether it is past its TTL."""
+
+    query: str
+    days: int
+    report: str
+    outputs: Dict[str, str] = field(default_factory=dict)
+    created_at: float = 0.0
+    stale: bool = False
+
+
+class ReportCache:
+    """
+    Cache of finished research reports, keyed by question and look-back window.
+
+    Questions are matched on their normalized wording, which ignores case,
+    punctuation and filler words, and the exact look-back window. When an
+    embedding function is given, a question worded differently is also
+    matched to the cached question closest in meaning, if it is close
+    enough and asks the same kind of question: embeddings hardly tell
+    "why" from "when" or a question from its negation, so those words must
+    agree. Reports expire after a TTL proportional to the look-back
+    window; between one and stale_factor TTLs they are still returned,
+    flagged stale, so callers can serve them while a refresh runs.
+    """
+
+    def __init__(
+        self,
+        path: str = "report_cache.sqlite3",
+        ttl_minutes_per_day: float = DEFAULT_TTL_MINUTES_PER_DAY,
+        stale_factor: float = DEFAULT_STALE_FACTOR,
+        max_distance: float = DEFAULT_MAX_DISTANCE,
+        embed: Optional[Callable[[str], List[float]]] = None,
+    ):
+        """
+        Open or create the cache.
+
+        Args:
+            path: Path to the database file, or a bare file name inside the cache directory
+            ttl_minutes_per_day: Minutes a report stays fresh per day of look-back
+            stale_factor: Age in TTLs up to which an expired report is still returned as stale
+            max_distance: Maximum cosine distance of a paraphrase match; 0 disables paraphrase matching
+            embed: Function embedding a question; without it only matching wordings are found
+        """
+        self.ttl_seconds_per_day = ttl_minutes_per_day * 60
+        self.stale_factor = max(1.0, stale_factor)
+        self.max_distance = max_distance
+        self._embed = embed if max_distance > 0 else None
+        self._lock = threading.Lock()
+        self._refreshing: Set[Tuple[str, int]] = set()
+        self._connection = connect(path)
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS reports (
+                key TEXT NOT NULL,
+                days INTEGER NOT NULL,
+                query TEXT NOT NULL,
+                report TEXT NOT NULL,
+                outputs TEXT NOT NULL,
+                embedding BLOB,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (key, days)
+            );
+            """
+        )
+        self._connection.commit()
+        self._counters = {"hits": 0, "paraphrase_hits": 0, "stale_hits": 0, "misses": 0, "stores": 0, "refreshes": 0}
+
+    def ttl(self, days: int) -> float:
+        """
+        Get how long a report stays fresh.
+
+        Args:
+            days: The look-back window of the question
+
+        Returns:
+            The TTL in seconds
+        """
+        return max(1, days) * self.ttl_seconds_per_day
+
+    def _vector(self, query: str) -> Optional[np.ndarray]:
+        if self._embed is None:
+            return None
+        try:
+            vector = np.asarray(self._embed(query), dtype=np.float32)
+        except Exception:
+            # Paraphrase matching is an optimization; exact matching still works without it
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def get(self, query: str, days: int) -> Optional[CachedReport]:
+        """
+        Look up the report for a question.
+
+        Args:
+            query: The research query
+            days: Number of days to look back for news articles
+
+        Returns:
+            The cached report, flagged stale if it is past its TTL, or None on a miss
+        """
+        key = normalize_question(query)
+        now = time.time()
+        ttl = self.ttl(days)
+        oldest = now - ttl * self.stale_factor
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT query, report, outputs, created_at FROM reports WHERE key = ? AND days = ? AND created_at > ?",
+                (key, days, oldest)
+            ).fetchone()
+        paraphrase = False
+
+        if row is None:
+            vector = self._vector(query)
+            if vector is not None:
+                with self._lock:
+                    candidates = self._connection.execute(
+                        "SELECT key, embedding FROM reports WHERE days = ? AND created_at > ? AND embedding IS NOT NULL",
+                        (days, oldest)
+                    ).fetchall()
+                # Reports embedded with a different model cannot be compared
+                intent = question_intent(key.split())
+                candidates = [
+                    candidate for candidate in candidates
+                    if len(candidate[1]) == vector.nbytes and question_intent(candidate[0].split()) == intent
+                ]
+                if candidates:
+                    embeddings = np.frombuffer(b"".join(candidate[1] for candidate in candidates), dtype=np.float32)
+                    distances = 1.0 - embeddings.reshape(len(candidates), -1) @ vector
+                    best = int(np.argmin(distances))
+                    if distances[best] <= self.max_distance:
+                        with self._lock:
+                            # Only the closest report is loaded; it may have been replaced in the meantime
+                            row = self._connection.execute(
+                                "SELECT query, report, outputs, created_at FROM reports "
+                                "WHERE key = ? AND days = ? AND created_at > ?",
+                                (candidates[best][0], days, oldest)
+                            ).fetchone()
+                        paraphrase = row is not None
+
+        with self._lock:
+            if row is None:
+                self._counters["misses"] += 1
+                return None
+            stale = now - row[3] > ttl
+            self._counters["hits"] += 1
+            self._counters["paraphrase_hits"] += paraphrase
+            self._counters["stale_hits"] += stale
+        return CachedReport(
+            query=row[0], days=days, report=row[1], outputs=json.loads(row[2]), created_at=row[3], stale=stale
+        )
+
+    def put(self, query: str, days: int, report: str, outputs: Optional[Dict[str, str]] = None) -> None:
+        """
+        Store the report researched for a question, replacing any earlier one.
+
+        Args:
+            query: The research query
+            days: Number of days to look back for news articles
+            report: The final report
+            outputs: The intermediate task outputs, by task name
+        """
+        vector = self._vector(query)
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO reports (key, days, query, report, outputs, embedding, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    normalize_question(query), days, query, report, json.dumps(outputs or {}),
+                    vector.tobytes() if vector is not None else None, now,
+                )
+            )
+            # Drop reports too old to be served even as stale
+            self._connection.execute(
+                "DELETE FROM reports WHERE created_at < ? - MAX(1, days) * ?",
+                (now, self.ttl_seconds_per_day * self.stale_factor)
+            )
+            self._connection.commit()
+            self._counters["stores"] += 1
+
+    def claim_refresh(self, query: str, days: int) -> bool:
+        """
+        Reserve the refresh of a stale report, so only one caller refreshes it.
+
+        Args:
+            query: The research query
+            days: Number of days to look back for news articles
+
+        Returns:
+            True if the caller should refresh the report and then call release_refresh()
+        """
+        key = (normalize_question(query), days)
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            self._counters["refreshes"] += 1
+            return True
+
+    def release_refresh(self, query: str, days: int) -> None:
+        with self._lock:
+            self._refreshing.discard((normalize_question(query), days))
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get hit/miss counters.
+
+        Returns:
+            Hits, paraphrase and stale hits, misses, stores, refreshes, cached reports and the hit ratio
+        """
+        with self._lock:
+            stats: Dict[str, float] = dict(self._counters)
+            stats["reports"] = self._connection.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM reports")
+            self._connection.commit()
+
+
+_cache: Optional[ReportCache] = None
+_cache_failed = False
+_cache_lock = threading.Lock()
+
+
+def get_report_cache() -> Optional[ReportCache]:
+    """
+    Get the process-wide report cache.
+
+    Paraphrases are matched with the research memory's embedding model when
+    research memory is available.
+
+    Returns:
+        The shared ReportCache, or None if it is disabled
+    """
+    global _cache, _cache_failed
+    if _cache is None and not _cache_failed:
+        with _cache_lock:
+            if _cache is None and not _cache_failed:
+                if not CACHE_ENABLED:
+                    _cache_failed = True
+                else:
+                    memory = get_research_memory()
+                    _cache = ReportCache(embed=memory.embed if memory is not None else None)
+    return _cache
@@ -0,0 +1,124 @@
+import threading
+from typing import Any, Dict, Optional
+
+from crewai import Task
+from crewai.events import LLMCallStartedEvent, LLMStreamChunkEvent, crewai_event_bus
+
+
+# Agents write their answer after this marker; what comes before it is their reasoning
+FINAL_ANSWER_MARKER = "Final Answer:"
+
+
+class TokenBuffer:
+    """
+    Collect the tokens an LLM streams for one task.
+
+    Only the text after the agent's "Final Answer:" marker is exposed, so a
+    reader sees the answer being written without the reasoning before it.
+    A new LLM call for the task starts the buffer over.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._lock = threading.Lock()
+
+    def append(self, chunk: str) -> None:
+        with self._lock:
+            self._chunks.append(chunk)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._chunks = []
+
+    def text(self) -> str:
+        """
+        Get the answer streamed so far.
+
+        Returns:
+            The text after the final answer marker, or an empty string if it has not been streamed yet
+        """
+        with self._lock:
+            text = "".join(self._chunks)
+        position = text.find(FINAL_ANSWER_MARKER)
+        if position < 0:
+            return ""
+        return text[position + len(FINAL_ANSWER_MARKER):].lstrip()
+
+
+class TokenStreams:
+    """
+    Route tokens streamed by the LLM to the buffer of the task they belong to.
+
+    Listens on the crewai event bus, which reports every streamed chunk
+    with the ID of the task whose agent requested it. Concurrent runs use
+    different crews, so their tasks, and the buffers they feed, never mix.
+    """
+
+    def __init__(self):
+        self._buffers: Dict[str, TokenBuffer] = {}
+        self._lock = threading.Lock()
+        self._listening = False
+
+    def _listen(self) -> None:
+        # Called with the lock held; the event bus keeps its handlers for the life of the process
+        if self._listening:
+            return
+
+        @crewai_event_bus.on(LLMCallStartedEvent)
+        def on_call_started(source: Any, event: LLMCallStartedEvent) -> None:
+            buffer = self._buffer_for(event.task_id)
+            if buffer is not None:
+                buffer.reset()
+
+        @crewai_event_bus.on(LLMStreamChunkEvent)
+        def on_chunk(source: Any, event: LLMStreamChunkEvent) -> None:
+            buffer = self._buffer_for(event.task_id)
+            if buffer is not None and event.tool_call is None and event.chunk:
+                buffer.append(event.chunk)
+
+        self._listening = True
+
+    def _buffer_for(self, task_id: Any) -> Optional[TokenBuffer]:
+        if task_id is None:
+            return None
+        with self._lock:
+            return self._buffers.get(str(task_id))
+
+    def subscribe(self, task: Task) -> TokenBuffer:
+        """
+        Start collecting the tokens streamed for a task.
+
+        Args:
+            task: The task about to run
+
+        Returns:
+            The buffer its tokens are collected in
+        """
+        buffer = TokenBuffer()
+        with self._lock:
+            self._listen()
+            self._buffers[str(task.id)] = buffer
+        return buffer
+
+    def unsubscribe(self, task: Task) -> None:
+        with self._lock:
+            self._buffers.pop(str(task.id), None)
+
+
+_streams: Optional[TokenStreams] = None
+_streams_lock = threading.Lock()
+
+
+def get_token_streams() -> TokenStreams:
+    """
+    Get the process-wide token router.
+
+    Returns:
+        The shared TokenStreams
+    """
+    global _streams
+    if _streams is None:
+        with _streams_lock:
+            if _streams is None:
+                _streams = TokenStreams()
+    return _streams
@@ -0,0 +1,287 @@
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from crewai import Agent, Crew, Process, Task
+from crewai.crews.crew_output import CrewOutput
+from crewai.tasks.task_output import TaskOutput
+from crewai.types.usage_metrics import UsageMetrics
+from pydantic import PrivateAttr
+
+from webagent.context_compression import CompressedContext, DEFAULT_CONTEXT_TOKEN_BUDGET, compress_context
+
+
+# Maximum number of tasks executed at the same time
+DEFAULT_MAX_PARALLEL_TASKS = int(os.environ.get("WEBAGENT_MAX_PARALLEL_TASKS", "4"))
+
+
+class RunCancelled(Exception):
+    """Raised by TaskGraph.kickoff() when a run is cancelled before all of its tasks have finished."""
+
+
+class ContextCompressingCrew(Crew):
+    """
+    Crew that compresses upstream task outputs before they reach the next agent.
+
+    Overrides Crew._get_context, which assembles a task's context from the
+    outputs of the tasks it depends on.
+    """
+
+    context_token_budget: int = DEFAULT_CONTEXT_TOKEN_BUDGET
+    _compressed: Optional[CompressedContext] = PrivateAttr(default=None)
+
+    def _get_context(self, task: Task, task_outputs: List[TaskOutput]) -> str:
+        if not isinstance(task.context, list) or not task.context or self.context_token_budget <= 0:
+            return super()._get_context(task, task_outputs)
+
+        outputs = [other.output.raw for other in task.context if other.output is not None]
+        self._compressed = compress_context(outputs, self.context_token_budget)
+        return self._compressed.text
+
+
+class TaskGraph:
+    """
+    Run crew tasks as a dependency graph instead of a strict sequence.
+
+    A task depends on the tasks listed in its `context`; tasks without an
+    explicit context are roots. Every task starts as soon as all of its
+    dependencies have finished, so independent branches run concurrently and
+    join at the first task that needs both. Each task runs in its own
+    single-task Crew; upstream outputs reach it through the regular `context`
+    mechanism, compressed to a per-output token budget.
+
+    An Agent is not safe to use from two threads at once, so when a task's
+    agent is already busy on another branch the task runs on a copy of it.
+    """
+
+    def __init__(
+        self,
+        agents: List[Agent],
+        tasks: List[Task],
+        max_workers: int = DEFAULT_MAX_PARALLEL_TASKS,
+        verbose: bool = True,
+        context_token_budget: int = DEFAULT_CONTEXT_TOKEN_BUDGET,
+    ):
+        self.agents = agents
+        self.tasks = tasks
+        self.max_workers = max(1, max_workers)
+        self.verbose = verbose
+        self.context_token_budget = context_token_budget
+        # Context size in tokens before and after compression, per task name, for the last run
+        self.context_tokens: Dict[str, Tuple[int, int]] = {}
+        self._dependencies = self._build_dependencies(tasks)
+        self._lock = threading.Lock()
+        self._busy_agents: set = set()
+        self._idle_copies: Dict[int, List[Agent]] = {}
+
+    @staticmethod
+    def _build_dependencies(tasks: List[Task]) -> Dict[int, List[Task]]:
+        """
+        Derive each task's dependencies from its context.
+
+        Args:
+            tasks: The tasks of the graph, in declaration order
+
+        Returns:
+            A mapping from task id to the tasks it waits for
+
+        Raises:
+            ValueError: If a task depends on a task declared after it
+        """
+        positions = {id(task): index for index, task in enumerate(tasks)}
+        dependencies = {}
+        for index, task in enumerate(tasks):
+            context = task.context if isinstance(task.context, list) else []
+            upstream = [other for other in context if id(other) in positions]
+            for other in upstream:
+                if positions[id(other)] > index:
+                    raise ValueError(
+                        f"Task '{task.description}' depends on a later task '{other.description}'"
+                    )
+            dependencies[id(task)] = upstream
+        return dependencies
+
+    def kickoff(
+        self,
+        inputs: Optional[Dict[str, Any]] = None,
+        task_callbacks: Optional[List[Callable[[Any, Task], Any]]] = None,
+        start_callbacks: Optional[List[Callable[[Task], Any]]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        completed: Optional[Dict[str, str]] = None,
+    ) -> CrewOutput:
+        """
+        Execute the graph and wait for every task to finish.
+
+        Tasks named in completed are not run again: their saved output is
+        restored as if they had just finished, so a failed run can resume
+        from the tasks it had not completed.
+
+        A task that is already running cannot be interrupted, so cancellation
+        takes effect as soon as the running tasks finish: no further task is
+        started and their dependents are skipped.
+
+        Args:
+            inputs: Values interpolated into task and agent templates
+            task_callbacks: Functions called with (task_output, task) as each task completes
+            start_callbacks: Functions called with the task as each task starts
+            cancel_event: When set, stops the run at the next task boundary
+            completed: Raw outputs of tasks finished by an earlier attempt, by task name
+
+        Returns:
+            A CrewOutput whose raw output is the last task's output
+
+        Raises:
+            RunCancelled: If cancel_event was set before the last task finished
+            Exception: The first error raised by a task; tasks not yet started are cancelled
+        """
+        self.context_tokens = {}
+        remaining = {id(task): len(self._dependencies[id(task)]) for task in self.tasks}
+        dependents: Dict[int, List[Task]] = {id(task): [] for task in self.tasks}
+        for task in self.tasks:
+            for other in self._dependencies[id(task)]:
+                dependents[id(other)].append(task)
+
+        results: Dict[int, CrewOutput] = {
+            id(task): self._restore(task, completed[task.name])
+            for task in self.tasks
+            if completed and task.name in completed
+        }
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="webagent-task") as executor:
+            running: Dict[Future, Task] = {}
+
+            def start(task: Task) -> None:
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                for callback in start_callbacks or []:
+                    callback(task)
+                running[executor.submit(self._execute, task, inputs)] = task
+
+            def finish(task: Task) -> None:
+                for callback in task_callbacks or []:
+                    callback(task.output, task)
+
+                for dependent in dependents[id(task)]:
+                    remaining[id(dependent)] -= 1
+                    if remaining[id(dependent)] == 0 and id(dependent) not in results:
+                        start(dependent)
+
+            for task in self.tasks:
+                if id(task) in results:
+                    finish(task)
+            for task in self.tasks:
+                if not self._dependencies[id(task)] and id(task) not in results:
+                    start(task)
+
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    try:
+                        results[id(task)] = future.result()
+                    except Exception:
+                        for pending in running:
+                            pending.cancel()
+                        raise
+                    finish(task)
+
+        if cancel_event is not None and cancel_event.is_set() and len(results) < len(self.tasks):
+            raise RunCancelled("The run was cancelled")
+        return self._combine([results[id(task)] for task in self.tasks])
+
+    @staticmethod
+    def _restore(task: Task, raw: str) -> CrewOutput:
+        """
+        Rebuild the result of a task from its saved raw output.
+
+        Args:
+            task: The task that finished in an earlier attempt
+            raw: Its raw output
+
+        Returns:
+            A crew output as if the task had just run; the task's own output is set too,
+            so downstream tasks receive it as context
+        """
+        task.output = TaskOutput(
+            description=task.description,
+            name=task.name,
+            expected_output=task.expected_output,
+            raw=raw,
+            agent=task.agent.role if task.agent is not None else "",
+        )
+        return CrewOutput(raw=raw, tasks_output=[task.output], token_usage=UsageMetrics())
+
+    def _execute(self, task: Task, inputs: Optional[Dict[str, Any]]) -> CrewOutput:
+        """
+        Run a single task in its own crew.
+
+        Args:
+            task: The task to run
+            inputs: Values interpolated into task and agent templates
+
+        Returns:
+            The output of the single-task crew
+        """
+        owner = task.agent
+        agent = self._acquire(owner)
+        task.agent = agent
+        try:
+            crew = ContextCompressingCrew(
+                agents=[agent],
+                tasks=[task],
+                process=Process.sequential,
+                verbose=self.verbose,
+                context_token_budget=self.context_token_budget,
+            )
+            output = crew.kickoff(inputs=inputs)
+            if crew._compressed is not None:
+                with self._lock:
+                    self.context_tokens[task.name or task.description] = (
+                        crew._compressed.tokens_before,
+                        crew._compressed.tokens_after,
+                    )
+            return output
+        finally:
+            task.agent = owner
+            self._release(owner, agent)
+
+    def _acquire(self, agent: Agent) -> Agent:
+        with self._lock:
+            if id(agent) not in self._busy_agents:
+                self._busy_agents.add(id(agent))
+                return agent
+            copies = self._idle_copies.get(id(agent))
+            if copies:
+                return copies.pop()
+        return agent.copy()
+
+    def _release(self, owner: Agent, agent: Agent) -> None:
+        with self._lock:
+            if agent is owner:
+                self._busy_agents.discard(id(owner))
+            else:
+                self._idle_copies.setdefault(id(owner), []).append(agent)
+
+    @staticmethod
+    def _combine(outputs: List[CrewOutput]) -> CrewOutput:
+        """
+        Merge the per-task crew outputs into one result.
+
+        Args:
+            outputs: The crew outputs in task declaration order
+
+        Returns:
+            A CrewOutput with every task's output and the summed token usage
+        """
+        token_usage = UsageMetrics()
+        for output in outputs:
+            token_usage.add_usage_metrics(output.token_usage)
+
+        final = outputs[-1]
+        return CrewOutput(
+            raw=final.raw,
+            pydantic=final.pydantic,
+            json_dict=final.json_dict,
+            tasks_output=[output.tasks_output[-1] for output in outputs],
+            token_usage=token_usage,
+        )
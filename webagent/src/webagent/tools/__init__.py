@@ -2,10 +2,12 @@ from webagent.tools.web_search_tool import WebSearchTool
 from webagent.tools.web_scraper_tool import WebScraperTool
 from webagent.tools.content_analyzer_tool import ContentAnalyzerTool
 from webagent.tools.news_aggregator_tool import NewsAggregatorTool
+from webagent.tools.research_memory_tool import ResearchMemoryTool
 
 __all__ = [
     "WebSearchTool",
     "WebScraperTool",
     "ContentAnalyzerTool",
     "NewsAggregatorTool",
+    "ResearchMemoryTool",
 ]
@@ -1,13 +1,145 @@
 from crewai.tools import BaseTool
-from typing import Type, Dict, Any, List
+from typing import Type, Dict, Any, List, Optional, Tuple, Union
 from pydantic import BaseModel, Field
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import cached_property
+import asyncio
+import hashlib
 import json
+import multiprocessing
+import os
 import re
+import threading
+
+import numpy as np
+
+from webagent.tools.keyword_matcher import KeywordMatcher, load_lexicon, tokenize
+from webagent.tools.near_duplicates import NearDuplicateIndex
+
+
+# Analyses the tool can run; an unknown analysis_type runs all of them
+ANALYSIS_TYPES = ("summary", "key_points", "entities", "sentiment")
+
+# Sentence boundaries: whitespace after terminal punctuation
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+# Sentences containing one of these phrases are reported as key points
+DEFAULT_KEY_PHRASES = {
+    phrase: 1.0
+    for phrase in (
+        "important", "importantly", "key", "significant", "significantly", "notable", "notably",
+        "critical", "critically", "essential", "crucial", "in conclusion", "in summary",
+    )
+}
+
+# Sentiment terms with signed weights: positive terms above zero, negative terms below
+DEFAULT_SENTIMENT_LEXICON = {
+    **{word: 1.0 for word in ("good", "great", "excellent", "amazing", "wonderful", "positive", "beneficial", "advantage", "success", "happy")},
+    **{word: -1.0 for word in ("bad", "poor", "terrible", "awful", "horrible", "negative", "detrimental", "disadvantage", "failure", "sad")},
+}
+
+DEFAULT_LEXICONS = {"key_phrases": DEFAULT_KEY_PHRASES, "sentiment": DEFAULT_SENTIMENT_LEXICON}
+
+# Lexicon files whose terms are added to (or override) the built-in ones; see keyword_matcher.load_lexicon
+LEXICON_FILES = {
+    "key_phrases": os.environ.get("WEBAGENT_KEY_PHRASE_LEXICON"),
+    "sentiment": os.environ.get("WEBAGENT_SENTIMENT_LEXICON"),
+}
+
+
+def _available_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+# Number of sentences in a generated summary
+SUMMARY_SENTENCES = int(os.environ.get("WEBAGENT_SUMMARY_SENTENCES", "3"))
+
+# Most sentences ranked per summary; longer texts are sampled evenly, bounding cost at O(n^2) in this cap
+MAX_SUMMARY_CANDIDATES = int(os.environ.get("WEBAGENT_SUMMARY_MAX_SENTENCES", "300"))
+
+# TextRank damping factor and convergence settings
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_MAX_ITERATIONS = 50
+TEXTRANK_TOLERANCE = 1e-6
+
+# Words ignored when comparing sentences
+SUMMARY_STOP_WORDS = frozenset({
+    "a", "about", "after", "all", "also", "an", "and", "any", "are", "as", "at", "be", "been",
+    "but", "by", "can", "could", "did", "do", "does", "for", "from", "had", "has", "have", "he",
+    "her", "his", "how", "i", "if", "in", "into", "is", "it", "its", "more", "most", "no", "not",
+    "of", "on", "or", "our", "over", "she", "so", "such", "than", "that", "the", "their", "them",
+    "then", "there", "these", "they", "this", "those", "to", "up", "was", "we", "were", "what",
+    "when", "where", "which", "while", "who", "why", "will", "with", "would", "you", "your",
+})
+
+# Worker processes used to analyze large batches of documents; 1 disables the pool
+DEFAULT_ANALYZER_WORKERS = int(os.environ.get("WEBAGENT_ANALYZER_WORKERS", str(_available_cpus())))
+
+# Batches with less text than this are analyzed in-process; worker round-trips would cost more
+PROCESS_POOL_MIN_CHARS = int(os.environ.get("WEBAGENT_ANALYZER_POOL_MIN_CHARS", "100000"))
+
+# Number of per-document results remembered, keyed by content hash
+ANALYSIS_MEMO_SIZE = 512
+
+# Batches often hold search snippets and headlines, so fewer words than the default are enough to compare them
+BATCH_DUPLICATE_MIN_WORDS = 8
+
+# Key points reported in the aggregate of a batch
+MAX_AGGREGATE_KEY_POINTS = 20
+
+# Entity patterns; organizations and locations are only searched for when one of their suffixes occurs
+PEOPLE_PATTERN = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b')
+ORG_SUFFIXES = ("Inc.", "Corp.", "Ltd.", "LLC", "Company", "Association", "Organization")
+ORG_PATTERN = re.compile(r'\b[A-Z][a-zA-Z\s]+(?:Inc\.|Corp\.|Ltd\.|LLC|Company|Association|Organization)\b')
+LOCATION_SUFFIXES = ("City", "Country", "State", "Province", "Region", "Continent")
+LOCATION_PATTERN = re.compile(r'\b[A-Z][a-zA-Z\s]+(?:City|Country|State|Province|Region|Continent)\b')
+DATE_PATTERN = re.compile(r'\b(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{4}\b')
+
+
+class AnalysisDocument:
+    """
+    Shared representation of a text for all analyses.
+
+    The sentence split, the lowercased text and the word tokens are computed
+    at most once, and only when an analysis needs them.
+    """
+
+    def __init__(self, content: str):
+        self.content = content
+
+    @cached_property
+    def lowered(self) -> str:
+        return self.content.lower()
+
+    @cached_property
+    def sentences(self) -> List[str]:
+        return SENTENCE_SPLIT.split(self.content)
+
+    @cached_property
+    def sentence_tokens(self) -> List[List[str]]:
+        return [tokenize(sentence.lower()) for sentence in self.sentences]
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        return tokenize(self.lowered)
 
 
 class ContentAnalyzerToolInput(BaseModel):
     """Input schema for ContentAnalyzerTool."""
-    content: str = Field(..., description="The content to analyze.")
+    content: Optional[str] = Field(default=None, description="The content to analyze.")
+    documents: Optional[List[Union[str, Dict[str, Any]]]] = Field(
+        default=None,
+        description=(
+            "A list of documents to analyze separately in a single call, e.g. per-URL scrape results. "
+            "Each item is a string or an object with 'content' (or 'text') and an optional 'url' or 'id' "
+            "used to attribute the results. Use this instead of 'content' for several sources."
+        )
+    )
     analysis_type: str = Field(
         default="summary", 
         description="Type of analysis to perform: 'summary', 'key_points', 'entities', or 'sentiment'."
@@ -17,93 +149,345 @@ class ContentAnalyzerTool(BaseTool):
     name: str = "Content Analyzer Tool"
     description: str = (
         "A tool for analyzing content and extracting key information. "
-        "It can generate summaries, extract key points, identify entities, or analyze sentiment."
+        "It can generate summaries, extract key points, identify entities, or analyze sentiment, "
+        "for a single text or for a list of documents with per-document and combined results."
     )
     args_schema: Type[BaseModel] = ContentAnalyzerToolInput
 
-    def _run(self, content: str, analysis_type: str = "summary") -> str:
+    def _run(
+        self,
+        content: Optional[str] = None,
+        analysis_type: str = "summary",
+        documents: Optional[List[Union[str, Dict[str, Any]]]] = None,
+    ) -> str:
         """
         Analyze content and extract the requested information.
         
         Args:
             content: The content to analyze
             analysis_type: Type of analysis to perform ('summary', 'key_points', 'entities', or 'sentiment')
+            documents: Several documents to analyze separately; takes precedence over content
             
         Returns:
             A JSON string containing the analysis results
         """
         try:
-            result = {}
+            analysis_types = [analysis_type] if analysis_type in ANALYSIS_TYPES else list(ANALYSIS_TYPES)
+            if documents:
+                return json.dumps(self._analyze_batch(documents, analysis_types), indent=2)
+            if content is None:
+                return json.dumps({"error": "Either 'content' or 'documents' must be provided"}, indent=2)
             
-            if analysis_type == "summary":
-                result["summary"] = self._generate_summary(content)
-            elif analysis_type == "key_points":
-                result["key_points"] = self._extract_key_points(content)
-            elif analysis_type == "entities":
-                result["entities"] = self._identify_entities(content)
-            elif analysis_type == "sentiment":
-                result["sentiment"] = self._analyze_sentiment(content)
-            else:
-                # If an unknown analysis type is requested, perform all analyses
-                result = {
-                    "summary": self._generate_summary(content),
-                    "key_points": self._extract_key_points(content),
-                    "entities": self._identify_entities(content),
-                    "sentiment": self._analyze_sentiment(content)
-                }
+            result = self._analyze(AnalysisDocument(content), analysis_types)
             
             return json.dumps(result, indent=2)
         except Exception as e:
             return f"Error analyzing content: {str(e)}"
     
-    def _generate_summary(self, content: str) -> str:
+    async def _arun(
+        self,
+        content: Optional[str] = None,
+        analysis_type: str = "summary",
+        documents: Optional[List[Union[str, Dict[str, Any]]]] = None,
+    ) -> str:
         """
-        Generate a summary of the content.
+        Analyze content in a worker thread so the event loop stays responsive.
         
         Args:
-            content: The content to summarize
+            content: The content to analyze
+            analysis_type: Type of analysis to perform ('summary', 'key_points', 'entities', or 'sentiment')
+            documents: Several documents to analyze separately; takes precedence over content
             
         Returns:
-            A summary of the content
+            A JSON string containing the analysis results
         """
-        # In a real implementation, this would use NLP techniques or an LLM
-        # For this example, we'll create a simple summary
+        return await asyncio.to_thread(self._run, content, analysis_type, documents)
+    
+    def _analyze_batch(
+        self,
+        documents: List[Union[str, Dict[str, Any]]],
+        analysis_types: List[str],
+    ) -> Dict[str, Any]:
+        """
+        Analyze several documents, each on its own, and combine the results.
+        
+        Documents that nearly duplicate an earlier one in the batch (mirrors,
+        syndicated copies) are skipped, documents seen before (by content
+        hash) reuse their earlier results, and large batches are spread over
+        a pool of worker processes.
+        
+        Args:
+            documents: Strings or objects with 'content'/'text' and an optional 'url'/'id'
+            analysis_types: The analyses to run
+            
+        Returns:
+            A dictionary with per-document results in input order and an aggregate
+        """
+        sources = []
+        pending: Dict[str, str] = {}
+        results: Dict[str, Dict[str, Any]] = {}
+        near_duplicates = NearDuplicateIndex(min_words=BATCH_DUPLICATE_MIN_WORDS)
+        cached = 0
+        for index, document in enumerate(documents):
+            source, text = self._document_parts(document, index)
+            if text is None:
+                sources.append((source, None, None))
+                continue
+            duplicate_of = near_duplicates.check(source, text)
+            if duplicate_of is not None:
+                sources.append((source, None, duplicate_of))
+                continue
+            
+            digest = hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+            sources.append((source, digest, None))
+            if digest in results or digest in pending:
+                continue
+            memoized = _memo_get(digest, analysis_types)
+            if memoized is not None:
+                results[digest] = memoized
+                cached += 1
+            else:
+                pending[digest] = text
+        
+        results.update(self._analyze_texts(pending, analysis_types))
+        
+        entries = []
+        for source, digest, duplicate_of in sources:
+            if duplicate_of is not None:
+                entries.append({"source": source, "duplicate_of": duplicate_of})
+            elif digest is None:
+                entries.append({"source": source, "error": "Document has no 'content' or 'text'"})
+            else:
+                entries.append({"source": source, "analysis": results[digest]})
+        
+        return {
+            "documents": entries,
+            "aggregate": self._aggregate(entries, analysis_types),
+            "analyzed": len(pending),
+            "cached": cached,
+            "duplicates": sum(1 for _, _, duplicate_of in sources if duplicate_of is not None),
+        }
+    
+    def _analyze_texts(self, texts: Dict[str, str], analysis_types: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyze texts in-process or in the worker pool, depending on their total size.
+        
+        Args:
+            texts: The texts to analyze, keyed by content hash
+            analysis_types: The analyses to run
+            
+        Returns:
+            The analysis of each text, keyed by content hash
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        use_pool = (
+            DEFAULT_ANALYZER_WORKERS > 1
+            and len(texts) > 1
+            and sum(len(text) for text in texts.values()) >= PROCESS_POOL_MIN_CHARS
+        )
+        if use_pool:
+            try:
+                executor = get_analysis_pool()
+                futures = {
+                    digest: executor.submit(_analyze_in_worker, text, analysis_types)
+                    for digest, text in texts.items()
+                }
+                results = {digest: future.result() for digest, future in futures.items()}
+            except (BrokenProcessPool, OSError):
+                # Worker processes unavailable (e.g. a sandbox); analyze in this process instead
+                reset_analysis_pool()
+                results = {}
         
-        # Split content into sentences
-        sentences = re.split(r'(?<=[.!?])\s+', content)
+        for digest, text in texts.items():
+            if digest not in results:
+                results[digest] = self._analyze(AnalysisDocument(text), analysis_types)
+            _memo_put(digest, analysis_types, results[digest])
+        return results
+    
+    @staticmethod
+    def _document_parts(document: Union[str, Dict[str, Any]], index: int) -> Tuple[str, Optional[str]]:
+        """
+        Get the source label and text of a batch item.
+        
+        Args:
+            document: A string or an object with 'content'/'text' and an optional 'url'/'id'
+            index: Position of the item in the batch
+            
+        Returns:
+            The source label and the text, or None if the item has no text
+        """
+        if isinstance(document, str):
+            return f"document-{index + 1}", document
+        
+        source = document.get("url") or document.get("id") or f"document-{index + 1}"
+        text = document.get("content", document.get("text"))
+        if text is not None and not isinstance(text, str):
+            text = json.dumps(text)
+        return str(source), text
+    
+    def _aggregate(self, entries: List[Dict[str, Any]], analysis_types: List[str]) -> Dict[str, Any]:
+        """
+        Combine per-document analyses into one result for the whole batch.
+        
+        Args:
+            entries: The per-document results
+            analysis_types: The analyses that were run
+            
+        Returns:
+            The combined analyses; key points keep the source they came from
+        """
+        analyses = [(entry["source"], entry["analysis"]) for entry in entries if "analysis" in entry]
+        aggregate: Dict[str, Any] = {}
+        
+        if "summary" in analysis_types:
+            summaries = " ".join(analysis["summary"] for _, analysis in analyses if analysis["summary"])
+            aggregate["summary"] = self._generate_summary(AnalysisDocument(summaries))
+        
+        if "key_points" in analysis_types:
+            aggregate["key_points"] = [
+                {"source": source, "text": point}
+                for source, analysis in analyses
+                for point in analysis["key_points"]
+            ][:MAX_AGGREGATE_KEY_POINTS]
+        
+        if "entities" in analysis_types:
+            combined: Dict[str, Dict[str, None]] = {}
+            for _, analysis in analyses:
+                for entity_type, values in analysis["entities"].items():
+                    combined.setdefault(entity_type, {}).update(dict.fromkeys(values))
+            aggregate["entities"] = {entity_type: list(values) for entity_type, values in combined.items()}
+        
+        if "sentiment" in analysis_types:
+            aggregate["sentiment"] = self._sentiment_from_counts(*(
+                sum(analysis["sentiment"][field] for _, analysis in analyses)
+                for field in ("positive_count", "negative_count", "positive_weight", "negative_weight")
+            ))
+        
+        return aggregate
+    
+    def _analyze(self, document: AnalysisDocument, analysis_types: List[str]) -> Dict[str, Any]:
+        """
+        Run several analyses over one shared document.
+        
+        Args:
+            document: The document to analyze
+            analysis_types: The analyses to run, in output order
+            
+        Returns:
+            A dictionary mapping each analysis type to its result
+        """
+        analyses = {
+            "summary": self._generate_summary,
+            "key_points": self._extract_key_points,
+            "entities": self._identify_entities,
+            "sentiment": self._analyze_sentiment,
+        }
+        return {analysis_type: analyses[analysis_type](document) for analysis_type in analysis_types}
+    
+    def _generate_summary(self, document: AnalysisDocument, max_sentences: int = SUMMARY_SENTENCES) -> str:
+        """
+        Generate an extractive summary of the content.
+        
+        Sentences are ranked with TextRank: each becomes a TF-IDF vector, the
+        cosine similarities between them form a graph, and PageRank over that
+        graph scores how central each sentence is. The best sentences are
+        returned in document order.
+        
+        Args:
+            document: The document to summarize
+            max_sentences: Number of sentences in the summary
+            
+        Returns:
+            A summary of the content
+        """
+        # Repeated sentences (boilerplate, or the same source twice) are ranked once
+        first_seen: Dict[str, int] = {}
+        for index, sentence in enumerate(document.sentences):
+            if sentence.strip():
+                first_seen.setdefault(sentence.strip(), index)
+        sentences = list(first_seen)
         
         # If content is too short, return it as is
-        if len(sentences) <= 3:
-            return content
+        if len(sentences) <= max_sentences:
+            return document.content if len(sentences) == len(document.sentences) else " ".join(sentences)
         
-        # Take the first and last sentences, and a middle sentence if available
-        summary = sentences[0]
-        if len(sentences) > 2:
-            summary += " " + sentences[len(sentences) // 2]
-        summary += " " + sentences[-1]
+        # Rank an even sample of very long texts so the cost stays bounded
+        indices = np.arange(len(sentences))
+        if len(sentences) > MAX_SUMMARY_CANDIDATES:
+            indices = np.unique(np.linspace(0, len(sentences) - 1, MAX_SUMMARY_CANDIDATES).astype(int))
+        candidates = [sentences[index] for index in indices]
         
-        return summary
+        tokens = document.sentence_tokens
+        scores = self._textrank([tokens[first_seen[sentence]] for sentence in candidates])
+        best = np.sort(np.argsort(-scores, kind="stable")[:max_sentences])
+        return " ".join(candidates[index] for index in best)
     
-    def _extract_key_points(self, content: str) -> List[str]:
+    @staticmethod
+    def _textrank(sentences: List[List[str]]) -> np.ndarray:
+        """
+        Score sentences by their centrality in the sentence similarity graph.
+        
+        Args:
+            sentences: The word tokens of each sentence to rank
+            
+        Returns:
+            One score per sentence; higher is more central
+        """
+        vocabulary: Dict[str, int] = {}
+        rows, columns = [], []
+        for row, words in enumerate(sentences):
+            for word in words:
+                if word not in SUMMARY_STOP_WORDS:
+                    rows.append(row)
+                    columns.append(vocabulary.setdefault(word, len(vocabulary)))
+        
+        count = len(sentences)
+        if not vocabulary:
+            return np.zeros(count)
+        
+        # Log-scaled term frequencies weighted by smoothed inverse document frequency
+        counts = np.zeros((count, len(vocabulary)), dtype=np.float32)
+        np.add.at(counts, (np.array(rows), np.array(columns)), 1.0)
+        document_frequency = np.count_nonzero(counts, axis=0)
+        vectors = np.log1p(counts) * (np.log((1 + count) / (1 + document_frequency)) + 1)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+        
+        # Cosine similarity graph without self-loops, normalized into transition probabilities
+        similarity = vectors @ vectors.T
+        np.fill_diagonal(similarity, 0.0)
+        out_weight = similarity.sum(axis=1, keepdims=True)
+        transitions = np.divide(similarity, out_weight, out=np.full_like(similarity, 1.0 / count), where=out_weight > 0)
+        
+        scores = np.full(count, 1.0 / count)
+        for _ in range(TEXTRANK_MAX_ITERATIONS):
+            updated = (1 - TEXTRANK_DAMPING) / count + TEXTRANK_DAMPING * (transitions.T @ scores)
+            converged = np.abs(updated - scores).sum() < TEXTRANK_TOLERANCE
+            scores = updated
+            if converged:
+                break
+        return scores
+    
+    def _extract_key_points(self, document: AnalysisDocument) -> List[str]:
         """
         Extract key points from the content.
         
         Args:
-            content: The content to analyze
+            document: The document to analyze
             
         Returns:
             A list of key points
         """
         # In a real implementation, this would use NLP techniques or an LLM
-        # For this example, we'll extract sentences that start with key phrases
-        
-        key_phrases = ["important", "key", "significant", "notable", "critical", "essential"]
-        sentences = re.split(r'(?<=[.!?])\s+', content)
+        # For this example, we'll extract sentences that contain key phrases
+        sentences = document.sentences
+        matcher = get_lexicon_matcher("key_phrases")
         
-        key_points = []
-        for sentence in sentences:
-            if any(phrase in sentence.lower() for phrase in key_phrases):
-                key_points.append(sentence)
+        key_points = [
+            sentence
+            for sentence, words in zip(sentences, document.sentence_tokens)
+            if matcher.contains_any(words)
+        ]
         
         # If no key points were found, take the first few sentences
         if not key_points and sentences:
@@ -111,18 +495,19 @@ class ContentAnalyzerTool(BaseTool):
         
         return key_points
     
-    def _identify_entities(self, content: str) -> Dict[str, List[str]]:
+    def _identify_entities(self, document: AnalysisDocument) -> Dict[str, List[str]]:
         """
         Identify entities in the content.
         
         Args:
-            content: The content to analyze
+            document: The document to analyze
             
         Returns:
             A dictionary of entity types and their values
         """
         # In a real implementation, this would use NLP techniques or an LLM
         # For this example, we'll use simple regex patterns
+        content = document.content
         
         entities = {
             "people": [],
@@ -132,48 +517,58 @@ class ContentAnalyzerTool(BaseTool):
         }
         
         # Extract people (capitalized words that might be names)
-        people_pattern = r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b'
-        entities["people"] = list(set(re.findall(people_pattern, content)))
+        entities["people"] = list(set(PEOPLE_PATTERN.findall(content)))
         
         # Extract organizations (words followed by Inc., Corp., Ltd., etc.)
-        org_pattern = r'\b[A-Z][a-zA-Z\s]+(?:Inc\.|Corp\.|Ltd\.|LLC|Company|Association|Organization)\b'
-        entities["organizations"] = list(set(re.findall(org_pattern, content)))
+        if any(suffix in content for suffix in ORG_SUFFIXES):
+            entities["organizations"] = list(set(ORG_PATTERN.findall(content)))
         
         # Extract locations (words that might be cities, countries, etc.)
-        location_pattern = r'\b[A-Z][a-zA-Z\s]+(?:City|Country|State|Province|Region|Continent)\b'
-        entities["locations"] = list(set(re.findall(location_pattern, content)))
+        if any(suffix in content for suffix in LOCATION_SUFFIXES):
+            entities["locations"] = list(set(LOCATION_PATTERN.findall(content)))
         
         # Extract dates (various date formats)
-        date_pattern = r'\b(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{4}\b'
-        entities["dates"] = list(set(re.findall(date_pattern, content)))
+        entities["dates"] = list(set(DATE_PATTERN.findall(content)))
         
         return entities
     
-    def _analyze_sentiment(self, content: str) -> Dict[str, Any]:
+    def _analyze_sentiment(self, document: AnalysisDocument) -> Dict[str, Any]:
         """
         Analyze the sentiment of the content.
         
         Args:
-            content: The content to analyze
+            document: The document to analyze
             
         Returns:
             A dictionary containing sentiment analysis results
         """
         # In a real implementation, this would use NLP techniques or an LLM
         # For this example, we'll use a simple keyword-based approach
+        positive_count = negative_count = 0
+        positive_weight = negative_weight = 0.0
+        for _, _, weight in get_lexicon_matcher("sentiment").iter_matches(document.tokens):
+            if weight > 0:
+                positive_count += 1
+                positive_weight += weight
+            elif weight < 0:
+                negative_count += 1
+                negative_weight -= weight
         
-        positive_words = ["good", "great", "excellent", "amazing", "wonderful", "positive", "beneficial", "advantage", "success", "happy"]
-        negative_words = ["bad", "poor", "terrible", "awful", "horrible", "negative", "detrimental", "disadvantage", "failure", "sad"]
-        
-        positive_count = sum(1 for word in positive_words if word in content.lower())
-        negative_count = sum(1 for word in negative_words if word in content.lower())
-        
-        total = positive_count + negative_count
+        return self._sentiment_from_counts(positive_count, negative_count, positive_weight, negative_weight)
+    
+    @staticmethod
+    def _sentiment_from_counts(
+        positive_count: int,
+        negative_count: int,
+        positive_weight: float,
+        negative_weight: float,
+    ) -> Dict[str, Any]:
+        total = positive_weight + negative_weight
         if total == 0:
             sentiment = "neutral"
             score = 0.5
         else:
-            score = positive_count / total
+            score = positive_weight / total
             if score > 0.6:
                 sentiment = "positive"
             elif score < 0.4:
@@ -185,5 +580,150 @@ class ContentAnalyzerTool(BaseTool):
             "sentiment": sentiment,
             "score": score,
             "positive_count": positive_count,
-            "negative_count": negative_count
-        } 
\ No newline at end of file
+            "negative_count": negative_count,
+            "positive_weight": positive_weight,
+            "negative_weight": negative_weight
+        }
+
+
+_matchers: Dict[str, KeywordMatcher] = {}
+_matchers_lock = threading.Lock()
+
+
+def get_lexicon_matcher(name: str) -> KeywordMatcher:
+    """
+    Get the process-wide matcher for a lexicon, building it on first use.
+    
+    Args:
+        name: 'key_phrases' or 'sentiment'
+        
+    Returns:
+        The KeywordMatcher for the built-in terms plus those of the lexicon file, if configured
+    """
+    matcher = _matchers.get(name)
+    if matcher is None:
+        with _matchers_lock:
+            matcher = _matchers.get(name)
+            if matcher is None:
+                terms = dict(DEFAULT_LEXICONS[name])
+                if LEXICON_FILES.get(name):
+                    terms.update(load_lexicon(LEXICON_FILES[name]))
+                matcher = _matchers[name] = KeywordMatcher(terms)
+    return matcher
+
+
+def configure_lexicon(name: str, terms: Dict[str, float], replace: bool = False) -> None:
+    """
+    Extend or replace a lexicon at runtime.
+    
+    Memoized results and worker processes built with the old lexicon are discarded.
+    
+    Args:
+        name: 'key_phrases' or 'sentiment'
+        terms: Terms mapped to their weights; sentiment weights are signed
+        replace: Use only these terms instead of adding them to the current lexicon
+    """
+    if name not in DEFAULT_LEXICONS:
+        raise ValueError(f"Unknown lexicon '{name}'. Expected one of: {', '.join(DEFAULT_LEXICONS)}")
+    
+    current = get_lexicon_matcher(name)
+    with _matchers_lock:
+        merged = {} if replace else current.terms()
+        merged.update(terms)
+        _matchers[name] = KeywordMatcher(merged)
+    with _memo_lock:
+        _memo.clear()
+    reset_analysis_pool()
+
+
+_memo: "OrderedDict[Tuple[str, Tuple[str, ...]], Dict[str, Any]]" = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def _memo_get(digest: str, analysis_types: List[str]) -> Optional[Dict[str, Any]]:
+    with _memo_lock:
+        key = (digest, tuple(analysis_types))
+        result = _memo.get(key)
+        if result is not None:
+            _memo.move_to_end(key)
+        return result
+
+
+def _memo_put(digest: str, analysis_types: List[str], result: Dict[str, Any]) -> None:
+    with _memo_lock:
+        _memo[(digest, tuple(analysis_types))] = result
+        while len(_memo) > ANALYSIS_MEMO_SIZE:
+            _memo.popitem(last=False)
+
+
+_worker_analyzer: Optional[ContentAnalyzerTool] = None
+
+
+def _init_worker(lexicons: Dict[str, Dict[str, float]]) -> None:
+    """
+    Install the parent's lexicons in a new worker process.
+    
+    Args:
+        lexicons: The terms of each lexicon, by name
+    """
+    with _matchers_lock:
+        for name, terms in lexicons.items():
+            _matchers[name] = KeywordMatcher(terms)
+
+
+def _analyze_in_worker(text: str, analysis_types: List[str]) -> Dict[str, Any]:
+    """
+    Analyze one text inside a worker process.
+    
+    Args:
+        text: The text to analyze
+        analysis_types: The analyses to run
+        
+    Returns:
+        The analysis results
+    """
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = ContentAnalyzerTool()
+    return _worker_analyzer._analyze(AnalysisDocument(text), analysis_types)
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_analysis_pool() -> ProcessPoolExecutor:
+    """
+    Get the process-wide pool of analysis worker processes.
+    
+    Workers are spawned rather than forked, since forking a process that
+    runs other threads can copy their locks while held. Spawned workers do
+    not inherit this process's state, so they are given the current
+    lexicons when they start.
+    
+    Returns:
+        The shared ProcessPoolExecutor
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                lexicons = {name: get_lexicon_matcher(name).terms() for name in DEFAULT_LEXICONS}
+                _pool = ProcessPoolExecutor(
+                    max_workers=max(1, DEFAULT_ANALYZER_WORKERS),
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(lexicons,),
+                )
+    return _pool
+
+
+def reset_analysis_pool() -> None:
+    """
+    Shut down the analysis worker pool; the next batch starts a new one.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
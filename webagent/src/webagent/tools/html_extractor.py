@@ -0,0 +1,490 @@
+import os
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urljoin
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxParser
+    except ImportError:
+        SelectolaxParser = None
+
+
+# Tags whose content is never part of the extracted text
+SKIPPED_TAGS = frozenset({"script", "style", "header", "footer", "nav", "aside"})
+
+# Extraction limits, matching what the scraper returns
+MAX_TEXT_CHARS = 10000
+MAX_LINKS = 20
+MAX_TABLES = 5
+
+ALL_SECTIONS = frozenset({"text", "links", "tables"})
+
+
+def sections_for(extract_type: str) -> frozenset:
+    """
+    Map a scraper extract_type to the content sections it needs.
+
+    Args:
+        extract_type: Type of content to extract ('text', 'links', 'tables', or 'all')
+
+    Returns:
+        The set of section names to collect
+    """
+    if extract_type == "all":
+        return ALL_SECTIONS
+    return frozenset({extract_type}) & ALL_SECTIONS
+
+
+def resolve_link(href: str, base_url: str) -> Optional[str]:
+    """
+    Resolve a link target against the page URL.
+
+    Args:
+        href: The raw href attribute
+        base_url: The URL of the page
+
+    Returns:
+        The absolute URL, or None for links that should be skipped
+    """
+    # Resolve relative URLs
+    if not href.startswith(('http://', 'https://')):
+        href = urljoin(base_url, href)
+
+    # Skip anchor and javascript links
+    if href.startswith(('#', 'javascript:')):
+        return None
+    return href
+
+
+def normalize_lines(text: str) -> Iterable[str]:
+    """
+    Split raw page text into the non-empty chunks the scraper keeps.
+
+    Args:
+        text: Raw text content
+
+    Returns:
+        The stripped lines and phrases, without blank ones
+    """
+    # Break into lines and remove leading and trailing space on each
+    lines = (line.strip() for line in text.splitlines())
+    # Break multi-headlines into a line each
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    # Remove blank lines
+    return (chunk for chunk in chunks if chunk)
+
+
+def finish_text(chunks: List[str]) -> str:
+    text = '\n'.join(chunks)
+
+    # Limit text length
+    if len(text) > MAX_TEXT_CHARS:
+        text = text[:MAX_TEXT_CHARS] + "..."
+    return text
+
+
+class ContentCollector:
+    """
+    Single-pass collector for text, links, tables and metadata.
+
+    The collector is driven by parser events (start tag, end tag, text) and
+    works with any parser backend that produces them. Each section stops
+    collecting once it reaches its limit, and ``satisfied`` turns true as soon
+    as every requested section is full and the document head has been read,
+    so an incremental driver can stop downloading early.
+
+    The method names follow lxml's parser target interface, so a collector
+    can be passed to ``lxml.etree.HTMLParser(target=...)`` directly.
+    """
+
+    def __init__(self, base_url: str, sections: Iterable[str] = ALL_SECTIONS):
+        self.base_url = base_url
+        self.sections = frozenset(sections)
+
+        self.metadata: Dict[str, Any] = {}
+        self._in_body = False
+        self._title_parts: Optional[List[str]] = None
+        self._title_tags = 0
+
+        self._skip_depth = 0
+        self._pending_text = ""
+        self._text_chunks: List[str] = []
+        self._text_length = 0
+
+        self.links: List[Dict[str, str]] = []
+        self._open_link: Optional[Dict[str, Any]] = None
+
+        self._tables: Dict[int, List[List[str]]] = {}
+        self._table_stack: List[Dict[str, Any]] = []
+        self._tables_started = 0
+
+    @property
+    def text_full(self) -> bool:
+        # _text_length counts a separator after every chunk, one more than the joined text
+        return self._text_length - 1 > MAX_TEXT_CHARS
+
+    @property
+    def links_full(self) -> bool:
+        return len(self.links) >= MAX_LINKS
+
+    @property
+    def tables_full(self) -> bool:
+        return len(self._tables) >= MAX_TABLES
+
+    @property
+    def satisfied(self) -> bool:
+        """Whether every requested section is complete, so parsing can stop."""
+        if not self._in_body:
+            return False
+        return all([
+            "text" not in self.sections or self.text_full,
+            "links" not in self.sections or self.links_full,
+            "tables" not in self.sections or self.tables_full,
+        ])
+
+    def start(self, tag: str, attributes: Dict[str, str]) -> None:
+        if tag == "body":
+            self._in_body = True
+        elif tag == "title":
+            self._title_tags += 1
+            if self._title_tags == 1:
+                self._title_parts = []
+        elif tag == "meta":
+            self._handle_meta(attributes)
+        elif tag == "link" and "canonical" in attributes.get("rel", "").lower().split() and attributes.get("href"):
+            canonical = resolve_link(attributes["href"], self.base_url)
+            if canonical:
+                self.metadata.setdefault("canonical", canonical)
+
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+
+        if tag == "a" and "href" in attributes and "links" in self.sections and not self.links_full:
+            self._open_link = {"href": attributes["href"], "text": []}
+
+        if "tables" in self.sections:
+            self._table_start(tag)
+
+    def end(self, tag: str) -> None:
+        if tag == "head":
+            self._in_body = True
+        elif tag == "title" and self._title_parts is not None:
+            title = "".join(self._title_parts)
+            # Like BeautifulSoup's title.string, keep None for an empty title
+            self.metadata.setdefault("title", title or None)
+            self._title_parts = None
+
+        if tag in SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+        if tag == "a" and self._open_link is not None:
+            self._close_link()
+
+        if "tables" in self.sections:
+            self._table_end(tag)
+
+    def data(self, data: str) -> None:
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+
+        if self._open_link is not None:
+            self._open_link["text"].append(data)
+
+        if self._table_stack and self._table_stack[-1]["cell"] is not None:
+            self._table_stack[-1]["cell"].append(data)
+
+        if "text" in self.sections and not self._skip_depth and not self.text_full:
+            self._add_text(data)
+
+    def close(self) -> None:
+        if self._pending_text:
+            self._flush_text(self._pending_text)
+            self._pending_text = ""
+        if self._open_link is not None:
+            self._close_link()
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Build the extracted sections in the scraper's output format.
+
+        Returns:
+            A dictionary with the requested sections and the page metadata
+        """
+        result = {}
+        if "text" in self.sections:
+            pending = list(normalize_lines(self._pending_text)) if self._pending_text else []
+            result["text"] = finish_text(self._text_chunks + pending)
+        if "links" in self.sections:
+            result["links"] = self.links[:MAX_LINKS]
+        if "tables" in self.sections:
+            result["tables"] = [self._tables[index] for index in sorted(self._tables)][:MAX_TABLES]
+        result["metadata"] = dict(self.metadata)
+        return result
+
+    def _handle_meta(self, attributes: Dict[str, str]) -> None:
+        if "content" not in attributes:
+            return
+        name = attributes.get("name")
+        if name in ("description", "keywords"):
+            # The first tag wins, like soup.find()
+            self.metadata.setdefault(name, attributes["content"])
+        prop = attributes.get("property", "")
+        if prop.startswith("og:"):
+            self.metadata[f"og_{prop.replace('og:', '')}"] = attributes["content"]
+
+    def _add_text(self, data: str) -> None:
+        # Only complete lines are normalized, so text split across several
+        # data events is joined exactly as a full-document get_text() would
+        self._pending_text += data
+        if "\n" not in self._pending_text:
+            return
+        complete, _, self._pending_text = self._pending_text.rpartition("\n")
+        self._flush_text(complete)
+
+    def _flush_text(self, text: str) -> None:
+        for chunk in normalize_lines(text):
+            if self.text_full:
+                break
+            self._text_chunks.append(chunk)
+            self._text_length += len(chunk) + 1
+
+    def _close_link(self) -> None:
+        href = resolve_link(self._open_link["href"], self.base_url)
+        if href is not None and not self.links_full:
+            self.links.append({
+                "text": "".join(self._open_link["text"]).strip() or href,
+                "url": href
+            })
+        self._open_link = None
+
+    def _table_start(self, tag: str) -> None:
+        if tag == "table":
+            self._table_stack.append({
+                "index": self._tables_started,
+                "rows": [],
+                "row": None,
+                "cell": None,
+            })
+            self._tables_started += 1
+            return
+        if not self._table_stack:
+            return
+
+        table = self._table_stack[-1]
+        if tag == "tr":
+            self._close_row(table)
+            table["row"] = []
+        elif tag in ("td", "th"):
+            self._close_cell(table)
+            if table["row"] is None:
+                table["row"] = []
+            table["cell"] = []
+
+    def _table_end(self, tag: str) -> None:
+        if not self._table_stack:
+            return
+
+        table = self._table_stack[-1]
+        if tag in ("td", "th"):
+            self._close_cell(table)
+        elif tag == "tr":
+            self._close_row(table)
+        elif tag == "table":
+            self._close_row(table)
+            self._table_stack.pop()
+            if table["rows"] and not self.tables_full:
+                self._tables[table["index"]] = table["rows"]
+
+    @staticmethod
+    def _close_cell(table: Dict[str, Any]) -> None:
+        if table["cell"] is not None:
+            table["row"].append("".join(table["cell"]).strip())
+            table["cell"] = None
+
+    def _close_row(self, table: Dict[str, Any]) -> None:
+        self._close_cell(table)
+        if table["row"]:
+            table["rows"].append(table["row"])
+        table["row"] = None
+
+
+class HTMLExtractor(HTMLParser):
+    """
+    Incremental extractor built on the standard library's html.parser.
+
+    HTML can be fed in chunks as it is downloaded; this is the pure-Python
+    backend that is always available.
+    """
+
+    def __init__(self, base_url: str, sections: Iterable[str] = ALL_SECTIONS):
+        super().__init__(convert_charrefs=True)
+        self.collector = ContentCollector(base_url, sections)
+
+    @property
+    def satisfied(self) -> bool:
+        return self.collector.satisfied
+
+    def handle_starttag(self, tag: str, attrs: List[tuple]) -> None:
+        self.collector.start(tag, {name: value for name, value in attrs if value is not None})
+
+    def handle_endtag(self, tag: str) -> None:
+        self.collector.end(tag)
+
+    def handle_data(self, data: str) -> None:
+        self.collector.data(data)
+
+    def close(self) -> None:
+        super().close()
+        self.collector.close()
+
+    def result(self) -> Dict[str, Any]:
+        return self.collector.result()
+
+
+class LxmlExtractor:
+    """
+    Incremental extractor driven by lxml's C parser.
+
+    lxml calls the collector's start/end/data methods directly while the
+    document is fed in chunks, so no tree is ever built.
+    """
+
+    def __init__(self, base_url: str, sections: Iterable[str] = ALL_SECTIONS):
+        self.collector = ContentCollector(base_url, sections)
+        self._parser = lxml_etree.HTMLParser(target=self.collector, recover=True)
+
+    @property
+    def satisfied(self) -> bool:
+        return self.collector.satisfied
+
+    def feed(self, data: str) -> None:
+        if data:
+            self._parser.feed(data)
+
+    def close(self) -> None:
+        try:
+            self._parser.close()
+        except lxml_etree.XMLSyntaxError:
+            # Raised for an empty document; there is nothing to extract
+            self.collector.close()
+
+    def result(self) -> Dict[str, Any]:
+        return self.collector.result()
+
+
+class SelectolaxExtractor:
+    """
+    Extractor backed by selectolax's C parser.
+
+    selectolax cannot parse incrementally, so fed chunks are buffered and the
+    document is parsed on close; the tree is then walked once in document
+    order, emitting the same events as the incremental backends.
+    """
+
+    def __init__(self, base_url: str, sections: Iterable[str] = ALL_SECTIONS):
+        self.collector = ContentCollector(base_url, sections)
+        self._chunks: List[str] = []
+
+    @property
+    def satisfied(self) -> bool:
+        # Nothing is parsed before close(), so the download can never stop early
+        return False
+
+    def feed(self, data: str) -> None:
+        self._chunks.append(data)
+
+    def close(self) -> None:
+        tree = SelectolaxParser("".join(self._chunks))
+        self._chunks = []
+        if tree.root is not None:
+            self._walk(tree.root)
+        self.collector.close()
+
+    def result(self) -> Dict[str, Any]:
+        return self.collector.result()
+
+    def _walk(self, root: Any) -> None:
+        collector = self.collector
+        stack = [(root, False)]
+        while stack:
+            node, closing = stack.pop()
+            if closing:
+                collector.end(node.tag)
+                continue
+            if node.tag == "-text":
+                collector.data(node.text(deep=False))
+                continue
+            if node.tag.startswith("-"):
+                # Comments and other non-element nodes
+                continue
+            if collector.satisfied:
+                break
+
+            collector.start(node.tag, {name: value for name, value in node.attributes.items() if value is not None})
+            stack.append((node, True))
+            children = []
+            child = node.child
+            while child is not None:
+                children.append(child)
+                child = child.next
+            stack.extend((child, False) for child in reversed(children))
+
+
+# Extractor classes for the available backends, fastest first
+EXTRACTOR_BACKENDS = {}
+if lxml_etree is not None:
+    EXTRACTOR_BACKENDS["lxml"] = LxmlExtractor
+if SelectolaxParser is not None:
+    EXTRACTOR_BACKENDS["selectolax"] = SelectolaxExtractor
+EXTRACTOR_BACKENDS["html.parser"] = HTMLExtractor
+
+# Backend names accepted by resolve_backend(); "bs4" is the BeautifulSoup fallback in the scraper
+PARSER_CHOICES = ("auto", "lxml", "selectolax", "html.parser", "bs4")
+
+DEFAULT_PARSER = os.environ.get("WEBAGENT_HTML_PARSER", "auto")
+
+
+def resolve_backend(parser: Optional[str] = None) -> str:
+    """
+    Pick the parser backend to use.
+
+    Args:
+        parser: A backend name, or 'auto' / None for the fastest installed one
+
+    Returns:
+        The name of an available backend
+
+    Raises:
+        ValueError: If the backend is unknown or its library is not installed
+    """
+    parser = (parser or DEFAULT_PARSER).lower()
+    if parser == "auto":
+        return next(iter(EXTRACTOR_BACKENDS))
+    if parser == "bs4" or parser in EXTRACTOR_BACKENDS:
+        return parser
+    if parser in PARSER_CHOICES:
+        raise ValueError(f"The '{parser}' parser backend is not installed")
+    raise ValueError(f"Unknown parser backend '{parser}'. Choose one of: {', '.join(PARSER_CHOICES)}")
+
+
+def create_extractor(backend: str, base_url: str, sections: Iterable[str] = ALL_SECTIONS) -> Any:
+    """
+    Create an extractor for one page.
+
+    Args:
+        backend: A backend name returned by resolve_backend(), other than 'bs4'
+        base_url: The URL of the page, for resolving links
+        sections: The content sections to extract
+
+    Returns:
+        An extractor with feed(), close(), satisfied and result()
+    """
+    return EXTRACTOR_BACKENDS[backend](base_url, sections)
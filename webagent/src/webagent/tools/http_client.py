@@ -0,0 +1,275 @@
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# Default headers sent with every request made through the shared session
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+# Default request timeout in seconds
+DEFAULT_TIMEOUT = 15
+
+# Responses with these status codes are retried with exponential backoff
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Methods retried after a response or read error. Others, such as paid API POSTs, are only
+# retried when the connection could not be made, so the server never sees them twice
+RETRY_METHODS = frozenset({"GET", "HEAD"})
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+# Pool and retry settings, overridable through the environment or configure_http_client()
+_settings = {
+    "pool_connections": _env_int("WEBAGENT_HTTP_POOL_CONNECTIONS", 32),
+    "pool_maxsize": _env_int("WEBAGENT_HTTP_POOL_MAXSIZE", 16),
+    "max_retries": _env_int("WEBAGENT_HTTP_MAX_RETRIES", 3),
+    "backoff_factor": _env_float("WEBAGENT_HTTP_BACKOFF_FACTOR", 0.5),
+}
+
+_lock = threading.Lock()
+_adapter: Optional[HTTPAdapter] = None
+_probe_adapter: Optional[HTTPAdapter] = None
+_generation = 0
+_local = threading.local()
+
+# Exceptions raised by the async client for failed requests
+ASYNC_HTTP_ERRORS = (httpx.HTTPError,) if httpx is not None else ()
+
+# httpx clients are bound to the event loop they were created on
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+
+def _build_adapter(retries: bool = True) -> HTTPAdapter:
+    """
+    Build a connection-pooling adapter shared by every session.
+
+    Args:
+        retries: Whether to apply the configured retry policy; without it no request is retried
+
+    Returns:
+        An HTTPAdapter with per-host pools
+    """
+    retry = 0 if not retries else Retry(
+        total=_settings["max_retries"],
+        connect=_settings["max_retries"],
+        read=_settings["max_retries"],
+        status=_settings["max_retries"],
+        backoff_factor=_settings["backoff_factor"],
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=RETRY_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    return HTTPAdapter(
+        pool_connections=_settings["pool_connections"],
+        pool_maxsize=_settings["pool_maxsize"],
+        max_retries=retry,
+        pool_block=False,
+    )
+
+
+def _get_adapter(retries: bool = True) -> HTTPAdapter:
+    global _adapter, _probe_adapter
+    adapter = _adapter if retries else _probe_adapter
+    if adapter is None:
+        with _lock:
+            if retries:
+                if _adapter is None:
+                    _adapter = _build_adapter()
+                adapter = _adapter
+            else:
+                if _probe_adapter is None:
+                    _probe_adapter = _build_adapter(retries=False)
+                adapter = _probe_adapter
+    return adapter
+
+
+def get_session(retries: bool = True) -> requests.Session:
+    """
+    Get the HTTP session for the calling thread.
+
+    Each thread gets its own Session object (Session state such as cookies is
+    not thread-safe), but all sessions mount the same adapter, so the
+    underlying keep-alive connection pools are shared across the process.
+
+    Args:
+        retries: Whether failed requests are retried; best-effort lookups
+            such as robots.txt fail fast instead
+
+    Returns:
+        A requests.Session backed by the shared connection pools
+    """
+    adapter = _get_adapter(retries)
+    name = "session" if retries else "probe_session"
+    session = getattr(_local, name, None)
+    if session is None or getattr(_local, f"{name}_generation", None) != _generation:
+        session = requests.Session()
+        session.headers.update(DEFAULT_HEADERS)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        setattr(_local, name, session)
+        setattr(_local, f"{name}_generation", _generation)
+    return session
+
+
+def configure_http_client(
+    pool_connections: Optional[int] = None,
+    pool_maxsize: Optional[int] = None,
+    max_retries: Optional[int] = None,
+    backoff_factor: Optional[float] = None,
+) -> None:
+    """
+    Reconfigure the shared connection pools and retry policy.
+
+    Existing pools are closed; sessions created afterwards use the new settings.
+
+    Args:
+        pool_connections: Number of distinct hosts to keep connection pools for
+        pool_maxsize: Maximum number of keep-alive connections per host
+        max_retries: Number of retries for failed connections and retryable status codes
+        backoff_factor: Exponential backoff factor between retries, in seconds
+    """
+    global _adapter, _probe_adapter, _generation
+    with _lock:
+        if pool_connections is not None:
+            _settings["pool_connections"] = pool_connections
+        if pool_maxsize is not None:
+            _settings["pool_maxsize"] = pool_maxsize
+        if max_retries is not None:
+            _settings["max_retries"] = max_retries
+        if backoff_factor is not None:
+            _settings["backoff_factor"] = backoff_factor
+        for adapter in (_adapter, _probe_adapter):
+            if adapter is not None:
+                adapter.close()
+        _adapter = _build_adapter()
+        _probe_adapter = None
+        _generation += 1
+
+
+def close_http_client() -> None:
+    """
+    Close all pooled connections held by the shared adapter.
+    """
+    global _adapter, _probe_adapter, _generation
+    with _lock:
+        for adapter in (_adapter, _probe_adapter):
+            if adapter is not None:
+                adapter.close()
+        _adapter = _probe_adapter = None
+        _generation += 1
+
+
+def get_async_client() -> "httpx.AsyncClient":
+    """
+    Get the async HTTP client for the running event loop.
+
+    The client keeps its own keep-alive connection pool, negotiates HTTP/2
+    when the h2 package is installed, and retries failed connections.
+
+    Returns:
+        An httpx.AsyncClient shared by all coroutines on this loop
+
+    Raises:
+        RuntimeError: If httpx is not installed
+    """
+    if httpx is None:
+        raise RuntimeError("The async tool variants require httpx. Install it with: pip install 'httpx[http2]'")
+
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        limits = httpx.Limits(
+            max_connections=_settings["pool_connections"] * _settings["pool_maxsize"],
+            max_keepalive_connections=_settings["pool_connections"] * _settings["pool_maxsize"],
+        )
+        client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            timeout=DEFAULT_TIMEOUT,
+            follow_redirects=True,
+            transport=httpx.AsyncHTTPTransport(
+                retries=_settings["max_retries"],
+                http2=HTTP2_AVAILABLE,
+                limits=limits,
+            ),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def async_send(method: str, url: str, stream: bool = False, **kwargs: Any) -> "httpx.Response":
+    """
+    Send a request with the async client, retrying 429/5xx responses.
+
+    Connection failures are retried by the transport; responses with a
+    retryable status are retried here with the same exponential backoff as
+    the synchronous session, honoring Retry-After, if the method is one of
+    RETRY_METHODS.
+
+    Args:
+        method: The HTTP method
+        url: The URL to request
+        stream: Return before reading the body; the caller must aclose() the response
+        **kwargs: Extra arguments for httpx.AsyncClient.build_request()
+
+    Returns:
+        The final response
+    """
+    client = get_async_client()
+    for attempt in range(_settings["max_retries"] + 1):
+        response = await client.send(client.build_request(method, url, **kwargs), stream=stream)
+        if (
+            method.upper() not in RETRY_METHODS
+            or response.status_code not in RETRY_STATUS_CODES
+            or attempt == _settings["max_retries"]
+        ):
+            return response
+
+        delay = _settings["backoff_factor"] * (2 ** attempt)
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        await response.aclose()
+        await asyncio.sleep(delay)
+    return response
+
+
+async def aclose_async_client() -> None:
+    """
+    Close the async client of the running event loop.
+    """
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,168 @@
+import csv
+import json
+import re
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Mapping, Tuple
+
+
+# Words are runs of letters and digits, with inner apostrophes ("don't")
+TOKEN_PATTERN = re.compile(r"\w+(?:['’]\w+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split lowercased text into word tokens.
+
+    Args:
+        text: The text to split; callers lowercase it first
+
+    Returns:
+        The word tokens in order
+    """
+    return TOKEN_PATTERN.findall(text)
+
+
+class KeywordMatcher:
+    """
+    Find every lexicon term in a token stream in a single pass.
+
+    This is an Aho-Corasick automaton whose transitions are whole words
+    rather than characters, so terms only match on word boundaries ("sad"
+    does not match inside "crusade") and multi-word terms are supported.
+    Scanning is linear in the number of tokens, however many terms the
+    lexicon holds.
+    """
+
+    def __init__(self, terms: Mapping[str, float]):
+        """
+        Build the automaton.
+
+        Args:
+            terms: Lexicon terms mapped to their weights; terms may span several words
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[Tuple[str, float, int]]] = [[]]
+        self._terms: Dict[str, float] = {}
+
+        for term, weight in terms.items():
+            words = tokenize(term.lower())
+            if not words:
+                continue
+            state = 0
+            for word in words:
+                next_state = self._goto[state].get(word)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][word] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._outputs.append([])
+                state = next_state
+            self._outputs[state] = [(term, float(weight), len(words))]
+            self._terms[term] = float(weight)
+
+        self._build_failure_links()
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def terms(self) -> Dict[str, float]:
+        """
+        Get the lexicon the automaton was built from.
+
+        Returns:
+            A copy of the terms mapped to their weights
+        """
+        return dict(self._terms)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(word, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                # A state also reports the terms of the states it falls back to
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+    def iter_matches(self, tokens: Iterable[str]) -> Iterator[Tuple[int, str, float]]:
+        """
+        Scan a token stream for lexicon terms.
+
+        Args:
+            tokens: Lowercased word tokens, as produced by tokenize()
+
+        Yields:
+            (start token index, term, weight) for every occurrence, overlapping ones included
+        """
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        state = 0
+        for index, token in enumerate(tokens):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for term, weight, length in outputs[state]:
+                yield index - length + 1, term, weight
+
+    def contains_any(self, tokens: Iterable[str]) -> bool:
+        """
+        Check whether any lexicon term occurs in a token stream.
+
+        Args:
+            tokens: Lowercased word tokens
+
+        Returns:
+            True at the first match
+        """
+        for _ in self.iter_matches(tokens):
+            return True
+        return False
+
+
+def load_lexicon(path: str) -> Dict[str, float]:
+    """
+    Load a weighted lexicon from a file.
+
+    JSON files hold an object mapping terms to weights. Any other file is
+    read as delimited text (tab, comma or semicolon) with the term in the
+    first column and an optional weight, defaulting to 1, in the second;
+    blank lines and lines starting with '#' are skipped.
+
+    Args:
+        path: Path to the lexicon file
+
+    Returns:
+        The terms mapped to their weights
+
+    Raises:
+        ValueError: If the file cannot be parsed
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.lower().endswith(".json"):
+            data = json.load(f)
+            if not isinstance(data, dict):
+                raise ValueError(f"Lexicon {path} must be a JSON object mapping terms to weights")
+            return {str(term): float(weight) for term, weight in data.items()}
+
+        lines = [line for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+    try:
+        dialect = csv.Sniffer().sniff("".join(lines[:20]), delimiters="\t,;")
+    except csv.Error:
+        dialect = csv.excel_tab
+
+    lexicon = {}
+    for row in csv.reader(lines, dialect):
+        if not row or not row[0].strip():
+            continue
+        try:
+            weight = float(row[1]) if len(row) > 1 and row[1].strip() else 1.0
+        except ValueError:
+            raise ValueError(f"Invalid weight for term '{row[0]}' in lexicon {path}")
+        lexicon[row[0].strip()] = weight
+    return lexicon
@@ -0,0 +1,227 @@
+import hashlib
+import os
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from webagent.tools.keyword_matcher import tokenize
+from webagent.tools.response_cache import normalize_url
+
+
+# Maximum number of differing fingerprint bits for two texts to count as near-duplicates
+DEFAULT_MAX_DISTANCE = int(os.environ.get("WEBAGENT_NEAR_DUPLICATE_DISTANCE", "3"))
+
+# Texts with fewer words than this are too short to fingerprint reliably and are always kept
+MIN_DUPLICATE_WORDS = int(os.environ.get("WEBAGENT_NEAR_DUPLICATE_MIN_WORDS", "50"))
+
+# Maximum number of URL to canonical URL mappings remembered across batches
+CANONICAL_CACHE_SIZE = int(os.environ.get("WEBAGENT_CANONICAL_CACHE_SIZE", "10000"))
+
+# Number of consecutive words hashed together into one feature
+SHINGLE_SIZE = 3
+
+FINGERPRINT_BITS = 64
+
+
+def _fingerprint(tokens: Sequence[str]) -> int:
+    if len(tokens) < SHINGLE_SIZE:
+        shingles = Counter([" ".join(tokens)])
+    else:
+        shingles = Counter(
+            " ".join(tokens[index:index + SHINGLE_SIZE])
+            for index in range(len(tokens) - SHINGLE_SIZE + 1)
+        )
+
+    digests = b"".join(
+        hashlib.blake2b(shingle.encode("utf-8", "surrogatepass"), digest_size=FINGERPRINT_BITS // 8).digest()
+        for shingle in shingles
+    )
+    # One row of bits per shingle; each bit votes +weight or -weight
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8).reshape(len(shingles), -1), axis=1)
+    weights = np.fromiter(shingles.values(), dtype=np.int64, count=len(shingles))
+    votes = (bits.astype(np.int64) * 2 - 1).T @ weights
+    return int.from_bytes(np.packbits(votes > 0).tobytes(), "big")
+
+
+def simhash(text: str) -> int:
+    """
+    Compute the 64-bit SimHash fingerprint of a text.
+
+    The text is split into overlapping three-word shingles; texts that
+    share most of their shingles get fingerprints that differ in only a
+    few bits, whatever their length.
+
+    Args:
+        text: The text to fingerprint
+
+    Returns:
+        The fingerprint as an unsigned integer
+    """
+    return _fingerprint(tokenize(text.lower()))
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """
+    Count the bits in which two fingerprints differ.
+
+    Args:
+        first: A fingerprint
+        second: Another fingerprint
+
+    Returns:
+        The number of differing bits
+    """
+    return bin(first ^ second).count("1")
+
+
+class NearDuplicateIndex:
+    """
+    Find texts whose SimHash fingerprint is within a few bits of one seen before.
+
+    Fingerprints are split into max_distance + 1 bands. Two fingerprints at
+    most max_distance bits apart agree on at least one whole band, so only
+    the texts sharing a band are compared instead of every text seen.
+    """
+
+    def __init__(self, max_distance: int = DEFAULT_MAX_DISTANCE, min_words: int = MIN_DUPLICATE_WORDS):
+        """
+        Create an empty index.
+
+        Args:
+            max_distance: Maximum number of differing bits between near-duplicates
+            min_words: Texts with fewer words are never reported or indexed
+        """
+        self.max_distance = max(0, min(max_distance, FINGERPRINT_BITS - 1))
+        self.min_words = min_words
+        bands = self.max_distance + 1
+        edges = [FINGERPRINT_BITS * band // bands for band in range(bands + 1)]
+        self._bands = [(start, (1 << (end - start)) - 1) for start, end in zip(edges, edges[1:])]
+        self._tables: List[Dict[int, List[Tuple[int, str]]]] = [{} for _ in self._bands]
+        self._lock = threading.Lock()
+
+    def find(self, fingerprint: int) -> Optional[str]:
+        """
+        Look up the first indexed text close to a fingerprint.
+
+        Args:
+            fingerprint: The SimHash fingerprint to look up
+
+        Returns:
+            The key of the matching text, or None
+        """
+        with self._lock:
+            for (shift, mask), table in zip(self._bands, self._tables):
+                for other, key in table.get((fingerprint >> shift) & mask, ()):
+                    if hamming_distance(fingerprint, other) <= self.max_distance:
+                        return key
+        return None
+
+    def add(self, key: str, fingerprint: int) -> None:
+        """
+        Index a fingerprint.
+
+        Args:
+            key: The label reported when a later text matches, e.g. its URL
+            fingerprint: The SimHash fingerprint of the text
+        """
+        with self._lock:
+            for (shift, mask), table in zip(self._bands, self._tables):
+                table.setdefault((fingerprint >> shift) & mask, []).append((fingerprint, key))
+
+    def check(self, key: str, text: str) -> Optional[str]:
+        """
+        Report whether a text nearly duplicates an indexed one, indexing it if not.
+
+        Args:
+            key: The label of the text, e.g. its URL
+            text: The text to check
+
+        Returns:
+            The key of the text it duplicates, or None if it is new
+        """
+        tokens = tokenize(text.lower())
+        if len(tokens) < self.min_words:
+            return None
+        fingerprint = _fingerprint(tokens)
+        duplicate_of = self.find(fingerprint)
+        if duplicate_of is None:
+            self.add(key, fingerprint)
+        return duplicate_of
+
+
+class CanonicalRegistry:
+    """
+    Remember which canonical URL each scraped URL declared.
+
+    Pages declare their preferred address with <link rel="canonical"> or
+    og:url. Once a mirror or tracking variant has been fetched, later batches
+    can tell it is the same page as its canonical URL without fetching it.
+    """
+
+    def __init__(self, max_entries: int = CANONICAL_CACHE_SIZE):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(self, url: str, canonical: str) -> None:
+        """
+        Record the canonical URL a page declared.
+
+        Args:
+            url: The URL the page was fetched from
+            canonical: The canonical URL it declared
+        """
+        key = normalize_url(url)
+        with self._lock:
+            self._entries[key] = normalize_url(canonical)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def canonical_key(self, url: str) -> str:
+        """
+        Get the key identifying the page behind a URL.
+
+        Args:
+            url: The URL to look up
+
+        Returns:
+            The normalized canonical URL if the page declared one before, else the normalized URL itself
+        """
+        key = normalize_url(url)
+        with self._lock:
+            return self._entries.get(key, key)
+
+
+def page_canonical(metadata: Dict[str, str]) -> Optional[str]:
+    """
+    Get the canonical URL a scraped page declared.
+
+    Args:
+        metadata: The page metadata extracted by the scraper
+
+    Returns:
+        The <link rel="canonical"> target, else og:url, else None
+    """
+    return metadata.get("canonical") or metadata.get("og_url") or None
+
+
+_registry: Optional[CanonicalRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_canonical_registry() -> CanonicalRegistry:
+    """
+    Get the process-wide canonical URL registry shared by the scraping tools.
+
+    Returns:
+        The shared CanonicalRegistry
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = CanonicalRegistry()
+    return _registry
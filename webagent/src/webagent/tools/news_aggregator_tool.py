@@ -1,25 +1,31 @@
 from crewai.tools import BaseTool
 from typing import Type, Dict, Any, List
 from pydantic import BaseModel, Field
+import asyncio
 import json
 import datetime
 
+from webagent.tools.news_feeds import get_feed_poller
+from webagent.tools.news_store import get_news_store
+
 
 class NewsAggregatorToolInput(BaseModel):
     """Input schema for NewsAggregatorTool."""
     topic: str = Field(..., description="The topic to search for news articles.")
     days: int = Field(default=7, description="Number of days to look back for news articles.")
     max_results: int = Field(default=5, description="Maximum number of news articles to return.")
+    page: int = Field(default=1, description="Page of results to return, starting at 1; use 2, 3, ... for more articles.")
 
 class NewsAggregatorTool(BaseTool):
     name: str = "News Aggregator Tool"
     description: str = (
         "A tool for finding and filtering recent news articles on specific topics. "
-        "It returns a list of news articles with titles, summaries, sources, and publication dates."
+        "It returns a list of news articles with titles, summaries, sources, and publication dates "
+        "from a local index of the configured news feeds."
     )
     args_schema: Type[BaseModel] = NewsAggregatorToolInput
 
-    def _run(self, topic: str, days: int = 7, max_results: int = 5) -> str:
+    def _run(self, topic: str, days: int = 7, max_results: int = 5, page: int = 1) -> str:
         """
         Find recent news articles on a specific topic.
         
@@ -27,22 +33,71 @@ class NewsAggregatorTool(BaseTool):
             topic: The topic to search for news articles
             days: Number of days to look back for news articles
             max_results: Maximum number of news articles to return
+            page: Page of results to return, starting at 1
             
         Returns:
             A JSON string containing news articles
         """
         try:
-            # In a real implementation, this would use a news API
-            # For this example, we'll simulate news articles
-            articles = self._simulate_news_articles(topic, days, max_results)
+            poller = get_feed_poller()
+            if not poller.feeds:
+                # No feeds configured; fall back to simulated articles
+                articles = self._simulate_news_articles(topic, days, max_results)
+                return json.dumps(articles, indent=2)
+            
+            # Feeds are polled in the background; lookups only read the local index as it is,
+            # and only an empty index waits, briefly, for the first poll
+            poller.start()
+            if get_news_store().is_empty():
+                poller.wait_until_ready()
+            articles = self._search_index(topic, days, max_results, page)
             return json.dumps(articles, indent=2)
         except Exception as e:
             return f"Error finding news articles: {str(e)}"
     
+    async def _arun(self, topic: str, days: int = 7, max_results: int = 5, page: int = 1) -> str:
+        """
+        Find recent news articles without blocking the event loop.
+        
+        Args:
+            topic: The topic to search for news articles
+            days: Number of days to look back for news articles
+            max_results: Maximum number of news articles to return
+            page: Page of results to return, starting at 1
+            
+        Returns:
+            A JSON string containing news articles
+        """
+        return await asyncio.to_thread(self._run, topic, days, max_results, page)
+    
+    def _search_index(self, topic: str, days: int, max_results: int, page: int) -> List[Dict[str, Any]]:
+        """
+        Look up indexed feed articles on a topic.
+        
+        Args:
+            topic: The topic to search for news articles
+            days: Number of days to look back for news articles
+            max_results: Maximum number of news articles to return
+            page: Page of results to return, starting at 1
+            
+        Returns:
+            A list of news articles, most relevant and recent first
+        """
+        return [
+            {
+                "title": article["title"],
+                "summary": article["summary"],
+                "source": article["source"],
+                "date": datetime.datetime.fromtimestamp(article["published_at"]).strftime("%B %d, %Y"),
+                "url": article["url"]
+            }
+            for article in get_news_store().search(topic, days, max_results, page)
+        ]
+    
     def _simulate_news_articles(self, topic: str, days: int, max_results: int) -> List[Dict[str, Any]]:
         """
         Simulate news articles for demonstration purposes.
-        In a real implementation, this would be replaced with an actual API call.
+        Used when no news feeds are configured.
         
         Args:
             topic: The topic to search for news articles
@@ -0,0 +1,456 @@
+import datetime
+import hashlib
+import html
+import os
+import re
+import threading
+import time
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+from webagent.tools.http_client import get_session, DEFAULT_TIMEOUT
+from webagent.tools.news_store import NewsStore, get_news_store
+from webagent.tools.politeness import get_host_scheduler
+
+
+# Seconds between two polls of the configured feeds
+DEFAULT_POLL_INTERVAL = float(os.environ.get("WEBAGENT_NEWS_POLL_INTERVAL", "900"))
+
+# Seconds a news lookup on an empty index waits for the first poll before answering with what has arrived
+FIRST_POLL_TIMEOUT = float(os.environ.get("WEBAGENT_NEWS_FIRST_POLL_TIMEOUT", "5"))
+
+# Maximum number of feeds fetched at the same time during a poll
+DEFAULT_FETCH_WORKERS = int(os.environ.get("WEBAGENT_NEWS_FETCH_WORKERS", "8"))
+
+# Maximum number of bytes read from a single feed
+MAX_FEED_BYTES = 5 * 1024 * 1024
+
+# Summaries are cut to this many characters
+MAX_SUMMARY_CHARS = 1000
+
+TAG_PATTERN = re.compile(r"<[^>]+>")
+WHITESPACE = re.compile(r"\s+")
+FEED_LIST_SEPARATOR = re.compile(r"[\s,]+")
+
+# Child elements holding each entry field, in order of preference (RSS 2.0, RSS 1.0 and Atom)
+SUMMARY_TAGS = ("description", "summary", "encoded", "content")
+DATE_TAGS = ("pubDate", "published", "updated", "date", "issued", "modified")
+GUID_TAGS = ("guid", "id")
+
+
+def configured_feeds() -> List[str]:
+    """
+    Get the feed URLs configured through the environment.
+
+    WEBAGENT_NEWS_FEEDS holds URLs separated by commas or whitespace and
+    WEBAGENT_NEWS_FEEDS_FILE names a file with one URL per line; lines
+    starting with '#' are skipped. Both http(s):// and file:// URLs work.
+
+    Returns:
+        The feed URLs, without duplicates
+    """
+    feeds = [url for url in FEED_LIST_SEPARATOR.split(os.environ.get("WEBAGENT_NEWS_FEEDS", "")) if url]
+    path = os.environ.get("WEBAGENT_NEWS_FEEDS_FILE")
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            feeds.extend(line.strip() for line in f if line.strip() and not line.lstrip().startswith("#"))
+    return list(dict.fromkeys(feeds))
+
+
+def _local_name(tag: Any) -> str:
+    # "{http://www.w3.org/2005/Atom}entry" -> "entry"; comments and processing instructions have no name
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+
+def _clean_text(value: Optional[str]) -> str:
+    if not value:
+        return ""
+    return WHITESPACE.sub(" ", html.unescape(TAG_PATTERN.sub(" ", value))).strip()
+
+
+def parse_date(value: Optional[str]) -> Optional[float]:
+    """
+    Parse an RSS (RFC 822) or Atom (ISO 8601) date.
+
+    Args:
+        value: The date as written in the feed
+
+    Returns:
+        A Unix timestamp, or None if the date is missing or malformed; dates without a zone are taken as UTC
+    """
+    if not value or not value.strip():
+        return None
+    value = value.strip()
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.timestamp()
+
+
+def _entry_link(entry: ElementTree.Element) -> str:
+    for child in entry:
+        if _local_name(child.tag) != "link":
+            continue
+        # Atom links are attributes; the alternate link is the article itself
+        if child.get("href") is not None:
+            if child.get("rel", "alternate") == "alternate":
+                return child.get("href").strip()
+        elif child.text and child.text.strip():
+            return child.text.strip()
+    return ""
+
+
+def _entry_id(fields: Dict[str, str], guid: str, link: str) -> str:
+    if guid:
+        return guid
+    if link:
+        return link
+    # Neither a GUID nor a link: identify the entry by its content
+    digest = hashlib.sha1()
+    for tag in ("title",) + SUMMARY_TAGS + DATE_TAGS:
+        digest.update(fields.get(tag, "").encode("utf-8", "surrogatepass") + b"\0")
+    return digest.hexdigest()
+
+
+def parse_feed(data: bytes, feed_url: str = "", seen: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Parse an RSS 2.0, RSS 1.0 or Atom document.
+
+    Args:
+        data: The raw feed document
+        feed_url: The URL the feed was fetched from, used as the source name when the feed has no title
+        seen: IDs of entries ingested before; they are skipped without cleaning their text
+
+    Returns:
+        One dictionary per new entry with entry_id, title, summary, url, guid, source and
+        published_at (Unix timestamp or None)
+
+    Raises:
+        ValueError: If the document is not well-formed XML
+    """
+    try:
+        root = ElementTree.fromstring(data)
+    except ElementTree.ParseError as e:
+        raise ValueError(f"Invalid feed {feed_url}: {str(e)}")
+
+    # The feed title is the first <title> of the channel (RSS) or of the feed itself (Atom)
+    channel = next((element for element in root if _local_name(element.tag) == "channel"), root)
+    feed_title = next(
+        (_clean_text(element.text) for element in channel if _local_name(element.tag) == "title"),
+        ""
+    ) or urlparse(feed_url).netloc or feed_url
+
+    articles = []
+    for entry in root.iter():
+        if _local_name(entry.tag) not in ("item", "entry"):
+            continue
+        fields: Dict[str, str] = {}
+        for child in entry:
+            name = _local_name(child.tag)
+            if name not in fields:
+                fields[name] = "".join(child.itertext()) if name in SUMMARY_TAGS else (child.text or "")
+        link = _entry_link(entry)
+        guid = next((fields[tag].strip() for tag in GUID_TAGS if fields.get(tag, "").strip()), "")
+        entry_id = _entry_id(fields, guid, link)
+        if seen is not None and entry_id in seen:
+            continue
+
+        summary = next((_clean_text(fields[tag]) for tag in SUMMARY_TAGS if fields.get(tag)), "")
+        published = next((parse_date(fields[tag]) for tag in DATE_TAGS if fields.get(tag)), None)
+        articles.append({
+            "entry_id": entry_id,
+            "title": _clean_text(fields.get("title")),
+            "summary": summary[:MAX_SUMMARY_CHARS],
+            "url": link,
+            "guid": guid,
+            "source": _clean_text(fields.get("source")) or feed_title,
+            "published_at": published,
+        })
+    return articles
+
+
+@dataclass
+class FeedFetch:
+    """The outcome of a conditional feed request; body is None when the feed has not changed."""
+    body: Optional[bytes]
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+def fetch_feed(url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> FeedFetch:
+    """
+    Download a feed document unless it has not changed since the last poll.
+
+    HTTP feeds are requested with If-None-Match / If-Modified-Since. Local
+    file:// feeds use the file's modification time as Last-Modified, so
+    fixtures behave like a server that supports conditional requests.
+
+    Args:
+        url: An http(s):// or file:// URL
+        etag: The ETag returned by the last poll
+        last_modified: The Last-Modified value returned by the last poll
+
+    Returns:
+        The document (at most MAX_FEED_BYTES long) or None if not modified, and the new validators
+
+    Raises:
+        requests.exceptions.RequestException: If an HTTP fetch fails
+        OSError: If a local feed cannot be read
+    """
+    parsed = urlparse(url)
+    if parsed.scheme == "file":
+        path = url2pathname(parsed.path)
+        modified = formatdate(os.path.getmtime(path), usegmt=True)
+        if modified == last_modified:
+            return FeedFetch(None, None, modified)
+        with open(path, "rb") as f:
+            return FeedFetch(f.read(MAX_FEED_BYTES), None, modified)
+
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    get_host_scheduler().wait(url)
+    response = get_session().get(url, headers=headers, timeout=DEFAULT_TIMEOUT, stream=True)
+    try:
+        # Servers may omit the validators from a 304; keep the ones that were sent
+        new_etag = response.headers.get("ETag") or etag
+        new_last_modified = response.headers.get("Last-Modified") or last_modified
+        if response.status_code == 304:
+            return FeedFetch(None, new_etag, new_last_modified)
+        response.raise_for_status()
+        body = bytearray()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            body.extend(chunk)
+            if len(body) >= MAX_FEED_BYTES:
+                break
+        return FeedFetch(bytes(body[:MAX_FEED_BYTES]), response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    finally:
+        response.close()
+
+
+class FeedPoller:
+    """
+    Poll the configured news feeds in the background and index their articles.
+
+    A daemon thread polls every feed once per interval, fetching feeds
+    concurrently, and adds new articles to the news store, so news lookups
+    are answered from the local index. Polls are incremental: feeds are
+    requested conditionally, an unchanged document is not parsed, and
+    entries ingested before are skipped.
+    """
+
+    def __init__(
+        self,
+        feeds: Optional[List[str]] = None,
+        store: Optional[NewsStore] = None,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        max_workers: int = DEFAULT_FETCH_WORKERS,
+    ):
+        self.feeds = configured_feeds() if feeds is None else list(feeds)
+        self.interval = interval
+        self.max_workers = max(1, max_workers)
+        self._store = store
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._first_poll = threading.Event()
+        self._counters = {
+            "polls": 0,
+            "feeds_fetched": 0,
+            "feeds_not_modified": 0,
+            "feeds_unchanged": 0,
+            "feed_errors": 0,
+            "bytes_downloaded": 0,
+            "entries_parsed": 0,
+            "articles_added": 0,
+        }
+        self._lag_total = 0.0
+        self._lag_count = 0
+        self._last_poll_stats: Dict[str, Any] = {}
+        self._errors: Dict[str, str] = {}
+        self._last_poll: Optional[float] = None
+
+    @property
+    def store(self) -> NewsStore:
+        if self._store is None:
+            self._store = get_news_store()
+        return self._store
+
+    def poll_once(self) -> int:
+        """
+        Poll every feed once and index the new articles.
+
+        A feed that fails is skipped until the next poll.
+
+        Returns:
+            The number of articles added
+        """
+        start = time.perf_counter()
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(self.max_workers, len(self.feeds))),
+            thread_name_prefix="webagent-feed",
+        ) as executor:
+            outcomes = list(executor.map(self._poll_feed, self.feeds))
+        self.store.prune()
+        elapsed = time.perf_counter() - start
+
+        added = sum(outcome["added"] for outcome in outcomes)
+        lags = [lag for outcome in outcomes for lag in outcome["lags"]]
+        with self._lock:
+            for outcome in outcomes:
+                self._counters[outcome["status"]] += 1
+                self._counters["bytes_downloaded"] += outcome["bytes"]
+                self._counters["entries_parsed"] += outcome["parsed"]
+            self._counters["polls"] += 1
+            self._counters["articles_added"] += added
+            self._lag_total += sum(lags)
+            self._lag_count += len(lags)
+            self._last_poll = time.time()
+            self._last_poll_stats = {
+                "seconds": elapsed,
+                "feeds_per_second": len(outcomes) / elapsed if elapsed else 0.0,
+                "articles_per_second": added / elapsed if elapsed else 0.0,
+                "articles_added": added,
+                "lag_mean_seconds": sum(lags) / len(lags) if lags else None,
+                "lag_max_seconds": max(lags) if lags else None,
+            }
+        self._first_poll.set()
+        return added
+
+    def _poll_feed(self, feed_url: str) -> Dict[str, Any]:
+        """
+        Fetch one feed and index its new entries.
+
+        Args:
+            feed_url: The feed URL
+
+        Returns:
+            The poll status of the feed, bytes downloaded, entries parsed,
+            articles added and the ingestion lag of each added article
+        """
+        outcome: Dict[str, Any] = {"status": "feeds_fetched", "bytes": 0, "parsed": 0, "added": 0, "lags": []}
+        try:
+            state = self.store.feed_state(feed_url)
+            fetched = fetch_feed(feed_url, state["etag"], state["last_modified"])
+            if fetched.body is None:
+                outcome["status"] = "feeds_not_modified"
+                self.store.update_feed_state(feed_url, fetched.etag, fetched.last_modified, state["content_hash"])
+                return outcome
+
+            outcome["bytes"] = len(fetched.body)
+            content_hash = hashlib.sha256(fetched.body).hexdigest()
+            if content_hash == state["content_hash"]:
+                # The server ignored the conditional request but nothing changed
+                outcome["status"] = "feeds_unchanged"
+            else:
+                articles = parse_feed(fetched.body, feed_url, self.store.seen_entries(feed_url))
+                fetched_at = time.time()
+                added = self.store.add_articles(articles, fetched_at)
+                self.store.mark_seen(feed_url, [article["entry_id"] for article in articles])
+                outcome["parsed"] = len(articles)
+                outcome["added"] = len(added)
+                # Ingestion lag: how long after publication an article became searchable
+                outcome["lags"] = [
+                    max(0.0, fetched_at - article["published_at"])
+                    for article in added if article.get("published_at")
+                ]
+            self.store.update_feed_state(feed_url, fetched.etag, fetched.last_modified, content_hash)
+        except Exception as e:
+            outcome["status"] = "feed_errors"
+            with self._lock:
+                self._errors[feed_url] = str(e)
+            return outcome
+
+        with self._lock:
+            self._errors.pop(feed_url, None)
+        return outcome
+
+    def start(self) -> None:
+        """
+        Start polling in a background thread, unless it is already running.
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._poll_forever, name="webagent-news-poller", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the background thread after its current poll.
+        """
+        self._stop.set()
+
+    def wait_until_ready(self, timeout: float = FIRST_POLL_TIMEOUT) -> bool:
+        """
+        Wait for the first poll of the process to finish.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if a poll has completed
+        """
+        return self._first_poll.wait(timeout)
+
+    def _poll_forever(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                with self._lock:
+                    self._errors["poll"] = str(e)
+                # Do not leave lookups waiting on a poll that failed outright
+                self._first_poll.set()
+            self._stop.wait(self.interval)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get ingestion counters, lag and throughput metrics, and feed errors.
+
+        Returns:
+            A dictionary of counters, the average ingestion lag in seconds,
+            the metrics of the last poll, and the last error of each failing feed
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+            stats["feeds"] = len(self.feeds)
+            stats["lag_mean_seconds"] = self._lag_total / self._lag_count if self._lag_count else None
+            stats["last_poll"] = self._last_poll
+            stats["last_poll_stats"] = dict(self._last_poll_stats)
+            stats["errors"] = dict(self._errors)
+        return stats
+
+
+_poller: Optional[FeedPoller] = None
+_poller_lock = threading.Lock()
+
+
+def get_feed_poller() -> FeedPoller:
+    """
+    Get the process-wide feed poller for the configured feeds.
+
+    Returns:
+        The shared FeedPoller; it is not started until a lookup needs it
+    """
+    global _poller
+    if _poller is None:
+        with _poller_lock:
+            if _poller is None:
+                _poller = FeedPoller()
+    return _poller
@@ -0,0 +1,419 @@
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from webagent.tools.keyword_matcher import tokenize
+from webagent.tools.near_duplicates import NearDuplicateIndex, simhash
+from webagent.tools.response_cache import normalize_url
+from webagent.tools.search_cache import STOP_WORDS
+from webagent.tools.storage import connect
+
+
+# Articles published longer ago than this many days are pruned from the index
+DEFAULT_RETENTION_DAYS = float(os.environ.get("WEBAGENT_NEWS_RETENTION_DAYS", "30"))
+
+# Headlines and summaries are short, so fewer words are enough to compare them
+NEWS_DUPLICATE_MIN_WORDS = 8
+
+# Age in days at which an article's relevance score is halved; 0 ranks by relevance alone
+DEFAULT_RECENCY_HALF_LIFE_DAYS = float(os.environ.get("WEBAGENT_NEWS_RECENCY_HALF_LIFE_DAYS", "2"))
+
+# BM25 weight of a title match relative to a summary match
+TITLE_WEIGHT = 2.0
+
+# Article IDs are publication times in microseconds, so ID order is publication order
+ID_SCALE = 1_000_000
+
+# Bumped when the table layout changes; older stores are rebuilt from the feeds
+SCHEMA_VERSION = 1
+
+FINGERPRINT_SIGN_BIT = 1 << 63
+
+
+def _to_signed(fingerprint: int) -> int:
+    # SQLite integers are signed 64-bit
+    return fingerprint - (1 << 64) if fingerprint >= FINGERPRINT_SIGN_BIT else fingerprint
+
+
+def _to_unsigned(fingerprint: int) -> int:
+    return fingerprint + (1 << 64) if fingerprint < 0 else fingerprint
+
+
+def article_id(published_at: float) -> int:
+    """
+    Get the smallest article ID for a publication time.
+
+    Args:
+        published_at: A Unix timestamp
+
+    Returns:
+        The publication time in microseconds
+    """
+    return int(published_at * ID_SCALE)
+
+
+def article_key(article: Dict[str, Any]) -> Optional[str]:
+    """
+    Get the key identifying an article across polls and feeds.
+
+    Args:
+        article: A parsed feed entry
+
+    Returns:
+        The normalized article URL, else its GUID, else None
+    """
+    if article.get("url"):
+        return normalize_url(article["url"])
+    return article.get("guid") or None
+
+
+class NewsStore:
+    """
+    Local full-text index of news articles collected from feeds.
+
+    Articles live in a SQLite table mirrored into an FTS5 index over their
+    title and summary, so topic lookups never touch the network. Syndicated
+    copies of a story already in the index are dropped at ingestion by
+    comparing SimHash fingerprints of the headline and summary.
+
+    The article ID is the publication time in microseconds. The table is
+    stored in ID order, so it doubles as a date-sorted index: a look-back
+    window is a range scan over the newest rows, and FTS5 applies the same
+    rowid bound while walking its posting lists, so lookups cost in
+    proportion to the articles in the window rather than the whole store.
+
+    The store also keeps each feed's HTTP validators and the IDs of the
+    entries already ingested from it, so polls can skip unchanged feeds and
+    entries.
+    """
+
+    def __init__(
+        self,
+        path: str = "news.sqlite3",
+        retention_days: float = DEFAULT_RETENTION_DAYS,
+        recency_half_life_days: float = DEFAULT_RECENCY_HALF_LIFE_DAYS,
+    ):
+        self.retention_days = retention_days
+        self.recency_half_life_days = recency_half_life_days
+        self._lock = threading.Lock()
+        self._connection = connect(path)
+        if self._connection.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            # Earlier stores used insertion-ordered IDs; the index is only a cache of the feeds
+            self._connection.executescript(
+                """
+                DROP TABLE IF EXISTS articles_fts;
+                DROP TABLE IF EXISTS articles;
+                DROP TABLE IF EXISTS feeds;
+                DROP TABLE IF EXISTS feed_entries;
+                """
+            )
+            self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY,
+                key TEXT NOT NULL UNIQUE,
+                url TEXT NOT NULL,
+                title TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                source TEXT NOT NULL,
+                published_at REAL NOT NULL,
+                fetched_at REAL NOT NULL,
+                fingerprint INTEGER
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                title, summary, content='articles', content_rowid='id', tokenize='porter unicode61'
+            );
+            CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+                INSERT INTO articles_fts (rowid, title, summary) VALUES (new.id, new.title, new.summary);
+            END;
+            CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+                INSERT INTO articles_fts (articles_fts, rowid, title, summary)
+                VALUES ('delete', old.id, old.title, old.summary);
+            END;
+            CREATE TABLE IF NOT EXISTS feeds (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                checked_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS feed_entries (
+                feed_url TEXT NOT NULL,
+                entry_id TEXT NOT NULL,
+                seen_at REAL NOT NULL,
+                PRIMARY KEY (feed_url, entry_id)
+            ) WITHOUT ROWID;
+            """
+        )
+        self._connection.commit()
+        self._counters = {"added": 0, "known": 0, "duplicates": 0, "expired": 0, "pruned": 0, "searches": 0}
+        self._near_duplicates = self._load_fingerprints()
+
+    def _load_fingerprints(self) -> NearDuplicateIndex:
+        index = NearDuplicateIndex()
+        for key, fingerprint in self._connection.execute(
+            "SELECT key, fingerprint FROM articles WHERE fingerprint IS NOT NULL"
+        ):
+            index.add(key, _to_unsigned(fingerprint))
+        return index
+
+    def add_articles(self, articles: List[Dict[str, Any]], fetched_at: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Index newly fetched articles.
+
+        Articles already indexed (by URL or GUID), near-duplicates of indexed
+        articles and articles older than the retention window are skipped.
+        Articles without a publication date are dated by when they were fetched.
+
+        Args:
+            articles: Parsed feed entries with title, summary, url, guid, source and published_at
+            fetched_at: When the articles were fetched, as a Unix timestamp; defaults to now
+
+        Returns:
+            The articles that were added
+        """
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        cutoff = fetched_at - self.retention_days * 86400
+        added = []
+        with self._lock:
+            for article in articles:
+                key = article_key(article)
+                if key is None:
+                    continue
+                published_at = article.get("published_at") or fetched_at
+                if published_at < cutoff:
+                    self._counters["expired"] += 1
+                    continue
+                if self._connection.execute("SELECT 1 FROM articles WHERE key = ?", (key,)).fetchone():
+                    self._counters["known"] += 1
+                    continue
+
+                text = f"{article.get('title') or ''} {article.get('summary') or ''}"
+                fingerprint = None
+                if len(tokenize(text.lower())) >= NEWS_DUPLICATE_MIN_WORDS:
+                    fingerprint = simhash(text)
+                    if self._near_duplicates.find(fingerprint) is not None:
+                        self._counters["duplicates"] += 1
+                        continue
+                    self._near_duplicates.add(key, fingerprint)
+
+                # Articles published in the same microsecond take the next free ID
+                row_id = article_id(published_at)
+                while self._connection.execute("SELECT 1 FROM articles WHERE id = ?", (row_id,)).fetchone():
+                    row_id += 1
+
+                self._connection.execute(
+                    "INSERT INTO articles (id, key, url, title, summary, source, published_at, fetched_at, fingerprint) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        row_id,
+                        key,
+                        article.get("url") or "",
+                        article.get("title") or "",
+                        article.get("summary") or "",
+                        article.get("source") or "",
+                        published_at,
+                        fetched_at,
+                        None if fingerprint is None else _to_signed(fingerprint),
+                    )
+                )
+                added.append(article)
+            self._connection.commit()
+            self._counters["added"] += len(added)
+        return added
+
+    def feed_state(self, feed_url: str) -> Dict[str, Optional[str]]:
+        """
+        Get what the last successful poll of a feed recorded.
+
+        Args:
+            feed_url: The feed URL
+
+        Returns:
+            The feed's etag, last_modified and content_hash; each None if unknown
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT etag, last_modified, content_hash FROM feeds WHERE url = ?", (feed_url,)
+            ).fetchone()
+        etag, last_modified, content_hash = row if row is not None else (None, None, None)
+        return {"etag": etag, "last_modified": last_modified, "content_hash": content_hash}
+
+    def update_feed_state(
+        self,
+        feed_url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        content_hash: Optional[str],
+    ) -> None:
+        """
+        Record the validators and body hash of a feed after a successful poll.
+
+        Args:
+            feed_url: The feed URL
+            etag: The ETag response header
+            last_modified: The Last-Modified response header
+            content_hash: Hash of the feed document
+        """
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO feeds (url, etag, last_modified, content_hash, checked_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (feed_url, etag, last_modified, content_hash, time.time())
+            )
+            self._connection.commit()
+
+    def seen_entries(self, feed_url: str) -> Set[str]:
+        """
+        Get the IDs of the entries already ingested from a feed.
+
+        Args:
+            feed_url: The feed URL
+
+        Returns:
+            The entry IDs
+        """
+        with self._lock:
+            return {
+                entry_id for (entry_id,) in self._connection.execute(
+                    "SELECT entry_id FROM feed_entries WHERE feed_url = ?", (feed_url,)
+                )
+            }
+
+    def mark_seen(self, feed_url: str, entry_ids: Iterable[str]) -> None:
+        """
+        Remember that entries of a feed have been ingested.
+
+        Args:
+            feed_url: The feed URL
+            entry_ids: The IDs of the ingested entries
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO feed_entries (feed_url, entry_id, seen_at) VALUES (?, ?, ?)",
+                [(feed_url, entry_id, now) for entry_id in entry_ids]
+            )
+            self._connection.commit()
+
+    def search(self, topic: str, days: float, max_results: int, page: int = 1) -> List[Dict[str, Any]]:
+        """
+        Find indexed articles about a topic published within the last days.
+
+        Articles matching any word of the topic are ranked by BM25, with
+        title matches weighted higher, and the score decays with age: an
+        article recency_half_life_days old scores half as much as the same
+        match published now.
+
+        Args:
+            topic: Free-text topic; an empty topic lists the newest articles
+            days: Number of days to look back
+            max_results: Maximum number of articles per page
+            page: The 1-based page of results to return
+
+        Returns:
+            The page of matching articles, best first, with published_at as a Unix timestamp
+        """
+        words = tokenize(topic.lower())
+        terms = [word for word in words if word not in STOP_WORDS] or words
+        now = time.time()
+        min_id = article_id(now - days * 86400)
+        limit = max(0, max_results)
+        offset = max(0, page - 1) * limit
+        with self._lock:
+            self._counters["searches"] += 1
+            if not terms:
+                rows = self._connection.execute(
+                    "SELECT url, title, summary, source, published_at FROM articles "
+                    "WHERE id >= ? ORDER BY id DESC LIMIT ? OFFSET ?",
+                    (min_id, limit, offset)
+                ).fetchall()
+            else:
+                match = " OR ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+                if self.recency_half_life_days > 0:
+                    # bm25() is negative, lower is better; dividing by 1 + age / half-life halves it at the half-life
+                    score = "bm25(articles_fts, ?, 1.0) / (1.0 + max(0.0, ? - rowid / ?) / ?)"
+                    score_params = (TITLE_WEIGHT, now, float(ID_SCALE), self.recency_half_life_days * 86400)
+                else:
+                    score = "bm25(articles_fts, ?, 1.0)"
+                    score_params = (TITLE_WEIGHT,)
+                # Rank inside the FTS index, then load only the page's rows
+                rows = self._connection.execute(
+                    "SELECT a.url, a.title, a.summary, a.source, a.published_at FROM ("
+                    f"SELECT rowid, {score} AS score FROM articles_fts "
+                    "WHERE articles_fts MATCH ? AND rowid >= ? ORDER BY score LIMIT ? OFFSET ?"
+                    ") AS ranked JOIN articles a ON a.id = ranked.rowid ORDER BY ranked.score",
+                    score_params + (match, min_id, limit, offset)
+                ).fetchall()
+        return [
+            {"url": url, "title": title, "summary": summary, "source": source, "published_at": published_at}
+            for url, title, summary, source, published_at in rows
+        ]
+
+    def prune(self) -> int:
+        """
+        Delete articles, and entry IDs, older than the retention window.
+
+        Returns:
+            The number of articles deleted
+        """
+        cutoff = time.time() - self.retention_days * 86400
+        with self._lock:
+            deleted = self._connection.execute("DELETE FROM articles WHERE id < ?", (article_id(cutoff),)).rowcount
+            self._connection.execute("DELETE FROM feed_entries WHERE seen_at < ?", (cutoff,))
+            self._connection.commit()
+            if deleted:
+                self._near_duplicates = self._load_fingerprints()
+                self._counters["pruned"] += deleted
+        return deleted
+
+    def is_empty(self) -> bool:
+        """
+        Check whether any article is indexed, without counting them.
+
+        Returns:
+            True if the index has no articles
+        """
+        with self._lock:
+            return self._connection.execute("SELECT 1 FROM articles LIMIT 1").fetchone() is None
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get ingestion and lookup counters.
+
+        Returns:
+            A dictionary of counters and the number of indexed articles
+        """
+        with self._lock:
+            stats: Dict[str, float] = dict(self._counters)
+            stats["articles"] = self._connection.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM articles")
+            self._connection.execute("DELETE FROM feeds")
+            self._connection.execute("DELETE FROM feed_entries")
+            self._connection.commit()
+            self._near_duplicates = NearDuplicateIndex()
+
+
+_store: Optional[NewsStore] = None
+_store_lock = threading.Lock()
+
+
+def get_news_store() -> NewsStore:
+    """
+    Get the process-wide news article index.
+
+    Returns:
+        The shared NewsStore
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = NewsStore()
+    return _store
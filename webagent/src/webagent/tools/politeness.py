@@ -0,0 +1,242 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+from webagent.tools.http_client import get_session, DEFAULT_HEADERS
+
+
+# Minimum number of seconds between two requests to the same host
+DEFAULT_MIN_INTERVAL = float(os.environ.get("WEBAGENT_HOST_MIN_INTERVAL", "1.0"))
+
+# Whether to honor the Crawl-delay / Request-rate directives in robots.txt
+DEFAULT_RESPECT_ROBOTS = os.environ.get("WEBAGENT_RESPECT_ROBOTS", "true").lower() in ("1", "true", "yes")
+
+# Upper bound on a Crawl-delay taken from robots.txt, in seconds
+MAX_CRAWL_DELAY = 30.0
+
+# How long a host's robots.txt settings are remembered, in seconds
+ROBOTS_TTL = 3600.0
+
+# Time allowed for fetching robots.txt, in seconds, in total; it is not retried
+ROBOTS_TIMEOUT = 3.0
+
+# robots.txt content past this size is ignored, as major crawlers do
+ROBOTS_MAX_BYTES = 512 * 1024
+
+# Hosts whose request slots and robots.txt settings are remembered before expired ones are dropped
+MAX_TRACKED_HOSTS = 10000
+
+
+class HostScheduler:
+    """
+    Rate-limit requests per host across all threads in the process.
+
+    Every host gets its own minimum interval between requests (the default
+    interval, raised to the host's robots.txt Crawl-delay when present).
+    Callers reserve the next free slot for the host and sleep only until that
+    slot, so requests to unrelated hosts are never delayed by each other.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        respect_robots: bool = DEFAULT_RESPECT_ROBOTS,
+        max_crawl_delay: float = MAX_CRAWL_DELAY,
+        robots_ttl: float = ROBOTS_TTL,
+    ):
+        self.min_interval = min_interval
+        self.respect_robots = respect_robots
+        self.max_crawl_delay = max_crawl_delay
+        self.robots_ttl = robots_ttl
+        self._lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+        self._crawl_delays: Dict[str, Tuple[Optional[float], float]] = {}
+        self._robots_locks: Dict[str, threading.Lock] = {}
+
+    def wait(self, url: str) -> float:
+        """
+        Block until a request to the URL's host is allowed.
+
+        Args:
+            url: The URL about to be fetched
+
+        Returns:
+            The number of seconds spent waiting
+        """
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def async_wait(self, url: str) -> float:
+        """
+        Wait without blocking the event loop until a request to the URL's host is allowed.
+
+        Args:
+            url: The URL about to be fetched
+
+        Returns:
+            The number of seconds spent waiting
+        """
+        # A first request to a host may fetch its robots.txt, so reserve off the loop
+        delay = await asyncio.to_thread(self.reserve, url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def reserve(self, url: str) -> float:
+        """
+        Reserve the next request slot for the URL's host without sleeping.
+
+        Args:
+            url: The URL about to be fetched
+
+        Returns:
+            The number of seconds the caller must wait before sending the request
+        """
+        host = self._host_key(url)
+        interval = self._interval_for(host)
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + interval
+
+            # Forget hosts whose slots are long past to keep the table small
+            if len(self._next_slot) > MAX_TRACKED_HOSTS:
+                self._next_slot = {
+                    key: value for key, value in self._next_slot.items() if value > now
+                }
+
+        return slot - now
+
+    def _interval_for(self, host: str) -> float:
+        """
+        Get the minimum interval between requests to a host.
+
+        Args:
+            host: The scheme and network location of the host
+
+        Returns:
+            The interval in seconds
+        """
+        if not self.respect_robots:
+            return self.min_interval
+
+        crawl_delay = self._crawl_delay(host)
+        if crawl_delay is None:
+            return self.min_interval
+        return max(self.min_interval, min(crawl_delay, self.max_crawl_delay))
+
+    def _crawl_delay(self, host: str) -> Optional[float]:
+        """
+        Get the Crawl-delay a host asks for in its robots.txt.
+
+        The robots.txt file is fetched at most once per host per TTL, even
+        when many threads ask for the same host at the same time. The lock
+        serializing a host's fetch only exists while the fetch runs.
+
+        Args:
+            host: The scheme and network location of the host
+
+        Returns:
+            The delay in seconds, or None if the host does not specify one
+        """
+        now = time.monotonic()
+        cached = self._crawl_delays.get(host)
+        if cached and cached[1] > now:
+            return cached[0]
+
+        with self._lock:
+            host_lock = self._robots_locks.setdefault(host, threading.Lock())
+
+        with host_lock:
+            # Another thread may have fetched it while we were waiting
+            cached = self._crawl_delays.get(host)
+            if cached and cached[1] > time.monotonic():
+                return cached[0]
+
+            delay = self._fetch_crawl_delay(host)
+            now = time.monotonic()
+            with self._lock:
+                self._crawl_delays[host] = (delay, now + self.robots_ttl)
+                self._robots_locks.pop(host, None)
+                if len(self._crawl_delays) > MAX_TRACKED_HOSTS:
+                    self._crawl_delays = {
+                        key: value for key, value in self._crawl_delays.items() if value[1] > now
+                    }
+            return delay
+
+    def _fetch_crawl_delay(self, host: str) -> Optional[float]:
+        """
+        Fetch and parse a host's robots.txt.
+
+        The fetch is best effort: it is not retried and gives up once
+        ROBOTS_TIMEOUT has passed, so a slow host costs its first request
+        seconds rather than minutes.
+
+        Args:
+            host: The scheme and network location of the host
+
+        Returns:
+            The delay in seconds, or None if there is none or robots.txt is unavailable
+        """
+        deadline = time.monotonic() + ROBOTS_TIMEOUT
+        content = b""
+        try:
+            with get_session(retries=False).get(
+                f"{host}/robots.txt", timeout=ROBOTS_TIMEOUT, stream=True
+            ) as response:
+                if response.status_code != 200:
+                    return None
+                for chunk in response.iter_content(chunk_size=16384):
+                    content += chunk
+                    if len(content) >= ROBOTS_MAX_BYTES or time.monotonic() > deadline:
+                        break
+                encoding = response.encoding or "utf-8"
+        except requests.exceptions.RequestException:
+            return None
+
+        parser = RobotFileParser()
+        parser.parse(content[:ROBOTS_MAX_BYTES].decode(encoding, errors="replace").splitlines())
+
+        user_agent = DEFAULT_HEADERS["User-Agent"]
+        delay = parser.crawl_delay(user_agent)
+        if delay is not None:
+            return float(delay)
+
+        rate = parser.request_rate(user_agent)
+        if rate is not None and rate.requests:
+            return rate.seconds / rate.requests
+
+        return None
+
+    @staticmethod
+    def _host_key(url: str) -> str:
+        parsed = urlparse(url)
+        return f"{parsed.scheme.lower()}://{parsed.netloc.lower()}"
+
+
+_scheduler: Optional[HostScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_host_scheduler() -> HostScheduler:
+    """
+    Get the process-wide host scheduler shared by all tools and crews.
+
+    Returns:
+        The shared HostScheduler
+    """
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = HostScheduler()
+    return _scheduler
@@ -0,0 +1,294 @@
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from webagent.context_compression import truncate_to_tokens
+from webagent.tools.storage import get_cache_dir
+
+try:
+    import chromadb
+    from chromadb.config import Settings
+    from chromadb.utils import embedding_functions
+except ImportError:
+    chromadb = None
+
+
+# Whether research results are remembered and recalled for later queries
+MEMORY_ENABLED = os.environ.get("WEBAGENT_RESEARCH_MEMORY", "true").lower() in ("1", "true", "yes")
+
+# Number of remembered chunks recalled for a query
+DEFAULT_RECALL_RESULTS = int(os.environ.get("WEBAGENT_MEMORY_RESULTS", "5"))
+
+# Chunks further than this cosine distance from the query are not recalled (0 = identical, 2 = opposite)
+DEFAULT_MAX_DISTANCE = float(os.environ.get("WEBAGENT_MEMORY_MAX_DISTANCE", "0.5"))
+
+# Token budget of the recalled notes handed to the crew
+DEFAULT_NOTES_TOKEN_BUDGET = int(os.environ.get("WEBAGENT_MEMORY_TOKEN_BUDGET", "1000"))
+
+# Words per stored chunk, and words shared by consecutive chunks so no passage is cut in half
+CHUNK_WORDS = 200
+CHUNK_OVERLAP = 40
+
+COLLECTION_NAME = "research"
+
+# Kinds of research that only count as recent for the look-back window they were gathered in
+DATED_KINDS = ("news",)
+
+
+def chunk_text(text: str, size: int = CHUNK_WORDS, overlap: int = CHUNK_OVERLAP) -> List[str]:
+    """
+    Split a text into overlapping windows of words.
+
+    Args:
+        text: The text to split
+        size: Words per chunk
+        overlap: Words repeated at the start of the next chunk
+
+    Returns:
+        The chunks in order; a short text is a single chunk
+    """
+    words = text.split()
+    if not words:
+        return []
+    step = max(1, size - overlap)
+    return [" ".join(words[start:start + size]) for start in range(0, max(1, len(words) - overlap), step)]
+
+
+def describe_age(stored_at: float, now: Optional[float] = None) -> str:
+    """
+    Describe how long ago something was stored.
+
+    Args:
+        stored_at: When it was stored, as a Unix timestamp
+        now: The current time; defaults to time.time()
+
+    Returns:
+        The age in minutes, hours or days, e.g. '3 hours ago'
+    """
+    seconds = max(0.0, (now if now is not None else time.time()) - stored_at)
+    for unit, length in (("day", 86400), ("hour", 3600), ("minute", 60)):
+        if seconds >= length:
+            count = int(seconds // length)
+            return f"{count} {unit}{'s' if count != 1 else ''} ago"
+    return "just now"
+
+
+class ResearchMemory:
+    """
+    Local vector store of earlier research, recalled for related queries.
+
+    Scraped page extracts, news digests and final reports are split into
+    chunks, embedded on the CPU with chromadb's bundled all-MiniLM-L6-v2
+    ONNX model (downloaded once on first use) and persisted in the cache
+    directory. Before a query is researched, the closest chunks are handed
+    to the crew so it only searches the web for what they do not cover.
+    """
+
+    def __init__(self, path: Optional[str] = None, embedding_function: Any = None):
+        """
+        Open or create the store.
+
+        Args:
+            path: Directory of the chromadb database; defaults to research_memory in the cache directory
+            embedding_function: A chromadb embedding function; defaults to the bundled ONNX MiniLM model
+
+        Raises:
+            RuntimeError: If chromadb is not installed
+        """
+        if chromadb is None:
+            raise RuntimeError("Research memory requires chromadb. Install it with: pip install chromadb")
+
+        self._embedding_function = embedding_function or embedding_functions.DefaultEmbeddingFunction()
+        self._client = chromadb.PersistentClient(
+            path=path or os.path.join(get_cache_dir(), "research_memory"),
+            settings=Settings(anonymized_telemetry=False),
+        )
+        self._collection = self._open_collection()
+        # Guards the counters and clear(); chromadb does its own locking for reads and writes
+        self._lock = threading.Lock()
+        # Embedding is CPU-bound; writes happen off the caller's thread, one at a time
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="webagent-memory")
+        self._counters = {"chunks_added": 0, "recalls": 0, "recall_hits": 0}
+
+    def _open_collection(self) -> Any:
+        return self._client.get_or_create_collection(
+            name=COLLECTION_NAME,
+            embedding_function=self._embedding_function,
+            metadata={"hnsw:space": "cosine"},
+        )
+
+    def remember(self, text: str, source: str, kind: str, query: str = "") -> int:
+        """
+        Store a piece of research.
+
+        Chunks are keyed by their content, so storing the same text again
+        only refreshes its metadata.
+
+        Args:
+            text: The research text
+            source: Where it came from, e.g. a URL or task name
+            kind: What it is, e.g. 'page', 'news' or 'report'
+            query: The query it was gathered for
+
+        Returns:
+            The number of chunks stored
+        """
+        chunks = chunk_text(text)
+        if not chunks:
+            return 0
+        stored_at = time.time()
+        # Embedding happens inside the upsert, outside our lock, so it never holds up a recall
+        self._collection.upsert(
+            ids=[hashlib.sha256(chunk.encode("utf-8", "surrogatepass")).hexdigest() for chunk in chunks],
+            documents=chunks,
+            metadatas=[
+                {"source": source, "kind": kind, "query": query, "stored_at": stored_at}
+                for _ in chunks
+            ],
+        )
+        with self._lock:
+            self._counters["chunks_added"] += len(chunks)
+        return len(chunks)
+
+    def remember_async(self, text: str, source: str, kind: str, query: str = "") -> None:
+        """
+        Store a piece of research in the background; takes the same arguments as remember().
+        """
+        self._writer.submit(self.remember, text, source, kind, query)
+
+    def recall(
+        self,
+        query: str,
+        n_results: int = DEFAULT_RECALL_RESULTS,
+        max_distance: float = DEFAULT_MAX_DISTANCE,
+        days: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the stored chunks closest in meaning to a query.
+
+        Args:
+            query: The research query
+            n_results: Maximum number of chunks to return
+            max_distance: Maximum cosine distance of a returned chunk
+            days: Only recall news stored within this many days; None recalls news of any age
+
+        Returns:
+            Chunks with their text, source, kind, original query, distance, storage time and age, closest first
+        """
+        where = None
+        if days is not None:
+            # Pages and reports stay useful; news older than the look-back window does not
+            where = {"$or": [
+                {"kind": {"$nin": list(DATED_KINDS)}},
+                {"stored_at": {"$gte": time.time() - days * 86400}},
+            ]}
+        with self._lock:
+            self._counters["recalls"] += 1
+        collection = self._collection
+        count = collection.count()
+        if not count or n_results <= 0:
+            return []
+        result = collection.query(
+            query_texts=[query],
+            n_results=min(n_results, count),
+            where=where,
+            include=["documents", "metadatas", "distances"],
+        )
+
+        chunks = []
+        for document, metadata, distance in zip(
+            result["documents"][0], result["metadatas"][0], result["distances"][0]
+        ):
+            if distance <= max_distance:
+                chunks.append({
+                    "text": document,
+                    "source": metadata.get("source", ""),
+                    "kind": metadata.get("kind", ""),
+                    "query": metadata.get("query", ""),
+                    "distance": distance,
+                    "stored_at": metadata.get("stored_at", 0.0),
+                    "age": describe_age(metadata.get("stored_at", 0.0)),
+                })
+        if chunks:
+            with self._lock:
+                self._counters["recall_hits"] += 1
+        return chunks
+
+    def recall_notes(self, query: str, days: Optional[int] = None, budget: int = DEFAULT_NOTES_TOKEN_BUDGET) -> str:
+        """
+        Recall earlier research on a query as notes for the crew.
+
+        Args:
+            query: The research query
+            days: Only recall news stored within this many days; None recalls news of any age
+            budget: Maximum tokens of notes
+
+        Returns:
+            The recalled chunks with their sources and age, or an empty string if nothing relevant is stored
+        """
+        chunks = self.recall(query, days=days)
+        if not chunks:
+            return ""
+        notes = "\n\n".join(
+            f"[{chunk['kind']}: {chunk['source']}, stored {chunk['age']}]\n{chunk['text']}" for chunk in chunks
+        )
+        return truncate_to_tokens(notes, budget)
+
+    def embed(self, text: str) -> List[float]:
+        """
+        Embed a text with the model the store uses.
+
+        Args:
+            text: The text to embed
+
+        Returns:
+            The embedding vector
+        """
+        return [float(value) for value in self._embedding_function([text])[0]]
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get store and recall counters.
+
+        Returns:
+            Chunks stored, recalls and recalls that found relevant research
+        """
+        with self._lock:
+            stats: Dict[str, float] = dict(self._counters)
+        stats["chunks"] = self._collection.count()
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._client.delete_collection(COLLECTION_NAME)
+            self._collection = self._open_collection()
+
+
+_memory: Optional[ResearchMemory] = None
+_memory_failed = False
+_memory_lock = threading.Lock()
+
+
+def get_research_memory() -> Optional[ResearchMemory]:
+    """
+    Get the process-wide research memory.
+
+    Returns:
+        The shared ResearchMemory, or None if it is disabled or chromadb is unavailable
+    """
+    global _memory, _memory_failed
+    if _memory is None and not _memory_failed:
+        with _memory_lock:
+            if _memory is None and not _memory_failed:
+                if not MEMORY_ENABLED or chromadb is None:
+                    _memory_failed = True
+                else:
+                    try:
+                        _memory = ResearchMemory()
+                    except Exception:
+                        # A broken or locked database must not stop research
+                        _memory_failed = True
+    return _memory
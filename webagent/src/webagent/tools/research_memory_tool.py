@@ -0,0 +1,56 @@
+from crewai.tools import BaseTool
+from typing import Optional, Type
+from pydantic import BaseModel, Field
+import asyncio
+import json
+from webagent.tools.research_memory import DEFAULT_RECALL_RESULTS, get_research_memory
+
+
+class ResearchMemoryToolInput(BaseModel):
+    """Input schema for ResearchMemoryTool."""
+    query: str = Field(..., description="What to look up in earlier research.")
+    max_results: int = Field(default=DEFAULT_RECALL_RESULTS, description="Maximum number of passages to return.")
+    days: Optional[int] = Field(default=None, description="Only return news stored within this many days.")
+
+class ResearchMemoryTool(BaseTool):
+    name: str = "Research Memory Tool"
+    description: str = (
+        "A tool for looking up research gathered for earlier queries: scraped pages, news and reports. "
+        "It returns the stored passages closest in meaning to the query, with their sources and age. "
+        "Check it before searching the web for follow-up or related questions."
+    )
+    args_schema: Type[BaseModel] = ResearchMemoryToolInput
+
+    def _run(self, query: str, max_results: int = DEFAULT_RECALL_RESULTS, days: Optional[int] = None) -> str:
+        """
+        Look up earlier research related to a query.
+
+        Args:
+            query: What to look up
+            max_results: Maximum number of passages to return
+            days: Only return news stored within this many days
+
+        Returns:
+            A JSON string containing the passages found
+        """
+        try:
+            memory = get_research_memory()
+            if memory is None:
+                return json.dumps({"error": "Research memory is not available"}, indent=2)
+            return json.dumps(memory.recall(query, max_results, days=days), indent=2)
+        except Exception as e:
+            return json.dumps({"error": f"Error searching research memory: {str(e)}"}, indent=2)
+
+    async def _arun(self, query: str, max_results: int = DEFAULT_RECALL_RESULTS, days: Optional[int] = None) -> str:
+        """
+        Look up earlier research without blocking the event loop.
+
+        Args:
+            query: What to look up
+            max_results: Maximum number of passages to return
+            days: Only return news stored within this many days
+
+        Returns:
+            A JSON string containing the passages found
+        """
+        return await asyncio.to_thread(self._run, query, max_results, days)
@@ -0,0 +1,414 @@
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from webagent.tools.storage import connect
+
+
+# Maximum total size of cached response bodies, in bytes
+DEFAULT_MAX_BYTES = int(os.environ.get("WEBAGENT_RESPONSE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Upper bound on the heuristic freshness lifetime derived from Last-Modified, in seconds
+MAX_HEURISTIC_TTL = 24 * 3600
+
+# Response headers kept with a cache entry, by lowercase name
+CACHED_HEADERS = {
+    "age": "Age",
+    "cache-control": "Cache-Control",
+    "content-type": "Content-Type",
+    "date": "Date",
+    "etag": "ETag",
+    "expires": "Expires",
+    "last-modified": "Last-Modified",
+}
+
+# Query parameters that only track the visitor and never change the page
+TRACKING_PARAMS = re.compile(r"^(utm_\w+|fbclid|gclid|mc_cid|mc_eid)$", re.IGNORECASE)
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so equivalent addresses share one cache entry.
+
+    The scheme and host are lowercased, default ports and fragments are
+    dropped, tracking parameters are removed and the query is sorted.
+
+    Args:
+        url: The URL to normalize
+
+    Returns:
+        The normalized URL
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    if (scheme == "http" and netloc.endswith(":80")) or (scheme == "https" and netloc.endswith(":443")):
+        netloc = netloc.rsplit(":", 1)[0]
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not TRACKING_PARAMS.match(key)
+    ))
+    return urlunparse((scheme, netloc, parsed.path or "/", parsed.params, query, ""))
+
+
+@dataclass
+class CachedResponse:
+    """A response body stored in the cache together with its validators."""
+    url: str
+    body: bytes
+    encoding: Optional[str] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    expires_at: float = 0.0
+    stored_at: float = 0.0
+    complete: bool = True
+
+    @property
+    def text(self) -> str:
+        return self.body.decode(self.encoding or "utf-8", errors="replace")
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return self.expires_at > (now if now is not None else time.time())
+
+    def validators(self) -> Dict[str, str]:
+        """
+        Build the conditional request headers for revalidating this entry.
+
+        Returns:
+            A dictionary with If-None-Match and/or If-Modified-Since headers
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def _select_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    return {
+        CACHED_HEADERS[name.lower()]: value for name, value in headers.items()
+        if name.lower() in CACHED_HEADERS
+    }
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def _cache_control(headers: Dict[str, str]) -> Dict[str, Optional[str]]:
+    directives = {}
+    for part in headers.get("Cache-Control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+    return directives
+
+
+def freshness_lifetime(headers: Dict[str, str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Work out until when a response may be served without revalidation.
+
+    Follows Cache-Control max-age, then Expires, then a heuristic of 10% of
+    the time since Last-Modified.
+
+    Args:
+        headers: The response headers
+        now: The current time as a UNIX timestamp
+
+    Returns:
+        The expiry time as a UNIX timestamp, or None if the response must not be stored
+    """
+    now = now if now is not None else time.time()
+    directives = _cache_control(headers)
+
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return now
+
+    if directives.get("max-age") is not None:
+        try:
+            age = float(headers.get("Age", 0) or 0)
+            return now + max(0.0, float(directives["max-age"]) - age)
+        except ValueError:
+            pass
+
+    expires = _parse_http_date(headers.get("Expires"))
+    if expires is not None:
+        return expires
+
+    last_modified = _parse_http_date(headers.get("Last-Modified"))
+    if last_modified is not None:
+        date = _parse_http_date(headers.get("Date")) or now
+        return now + min(max(0.0, (date - last_modified) * 0.1), MAX_HEURISTIC_TTL)
+
+    return now
+
+
+class ResponseCache:
+    """
+    Persistent, size-bounded HTTP response cache stored in SQLite.
+
+    Entries are keyed by normalized URL and evicted least-recently-used first
+    once the total body size exceeds the configured limit.
+    """
+
+    def __init__(self, path: str = "http_cache.sqlite3", max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection = connect(path)
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                encoding TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                expires_at REAL NOT NULL,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL,
+                complete INTEGER NOT NULL DEFAULT 1
+            );
+            CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+            """
+        )
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(responses)")}
+        if "complete" not in columns:
+            self._connection.execute("ALTER TABLE responses ADD COLUMN complete INTEGER NOT NULL DEFAULT 1")
+        self._connection.commit()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "stale": 0,
+            "revalidated": 0,
+            "stores": 0,
+            "evictions": 0,
+        }
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """
+        Look up a cached response and mark it as recently used.
+
+        Args:
+            url: The requested URL
+
+        Returns:
+            The cached response, fresh or stale, or None if there is none
+        """
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT url, headers, body, encoding, etag, last_modified, expires_at, stored_at, complete "
+                "FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                self._counters["misses"] += 1
+                return None
+            self._connection.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._connection.commit()
+            self._counters["hits" if row[6] > now else "stale"] += 1
+
+        return CachedResponse(
+            url=row[0],
+            headers=json.loads(row[1]),
+            body=row[2],
+            encoding=row[3],
+            etag=row[4],
+            last_modified=row[5],
+            expires_at=row[6],
+            stored_at=row[7],
+            complete=bool(row[8]),
+        )
+
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        headers: Dict[str, str],
+        encoding: Optional[str] = None,
+        complete: bool = True,
+    ) -> Optional[CachedResponse]:
+        """
+        Store a successful response if its headers allow caching.
+
+        Args:
+            url: The requested URL
+            body: The raw response body
+            headers: The response headers
+            encoding: The character encoding of the body
+            complete: False if the body is a prefix the client stopped reading early
+
+        Returns:
+            The stored entry, or None if the response is not cacheable
+        """
+        now = time.time()
+        kept_headers = _select_headers(headers)
+        expires_at = freshness_lifetime(kept_headers, now)
+        etag = kept_headers.get("ETag")
+        last_modified = kept_headers.get("Last-Modified")
+
+        # A response that is immediately stale and cannot be revalidated is useless
+        if expires_at is None or (expires_at <= now and not etag and not last_modified):
+            return None
+        if len(body) > self.max_bytes:
+            return None
+
+        cached = CachedResponse(
+            url=url,
+            body=body,
+            encoding=encoding,
+            headers=kept_headers,
+            etag=etag,
+            last_modified=last_modified,
+            expires_at=expires_at,
+            stored_at=now,
+            complete=complete,
+        )
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, headers, body, encoding, etag, last_modified, expires_at, stored_at, last_access, size, complete) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    normalize_url(url), url, json.dumps(kept_headers), body, encoding,
+                    etag, last_modified, expires_at, now, now, len(body), int(complete)
+                )
+            )
+            self._counters["stores"] += 1
+            self._evict()
+            self._connection.commit()
+        return cached
+
+    def revalidated(self, cached: CachedResponse, headers: Dict[str, str]) -> CachedResponse:
+        """
+        Refresh an entry after the server answered 304 Not Modified.
+
+        Args:
+            cached: The stale entry that was revalidated
+            headers: The headers of the 304 response
+
+        Returns:
+            The entry with its expiry and validators updated
+        """
+        now = time.time()
+        # The Age of the original response no longer applies after revalidation
+        merged = {name: value for name, value in cached.headers.items() if name != "Age"}
+        merged.update(_select_headers(headers))
+        cached.headers = merged
+        cached.etag = merged.get("ETag", cached.etag)
+        cached.last_modified = merged.get("Last-Modified", cached.last_modified)
+        cached.expires_at = freshness_lifetime(merged, now) or now
+
+        with self._lock:
+            self._connection.execute(
+                "UPDATE responses SET headers = ?, etag = ?, last_modified = ?, expires_at = ?, last_access = ? "
+                "WHERE key = ?",
+                (
+                    json.dumps(merged), cached.etag, cached.last_modified, cached.expires_at, now,
+                    normalize_url(cached.url)
+                )
+            )
+            self._connection.commit()
+            self._counters["revalidated"] += 1
+        return cached
+
+    async def aget(self, url: str) -> Optional[CachedResponse]:
+        """Async variant of get() that runs the lookup off the event loop."""
+        return await asyncio.to_thread(self.get, url)
+
+    async def aput(
+        self,
+        url: str,
+        body: bytes,
+        headers: Dict[str, str],
+        encoding: Optional[str] = None,
+        complete: bool = True,
+    ) -> Optional[CachedResponse]:
+        """Async variant of put() that writes off the event loop."""
+        return await asyncio.to_thread(self.put, url, body, headers, encoding, complete)
+
+    async def arevalidated(self, cached: CachedResponse, headers: Dict[str, str]) -> CachedResponse:
+        """Async variant of revalidated() that writes off the event loop."""
+        return await asyncio.to_thread(self.revalidated, cached, headers)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get hit/miss counters and the current size of the cache.
+
+        Returns:
+            A dictionary of counters, entry count, total bytes and hit ratio
+        """
+        with self._lock:
+            entries, size = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            stats = dict(self._counters)
+        lookups = stats["hits"] + stats["misses"] + stats["stale"]
+        stats["entries"] = entries
+        stats["bytes"] = size
+        stats["hit_ratio"] = (stats["hits"] + stats["revalidated"]) / lookups if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+            self._connection.commit()
+
+    def _evict(self) -> None:
+        """
+        Drop least-recently-used entries until the cache fits in max_bytes.
+
+        Must be called with the lock held.
+        """
+        total = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._connection.execute("SELECT key, size FROM responses ORDER BY last_access ASC")
+        doomed = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._connection.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        self._counters["evictions"] += len(doomed)
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Get the process-wide response cache shared by the scraping tools.
+
+    Returns:
+        The shared ResponseCache
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
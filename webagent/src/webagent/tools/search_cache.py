@@ -0,0 +1,202 @@
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from webagent.tools.storage import connect
+
+
+# How long search results are served from the cache, in seconds
+DEFAULT_TTL = float(os.environ.get("WEBAGENT_SEARCH_CACHE_TTL", str(6 * 3600)))
+
+# Number of queries kept in the in-memory tier
+DEFAULT_MEMORY_ENTRIES = 1024
+
+# Words ignored when building cache keys, so "the latest AI news" and "latest AI news" share an entry.
+# Question words and negations are kept: "why did X fall" and "when did X fall" are different searches
+STOP_WORDS = frozenset({
+    "a", "about", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does",
+    "for", "from", "i", "in", "is", "it", "me", "of", "on", "or", "tell",
+    "that", "the", "this", "to", "was", "will", "with",
+})
+
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a search query into a cache key.
+
+    The key is case-, whitespace- and punctuation-insensitive and ignores
+    stop words, unless the query consists of nothing but stop words.
+
+    Args:
+        query: The search query
+
+    Returns:
+        The normalized query
+    """
+    words = WORD_PATTERN.findall(query.lower())
+    meaningful = [word for word in words if word not in STOP_WORDS]
+    return " ".join(meaningful or words)
+
+
+class SearchCache:
+    """
+    Two-tier cache of search results: an in-memory LRU in front of SQLite.
+
+    Each normalized query keeps the largest result set fetched for it, so a
+    request for fewer results is answered from a larger cached set.
+    """
+
+    def __init__(
+        self,
+        path: str = "search_cache.sqlite3",
+        ttl: float = DEFAULT_TTL,
+        max_memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+    ):
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[int, List[Dict[str, Any]], float]]" = OrderedDict()
+        self._connection = connect(path)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS searches (
+                key TEXT PRIMARY KEY,
+                num INTEGER NOT NULL,
+                results TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        self._connection.commit()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+
+    def get(self, query: str, num_results: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up cached results for a query.
+
+        Args:
+            query: The search query
+            num_results: Number of results requested
+
+        Returns:
+            Up to num_results cached results, or None on a miss
+        """
+        key = normalize_query(query)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and self._covers(entry, num_results, now):
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return entry[1][:num_results]
+
+            row = self._connection.execute(
+                "SELECT num, results, expires_at FROM searches WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                entry = (row[0], json.loads(row[1]), row[2])
+                if self._covers(entry, num_results, now):
+                    self._remember(key, entry)
+                    self._counters["disk_hits"] += 1
+                    return entry[1][:num_results]
+
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, query: str, num_results: int, results: List[Dict[str, Any]]) -> None:
+        """
+        Store the results fetched for a query.
+
+        An unexpired entry covering more results is not replaced by a smaller one.
+
+        Args:
+            query: The search query
+            num_results: Number of results that were requested from the search API
+            results: The results returned
+        """
+        key = normalize_query(query)
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO searches (key, num, results, expires_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET num = excluded.num, results = excluded.results, "
+                "expires_at = excluded.expires_at "
+                "WHERE searches.expires_at <= ? OR searches.num <= excluded.num",
+                (key, num_results, json.dumps(results), now + self.ttl, now)
+            )
+            self._connection.execute("DELETE FROM searches WHERE expires_at <= ?", (now,))
+            self._connection.commit()
+            self._counters["stores"] += 1
+
+            # Mirror whichever entry won into the memory tier
+            row = self._connection.execute(
+                "SELECT num, results, expires_at FROM searches WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._remember(key, (row[0], json.loads(row[1]), row[2]))
+
+    async def aget(self, query: str, num_results: int) -> Optional[List[Dict[str, Any]]]:
+        """Async variant of get() that runs the lookup off the event loop."""
+        return await asyncio.to_thread(self.get, query, num_results)
+
+    async def aput(self, query: str, num_results: int, results: List[Dict[str, Any]]) -> None:
+        """Async variant of put() that writes off the event loop."""
+        await asyncio.to_thread(self.put, query, num_results, results)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get hit/miss counters for both tiers.
+
+        Returns:
+            A dictionary of counters and the overall hit ratio
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_ratio"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._connection.execute("DELETE FROM searches")
+            self._connection.commit()
+
+    @staticmethod
+    def _covers(entry: Tuple[int, List[Dict[str, Any]], float], num_results: int, now: float) -> bool:
+        # A result set shorter than what was asked for means the search had no more results
+        num, results, expires_at = entry
+        return expires_at > now and (num >= num_results or len(results) < num)
+
+    def _remember(self, key: str, entry: Tuple[int, List[Dict[str, Any]], float]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+
+_cache: Optional[SearchCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    """
+    Get the process-wide search result cache.
+
+    Returns:
+        The shared SearchCache
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SearchCache()
+    return _cache
@@ -0,0 +1,40 @@
+import os
+import sqlite3
+
+
+def get_cache_dir() -> str:
+    """
+    Get the directory used for the tools' persistent caches and stores.
+
+    The location can be changed with the WEBAGENT_CACHE_DIR environment variable.
+
+    Returns:
+        The path to the cache directory, created if it does not exist
+    """
+    cache_dir = os.environ.get(
+        "WEBAGENT_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "webagent")
+    )
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """
+    Open a SQLite database that can be shared between threads and processes.
+
+    The connection uses write-ahead logging so readers do not block the
+    writer. Callers are expected to serialize access with their own lock.
+
+    Args:
+        path: Path to the database file, or a bare file name inside the cache directory
+
+    Returns:
+        An open sqlite3 connection
+    """
+    if not os.path.dirname(path):
+        path = os.path.join(get_cache_dir(), path)
+    connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
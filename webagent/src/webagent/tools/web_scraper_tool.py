@@ -1,88 +1,659 @@
 from crewai.tools import BaseTool
-from typing import Type, Dict, Any, Optional, List
+from typing import Type, Dict, Any, Optional, List, Tuple
 from pydantic import BaseModel, Field
 import requests
 from bs4 import BeautifulSoup
+import asyncio
 import json
-import time
+import os
 import re
+import codecs
+from concurrent.futures import ThreadPoolExecutor, wait
 from urllib.parse import urljoin, urlparse
+from webagent.tools.http_client import async_send, get_session, ASYNC_HTTP_ERRORS, DEFAULT_TIMEOUT
+from webagent.tools.politeness import get_host_scheduler
+from webagent.tools.response_cache import CachedResponse, get_response_cache
+from webagent.tools.html_extractor import DEFAULT_PARSER, create_extractor, resolve_backend, resolve_link, sections_for
+from webagent.tools.near_duplicates import NearDuplicateIndex, get_canonical_registry, page_canonical
+
+
+# Default number of pages fetched concurrently in batch mode
+DEFAULT_MAX_WORKERS = 5
+
+# Default overall deadline for a batch, in seconds
+DEFAULT_BATCH_TIMEOUT = 60
+
+# Maximum number of bytes read from a single page
+MAX_PAGE_BYTES = int(os.environ.get("WEBAGENT_SCRAPER_MAX_BYTES", str(2 * 1024 * 1024)))
+
+# Size of the chunks a page is streamed and parsed in
+CHUNK_SIZE = 16 * 1024
+
+# Content types the scraper parses; anything else is rejected before download
+HTML_CONTENT_TYPES = frozenset({"text/html", "application/xhtml+xml", "text/plain"})
+
+HEADER_CHARSET = re.compile(r"""charset=["']?([\w-]+)""", re.IGNORECASE)
+META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.IGNORECASE)
+
+
+class UnsupportedContentType(Exception):
+    """Raised when a URL does not point to an HTML page."""
+
+
+class _PageReader:
+    """
+    Collects a streamed page body and feeds it to the extractor chunk by chunk.
+    
+    Shared by the blocking and async fetch paths, which only differ in how
+    they iterate over the response body.
+    """
+    
+    def __init__(self, url: str, sections: frozenset, backend: str, content_type: str, fallback):
+        self.url = url
+        self.sections = sections
+        self.content_type = content_type
+        self.fallback = fallback
+        self.body = bytearray()
+        self.encoding: Optional[str] = None
+        self.stopped_early = False
+        self._decoder = None
+        self._extractor = create_extractor(backend, url, sections) if backend != "bs4" else None
+    
+    def feed(self, chunk: bytes) -> bool:
+        """
+        Add a chunk of the body.
+        
+        Args:
+            chunk: The next bytes of the response body
+            
+        Returns:
+            True once no more of the body needs to be read
+        """
+        if not chunk:
+            return False
+        if self._decoder is None:
+            self.encoding = _detect_encoding(self.content_type, chunk)
+            self._decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+        chunk = chunk[:MAX_PAGE_BYTES - len(self.body)]
+        self.body.extend(chunk)
+        if self._extractor is not None:
+            try:
+                self._extractor.feed(self._decoder.decode(chunk))
+            except Exception:
+                # Keep downloading and let BeautifulSoup handle the markup
+                self._extractor = None
+        if self._extractor is not None and self._extractor.satisfied:
+            self.stopped_early = True
+            return True
+        return len(self.body) >= MAX_PAGE_BYTES
+    
+    def result(self) -> Dict[str, Any]:
+        """
+        Finish parsing and return the extracted content.
+        
+        Returns:
+            The extracted sections and metadata
+        """
+        if self._extractor is not None:
+            try:
+                if self._decoder is not None:
+                    self._extractor.feed(self._decoder.decode(b"", final=True))
+                self._extractor.close()
+                return self._extractor.result()
+            except Exception:
+                pass
+        return self.fallback(self.url, self.sections, bytes(self.body).decode(self.encoding or "utf-8", errors="replace"))
+
+
+def _check_content_type(content_type: str) -> None:
+    """
+    Reject responses that are not HTML before their body is downloaded.
+    
+    Args:
+        content_type: The Content-Type header of the response
+        
+    Raises:
+        UnsupportedContentType: If the content type is not an HTML or text type
+    """
+    if content_type and content_type.split(";")[0].strip().lower() not in HTML_CONTENT_TYPES:
+        raise UnsupportedContentType(f"Unsupported content type: {content_type.split(';')[0]}")
+
+
+def _detect_encoding(content_type: str, first_chunk: bytes) -> str:
+    """
+    Pick the character encoding for a streamed HTML response.
+    
+    Args:
+        content_type: The Content-Type header of the response
+        first_chunk: The first bytes of the body
+        
+    Returns:
+        The name of the encoding to decode the body with
+    """
+    # Prefer an explicit charset from the Content-Type header, then a
+    # <meta charset> declaration near the top of the page
+    match = HEADER_CHARSET.search(content_type)
+    if match:
+        encoding = match.group(1)
+    else:
+        match = META_CHARSET.search(first_chunk[:4096])
+        encoding = match.group(1).decode("ascii", errors="ignore") if match else "utf-8"
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        encoding = "utf-8"
+    return encoding
 
 
 class WebScraperToolInput(BaseModel):
     """Input schema for WebScraperTool."""
-    url: str = Field(..., description="The URL of the webpage to scrape.")
+    url: Optional[str] = Field(default=None, description="The URL of the webpage to scrape.")
+    urls: Optional[List[str]] = Field(
+        default=None,
+        description="A list of URLs to scrape concurrently in a single call. Use this instead of 'url' when scraping several pages."
+    )
     extract_type: str = Field(
         default="text", 
         description="Type of content to extract: 'text', 'links', 'tables', or 'all'."
     )
+    max_workers: int = Field(
+        default=DEFAULT_MAX_WORKERS,
+        description="Maximum number of pages fetched at the same time when 'urls' is given."
+    )
+    timeout: float = Field(
+        default=DEFAULT_BATCH_TIMEOUT,
+        description="Overall time limit in seconds for a batch of URLs; pages not finished by then are reported as timed out."
+    )
+    parser: str = Field(
+        default=DEFAULT_PARSER,
+        description="HTML parser backend: 'auto' (fastest installed), 'lxml', 'selectolax', 'html.parser', or 'bs4'."
+    )
 
 class WebScraperTool(BaseTool):
     name: str = "Web Scraper Tool"
     description: str = (
         "A tool for extracting information from web pages. "
-        "It can extract text content, links, tables, or all of the above from a given URL."
+        "It can extract text content, links, tables, or all of the above from a given URL, "
+        "or from a list of URLs scraped concurrently in one call."
     )
     args_schema: Type[BaseModel] = WebScraperToolInput
 
-    def _run(self, url: str, extract_type: str = "text") -> str:
+    def _run(
+        self,
+        url: Optional[str] = None,
+        extract_type: str = "text",
+        urls: Optional[List[str]] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout: float = DEFAULT_BATCH_TIMEOUT,
+        parser: str = DEFAULT_PARSER,
+    ) -> str:
         """
-        Scrape a webpage and extract the requested information.
+        Scrape one or more webpages and extract the requested information.
         
         Args:
             url: The URL of the webpage to scrape
             extract_type: Type of content to extract ('text', 'links', 'tables', or 'all')
+            urls: A list of URLs to scrape concurrently instead of a single URL
+            max_workers: Maximum number of concurrent fetches in batch mode
+            timeout: Overall time limit in seconds for a batch
+            parser: HTML parser backend ('auto', 'lxml', 'selectolax', 'html.parser', or 'bs4')
             
         Returns:
             A JSON string containing the extracted information
         """
         try:
-            # Validate URL
-            if not self._is_valid_url(url):
-                return json.dumps({"error": f"Invalid URL: {url}"}, indent=2)
-            
-            # Add a small delay to be respectful to websites
-            time.sleep(1)
+            try:
+                backend = resolve_backend(parser)
+            except ValueError as e:
+                return json.dumps({"error": str(e)}, indent=2)
+            if urls:
+                return json.dumps(self._scrape_batch(urls, extract_type, max_workers, timeout, backend), indent=2)
+            if not url:
+                return json.dumps({"error": "Either 'url' or 'urls' must be provided"}, indent=2)
+            return json.dumps(self._scrape(url, extract_type, backend), indent=2)
+        except Exception as e:
+            return json.dumps({"error": f"Error scraping webpage: {str(e)}"}, indent=2)
+
+    async def _arun(
+        self,
+        url: Optional[str] = None,
+        extract_type: str = "text",
+        urls: Optional[List[str]] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout: float = DEFAULT_BATCH_TIMEOUT,
+        parser: str = DEFAULT_PARSER,
+    ) -> str:
+        """
+        Scrape one or more webpages without blocking the event loop.
+        
+        Takes the same arguments as _run(); batches are fetched as concurrent
+        coroutines, at most max_workers at a time.
+        
+        Returns:
+            A JSON string containing the extracted information
+        """
+        try:
+            try:
+                backend = resolve_backend(parser)
+            except ValueError as e:
+                return json.dumps({"error": str(e)}, indent=2)
+            if urls:
+                return json.dumps(await self._ascrape_batch(urls, extract_type, max_workers, timeout, backend), indent=2)
+            if not url:
+                return json.dumps({"error": "Either 'url' or 'urls' must be provided"}, indent=2)
+            return json.dumps(await self._ascrape(url, extract_type, backend), indent=2)
+        except Exception as e:
+            return json.dumps({"error": f"Error scraping webpage: {str(e)}"}, indent=2)
+
+    def _scrape_batch(
+        self,
+        urls: List[str],
+        extract_type: str,
+        max_workers: int,
+        timeout: float,
+        backend: str,
+    ) -> Dict[str, Any]:
+        """
+        Scrape several webpages concurrently with a bounded worker pool.
+        
+        Failed or timed-out pages are reported individually, so the results
+        of the pages that did succeed are always kept. Pages already in the
+        batch under another address, by canonical link or near-identical
+        text, are reported as duplicates of the first one.
+        
+        Args:
+            urls: The URLs to scrape
+            extract_type: Type of content to extract ('text', 'links', 'tables', or 'all')
+            max_workers: Maximum number of concurrent fetches
+            timeout: Overall time limit in seconds for the batch
+            backend: The HTML parser backend to use
             
-            # Fetch the webpage
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+        Returns:
+            A dictionary with per-URL results in input order and success/failure counts
+        """
+        # Drop duplicates while keeping the original order
+        unique_urls = list(dict.fromkeys(urls))
+        fetch_urls, outcomes = self._skip_known_duplicates(unique_urls)
+        
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(fetch_urls))),
+            thread_name_prefix="webagent-scraper",
+        )
+        try:
+            futures = {
+                executor.submit(self._scrape, page_url, extract_type, backend): page_url
+                for page_url in fetch_urls
             }
+            done, _ = wait(futures, timeout=timeout)
             
-            try:
-                response = requests.get(url, headers=headers, timeout=15)
-                response.raise_for_status()
-            except requests.exceptions.RequestException as e:
-                return json.dumps({"error": f"Failed to fetch URL: {str(e)}"}, indent=2)
+            for future, page_url in futures.items():
+                if future in done:
+                    try:
+                        outcomes[page_url] = future.result()
+                    except Exception as e:
+                        outcomes[page_url] = {"error": f"Error scraping webpage: {str(e)}"}
+                else:
+                    future.cancel()
+                    outcomes[page_url] = {"error": f"Timed out after {timeout} seconds"}
+        finally:
+            # Do not block on pages that are still downloading past the deadline
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        self._mark_duplicates(unique_urls, outcomes)
+        return self._batch_payload(unique_urls, outcomes)
+
+    async def _ascrape_batch(
+        self,
+        urls: List[str],
+        extract_type: str,
+        max_workers: int,
+        timeout: float,
+        backend: str,
+    ) -> Dict[str, Any]:
+        """
+        Async variant of _scrape_batch(), bounded by a semaphore instead of a thread pool.
+        
+        Args:
+            urls: The URLs to scrape
+            extract_type: Type of content to extract ('text', 'links', 'tables', or 'all')
+            max_workers: Maximum number of concurrent fetches
+            timeout: Overall time limit in seconds for the batch
+            backend: The HTML parser backend to use
             
-            # Parse the HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
+        Returns:
+            A dictionary with per-URL results in input order and success/failure counts
+        """
+        # Drop duplicates while keeping the original order
+        unique_urls = list(dict.fromkeys(urls))
+        fetch_urls, outcomes = self._skip_known_duplicates(unique_urls)
+        semaphore = asyncio.Semaphore(max(1, max_workers))
+        
+        async def scrape_bounded(page_url: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._ascrape(page_url, extract_type, backend)
+        
+        tasks = {
+            page_url: asyncio.ensure_future(scrape_bounded(page_url))
+            for page_url in fetch_urls
+        }
+        done, pending = await asyncio.wait(tasks.values(), timeout=timeout) if tasks else (set(), set())
+        for task in pending:
+            task.cancel()
+        
+        for page_url, task in tasks.items():
+            if task in done:
+                try:
+                    outcomes[page_url] = task.result()
+                except Exception as e:
+                    outcomes[page_url] = {"error": f"Error scraping webpage: {str(e)}"}
+            else:
+                outcomes[page_url] = {"error": f"Timed out after {timeout} seconds"}
+        
+        self._mark_duplicates(unique_urls, outcomes)
+        return self._batch_payload(unique_urls, outcomes)
+
+    @staticmethod
+    def _skip_known_duplicates(urls: List[str]) -> Tuple[List[str], Dict[str, Dict[str, Any]]]:
+        """
+        Pick the URLs of a batch that need fetching.
+        
+        A URL is skipped when an earlier URL in the batch is known to be the
+        same page, i.e. both map to the same canonical link seen in an
+        earlier scrape.
+        
+        Args:
+            urls: The unique URLs of the batch, in order
             
-            # Extract the requested information
-            result = {}
+        Returns:
+            The URLs to fetch, and the outcomes of the skipped ones
+        """
+        registry = get_canonical_registry()
+        claimed: Dict[str, str] = {}
+        fetch_urls = []
+        skipped = {}
+        for page_url in urls:
+            key = registry.canonical_key(page_url)
+            if key in claimed:
+                skipped[page_url] = {"duplicate_of": claimed[key]}
+            else:
+                claimed[key] = page_url
+                fetch_urls.append(page_url)
+        return fetch_urls, skipped
+
+    @staticmethod
+    def _mark_duplicates(urls: List[str], outcomes: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Replace the content of pages that repeat an earlier page of the batch.
+        
+        A page is a duplicate when it declares the same canonical link as an
+        earlier page or its text is a near-copy of one (mirrors, syndicated
+        articles). Only its metadata is kept, so the copy is not analyzed twice.
+        
+        Args:
+            urls: The unique URLs of the batch, in order
+            outcomes: The scrape outcome of each URL; updated in place
+        """
+        registry = get_canonical_registry()
+        index = NearDuplicateIndex()
+        claimed: Dict[str, str] = {}
+        for page_url in urls:
+            outcome = outcomes[page_url]
+            if "error" in outcome or "duplicate_of" in outcome:
+                continue
+            duplicate_of = claimed.setdefault(registry.canonical_key(page_url), page_url)
+            if duplicate_of == page_url and outcome.get("text"):
+                duplicate_of = index.check(page_url, outcome["text"]) or page_url
+            if duplicate_of != page_url:
+                outcomes[page_url] = {"duplicate_of": duplicate_of, "metadata": outcome.get("metadata", {})}
+
+    @staticmethod
+    def _batch_payload(urls: List[str], outcomes: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        results = [{"url": page_url, **outcomes[page_url]} for page_url in urls]
+        failed = sum(1 for result in results if "error" in result)
+        duplicates = sum(1 for result in results if "duplicate_of" in result)
+        return {
+            "results": results,
+            "succeeded": len(results) - failed - duplicates,
+            "failed": failed,
+            "duplicates": duplicates
+        }
+
+    @staticmethod
+    def _register_canonical(url: str, result: Dict[str, Any]) -> None:
+        canonical = page_canonical(result.get("metadata", {}))
+        if canonical:
+            get_canonical_registry().register(url, canonical)
+
+    def _scrape(self, url: str, extract_type: str, backend: str) -> Dict[str, Any]:
+        """
+        Scrape a single webpage and extract the requested information.
+        
+        Args:
+            url: The URL of the webpage to scrape
+            extract_type: Type of content to extract ('text', 'links', 'tables', or 'all')
+            backend: The HTML parser backend to use
+            
+        Returns:
+            A dictionary containing the extracted information, or an 'error' entry
+        """
+        # Validate URL
+        if not self._is_valid_url(url):
+            return {"error": f"Invalid URL: {url}"}
+        
+        # Fetch and parse the webpage, from the response cache when possible
+        try:
+            result = self._fetch_and_extract(url, sections_for(extract_type), backend)
+        except UnsupportedContentType as e:
+            return {"error": str(e)}
+        except requests.exceptions.RequestException as e:
+            return {"error": f"Failed to fetch URL: {str(e)}"}
+        self._register_canonical(url, result)
+        
+        # If no specific type was requested or found, return a basic summary
+        if not result:
+            title = result.get("metadata", {}).get("title") or "No title found"
+            result["summary"] = f"Could not extract {extract_type} from {url}. The page title is: {title}"
+        
+        return result
+    
+    async def _ascrape(self, url: str, extract_type: str, backend: str) -> Dict[str, Any]:
+        """
+        Async variant of _scrape().
+        
+        Args:
+            url: The URL of the webpage to scrape
+            extract_type: Type of content to extract ('text', 'links', 'tables', or 'all')
+            backend: The HTML parser backend to use
+            
+        Returns:
+            A dictionary containing the extracted information, or an 'error' entry
+        """
+        # Validate URL
+        if not self._is_valid_url(url):
+            return {"error": f"Invalid URL: {url}"}
+        
+        try:
+            result = await self._afetch_and_extract(url, sections_for(extract_type), backend)
+        except UnsupportedContentType as e:
+            return {"error": str(e)}
+        except ASYNC_HTTP_ERRORS as e:
+            return {"error": f"Failed to fetch URL: {str(e)}"}
+        self._register_canonical(url, result)
+        return result
+    
+    def _fetch_and_extract(self, url: str, sections: frozenset, backend: str) -> Dict[str, Any]:
+        """
+        Fetch a webpage and extract content while it downloads.
+        
+        Fresh cache entries are parsed without touching the network and stale
+        ones are revalidated with a conditional request. Network responses
+        are streamed: non-HTML content types are rejected before the body is
+        read, and reading stops once the extractor has everything it needs or
+        MAX_PAGE_BYTES have been received, so memory per page stays bounded.
+        
+        Args:
+            url: The URL of the webpage to fetch
+            sections: The content sections to extract
+            backend: The HTML parser backend to use
+            
+        Returns:
+            The extracted sections and metadata
+        """
+        cache = get_response_cache()
+        cached = cache.get(url)
+        if cached is not None and cached.is_fresh():
+            extracted = self._extract_body(url, sections, cached, backend)
+            # A prefix cached for a narrower request may not hold enough for this one
+            if extracted is not None:
+                return extracted
+            cached = None
+        if cached is not None and not cached.complete:
+            cached = None
+        
+        # Wait for this host's next free slot to be respectful to websites
+        get_host_scheduler().wait(url)
+        
+        # Fetch the webpage over the shared, pooled session
+        headers = cached.validators() if cached is not None else {}
+        response = get_session().get(url, headers=headers, timeout=DEFAULT_TIMEOUT, stream=True)
+        try:
+            if response.status_code == 304 and cached is not None:
+                return self._extract_body(url, sections, cache.revalidated(cached, response.headers), backend)
+            response.raise_for_status()
             
-            if extract_type in ["text", "all"]:
-                # Extract main text content
-                result["text"] = self._extract_text(soup)
+            content_type = response.headers.get("Content-Type", "")
+            _check_content_type(content_type)
             
-            if extract_type in ["links", "all"]:
-                # Extract links
-                result["links"] = self._extract_links(soup, url)
+            reader = _PageReader(url, sections, backend, content_type, self._extract_with_soup)
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                if reader.feed(chunk):
+                    break
+        finally:
+            response.close()
+        
+        cache.put(url, bytes(reader.body), response.headers, reader.encoding, complete=not reader.stopped_early)
+        return reader.result()
+    
+    async def _afetch_and_extract(self, url: str, sections: frozenset, backend: str) -> Dict[str, Any]:
+        """
+        Async variant of _fetch_and_extract() using the async HTTP client.
+        
+        Cache access and CPU-heavy parsing of cached bodies run in worker
+        threads so the event loop is never blocked for long.
+        
+        Args:
+            url: The URL of the webpage to fetch
+            sections: The content sections to extract
+            backend: The HTML parser backend to use
             
-            if extract_type in ["tables", "all"]:
-                # Extract tables
-                result["tables"] = self._extract_tables(soup)
+        Returns:
+            The extracted sections and metadata
+        """
+        cache = get_response_cache()
+        cached = await cache.aget(url)
+        if cached is not None and cached.is_fresh():
+            extracted = await asyncio.to_thread(self._extract_body, url, sections, cached, backend)
+            # A prefix cached for a narrower request may not hold enough for this one
+            if extracted is not None:
+                return extracted
+            cached = None
+        if cached is not None and not cached.complete:
+            cached = None
+        
+        # Wait for this host's next free slot to be respectful to websites
+        await get_host_scheduler().async_wait(url)
+        
+        headers = cached.validators() if cached is not None else {}
+        response = await async_send("GET", url, headers=headers, stream=True)
+        try:
+            if response.status_code == 304 and cached is not None:
+                cached = await cache.arevalidated(cached, response.headers)
+                return await asyncio.to_thread(self._extract_body, url, sections, cached, backend)
+            response.raise_for_status()
             
-            # Extract metadata
-            result["metadata"] = self._extract_metadata(soup)
+            content_type = response.headers.get("Content-Type", "")
+            _check_content_type(content_type)
             
-            # If no specific type was requested or found, return a basic summary
-            if not result:
-                result["summary"] = f"Could not extract {extract_type} from {url}. The page title is: {soup.title.string if soup.title else 'No title found'}"
+            reader = _PageReader(url, sections, backend, content_type, self._extract_with_soup)
+            async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                if reader.feed(chunk):
+                    break
+        finally:
+            await response.aclose()
+        
+        await cache.aput(url, bytes(reader.body), response.headers, reader.encoding, complete=not reader.stopped_early)
+        return await asyncio.to_thread(reader.result)
+    
+    def _extract_body(
+        self,
+        url: str,
+        sections: frozenset,
+        cached: CachedResponse,
+        backend: str,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Extract content from a body held in the response cache.
+        
+        Args:
+            url: The URL of the webpage
+            sections: The content sections to extract
+            cached: The cached response
+            backend: The HTML parser backend to use
             
-            return json.dumps(result, indent=2)
-        except Exception as e:
-            return json.dumps({"error": f"Error scraping webpage: {str(e)}"}, indent=2)
+        Returns:
+            The extracted sections and metadata, or None if the cached body is
+            a prefix that runs out before the requested sections are complete
+        """
+        html = cached.text
+        if backend == "bs4":
+            return self._extract_with_soup(url, sections, html)
+        try:
+            extractor = create_extractor(backend, url, sections)
+            extractor.feed(html)
+            extractor.close()
+        except Exception:
+            return self._extract_with_soup(url, sections, html)
+        if not cached.complete and not extractor.satisfied:
+            return None
+        return extractor.result()
+    
+    def _extract_with_soup(self, url: str, sections: frozenset, html: str) -> Dict[str, Any]:
+        """
+        Extract content with BeautifulSoup.
+        
+        This is the 'bs4' backend, and the fallback whenever a faster backend
+        fails on a page's markup.
+        
+        Args:
+            url: The URL of the webpage
+            sections: The content sections to extract
+            html: The HTML of the webpage
+            
+        Returns:
+            The extracted sections and metadata
+        """
+        # Parse the HTML
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Extract the requested information
+        result = {}
+        
+        if "text" in sections:
+            # Extract main text content
+            result["text"] = self._extract_text(soup)
+        
+        if "links" in sections:
+            # Extract links
+            result["links"] = self._extract_links(soup, url)
+        
+        if "tables" in sections:
+            # Extract tables
+            result["tables"] = self._extract_tables(soup)
+        
+        # Extract metadata
+        result["metadata"] = self._extract_metadata(soup, url)
+        
+        return result
     
     def _is_valid_url(self, url: str) -> bool:
         """
@@ -188,12 +759,13 @@ class WebScraperTool(BaseTool):
         # Limit to 5 tables
         return tables[:5]
     
-    def _extract_metadata(self, soup: BeautifulSoup) -> Dict[str, str]:
+    def _extract_metadata(self, soup: BeautifulSoup, base_url: str) -> Dict[str, str]:
         """
         Extract metadata from the HTML.
         
         Args:
             soup: The BeautifulSoup object
+            base_url: The base URL for resolving the canonical link
             
         Returns:
             A dictionary of metadata
@@ -221,4 +793,11 @@ class WebScraperTool(BaseTool):
                 property_name = tag['property'].replace('og:', '')
                 metadata[f"og_{property_name}"] = tag['content']
         
+        # Extract the canonical link
+        canonical = soup.find('link', rel='canonical', href=True)
+        if canonical:
+            canonical_url = resolve_link(canonical['href'], base_url)
+            if canonical_url:
+                metadata["canonical"] = canonical_url
+        
         return metadata 
\ No newline at end of file
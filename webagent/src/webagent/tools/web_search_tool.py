@@ -1,9 +1,15 @@
 from crewai.tools import BaseTool
-from typing import Type, List, Dict, Any
+from typing import Type, List, Dict, Any, Tuple
 from pydantic import BaseModel, Field
 import requests
 from bs4 import BeautifulSoup
 import json
+from webagent.tools.http_client import async_send, get_session, DEFAULT_TIMEOUT
+from webagent.tools.search_cache import get_search_cache
+
+
+# Smallest number of results requested from Serper for one query
+MIN_FETCH_RESULTS = 10
 
 
 class WebSearchToolInput(BaseModel):
@@ -31,8 +37,41 @@ class WebSearchTool(BaseTool):
             A JSON string containing search results
         """
         try:
-            # Use the Serper API to perform a real web search
-            results = self._search_with_serper(query, num_results)
+            # Serve repeated queries from the search cache
+            cache = get_search_cache()
+            results = cache.get(query, num_results)
+            if results is None:
+                # Use the Serper API to perform a real web search. A single
+                # Serper credit covers up to MIN_FETCH_RESULTS, so fetch at least
+                # that many and let smaller requests reuse the cached set.
+                fetch_count = max(num_results, MIN_FETCH_RESULTS)
+                fetched = self._search_with_serper(query, fetch_count)
+                cache.put(query, fetch_count, fetched)
+                results = fetched[:num_results]
+            return json.dumps(results, indent=2)
+        except Exception as e:
+            return f"Error performing web search: {str(e)}"
+    
+    async def _arun(self, query: str, num_results: int = 5) -> str:
+        """
+        Perform a web search without blocking the event loop.
+        
+        Args:
+            query: The search query
+            num_results: Number of results to return
+            
+        Returns:
+            A JSON string containing search results
+        """
+        try:
+            # Serve repeated queries from the search cache
+            cache = get_search_cache()
+            results = await cache.aget(query, num_results)
+            if results is None:
+                fetch_count = max(num_results, MIN_FETCH_RESULTS)
+                fetched = await self._asearch_with_serper(query, fetch_count)
+                await cache.aput(query, fetch_count, fetched)
+                results = fetched[:num_results]
             return json.dumps(results, indent=2)
         except Exception as e:
             return f"Error performing web search: {str(e)}"
@@ -48,6 +87,46 @@ class WebSearchTool(BaseTool):
         Returns:
             A list of search results
         """
+        url, headers, payload = self._serper_request(query, num_results)
+        
+        # Make the API request
+        response = get_session().post(url, headers=headers, json=payload, timeout=DEFAULT_TIMEOUT)
+        response.raise_for_status()
+        
+        # Parse the response
+        return self._parse_serper_response(response.json(), num_results)
+    
+    async def _asearch_with_serper(self, query: str, num_results: int) -> List[Dict[str, Any]]:
+        """
+        Perform a web search using the Serper API with the async HTTP client.
+        
+        Args:
+            query: The search query
+            num_results: Number of results to return
+            
+        Returns:
+            A list of search results
+        """
+        url, headers, payload = self._serper_request(query, num_results)
+        
+        # Make the API request
+        response = await async_send("POST", url, headers=headers, json=payload)
+        response.raise_for_status()
+        
+        # Parse the response
+        return self._parse_serper_response(response.json(), num_results)
+    
+    def _serper_request(self, query: str, num_results: int) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """
+        Build a Serper API search request.
+        
+        Args:
+            query: The search query
+            num_results: Number of results to return
+            
+        Returns:
+            The endpoint URL, headers and JSON payload
+        """
         # Serper API endpoint
         url = "https://google.serper.dev/search"
         
@@ -66,13 +145,19 @@ class WebSearchTool(BaseTool):
             "num": num_results
         }
         
-        # Make the API request
-        response = requests.post(url, headers=headers, json=payload)
-        response.raise_for_status()
-        
-        # Parse the response
-        data = response.json()
+        return url, headers, payload
+    
+    def _parse_serper_response(self, data: Dict[str, Any], num_results: int) -> List[Dict[str, Any]]:
+        """
+        Extract the organic search results from a Serper API response.
         
+        Args:
+            data: The decoded JSON response
+            num_results: Number of results to return
+            
+        Returns:
+            A list of search results
+        """
         # Extract the organic search results
         if "organic" in data:
             results = []
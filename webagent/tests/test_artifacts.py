@@ -0,0 +1,80 @@
+import os
+
+from webagent.artifacts import REPORT, ArtifactStore
+
+
+def test_runs_are_isolated(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    store.put("a", REPORT, "report a")
+    store.put("b", REPORT, "report b")
+
+    assert store.get("a", REPORT) == "report a"
+    assert store.get("b", REPORT) == "report b"
+    assert store.get_run("missing") == {}
+
+
+def test_evicted_runs_are_spilled_and_readable(tmp_path):
+    store = ArtifactStore(str(tmp_path), max_runs=1)
+    store.put("a", "web_search_task", "same output")
+    store.put("a", REPORT, "report a")
+    store.put("b", "web_search_task", "same output")
+
+    assert store.stats()["runs_spilled"] == 1
+    assert store.get_run("a") == {"web_search_task": "same output", REPORT: "report a"}
+
+
+def test_identical_artifacts_are_stored_once(tmp_path):
+    store = ArtifactStore(str(tmp_path), max_runs=1)
+    for run_id in ("a", "b", "c"):
+        store.put(run_id, "web_search_task", "same output")
+
+    objects = [name for _, _, names in os.walk(tmp_path / "objects") for name in names]
+    assert len(objects) == 1
+
+
+def test_writing_keeps_a_run_in_memory(tmp_path):
+    store = ArtifactStore(str(tmp_path), max_runs=2)
+    store.put("a", "t1", "early")
+    store.put("b", "t1", "b")
+    store.put("a", "t2", "later")
+    store.put("c", "t1", "c")
+
+    # b was written to least recently, so it is the one spilled
+    assert store.stats()["runs_in_memory"] == 2
+    assert store.get_run("a") == {"t1": "early", "t2": "later"}
+    assert store.get_run("b") == {"t1": "b"}
+
+
+def test_writing_to_a_spilled_run_keeps_its_earlier_artifacts(tmp_path):
+    store = ArtifactStore(str(tmp_path), max_runs=2)
+    store.put("a", "t1", "early")
+    store.put("b", "t1", "b")
+    store.put("c", "t1", "c")
+    store.put("a", "t2", "later")
+
+    assert store.get_run("a") == {"t1": "early", "t2": "later"}
+
+    # Spilling the run again keeps both artifacts on disk
+    store.put("d", "t1", "d")
+    store.put("e", "t1", "e")
+    assert store.get_run("a") == {"t1": "early", "t2": "later"}
+
+
+def test_evicted_runs_are_dropped_without_a_spill_directory():
+    store = ArtifactStore(None, max_runs=1)
+    store.put("a", REPORT, "report a")
+    store.put("b", REPORT, "report b")
+
+    assert store.get_run("a") == {}
+    assert store.stats()["runs_dropped"] == 1
+
+
+def test_prune_deletes_expired_runs_and_their_artifacts(tmp_path):
+    store = ArtifactStore(str(tmp_path), max_runs=1)
+    store.put("a", REPORT, "report a")
+    store.put("b", REPORT, "report b")
+
+    store.retention_seconds = -1
+    assert store.prune() == 1
+    assert store.get_run("a") == {}
+    assert not [name for _, _, names in os.walk(tmp_path / "objects") for name in names]
@@ -0,0 +1,29 @@
+from webagent.tools import content_analyzer_tool
+from webagent.tools.content_analyzer_tool import AnalysisDocument, ContentAnalyzerTool
+
+
+def test_short_mirrored_snippets_are_reported_as_duplicates():
+    snippet = "Tesla shares fell 12 percent on Thursday after the company missed delivery estimates for the quarter."
+    documents = [
+        {"url": "https://a.example/tesla", "content": snippet},
+        {"url": "https://b.example/tesla", "content": "  " + snippet.upper().replace(" on ", " -- on ")},
+        {"url": "https://c.example/rates", "content": "The central bank raised interest rates by a quarter point to fight inflation."},
+    ]
+
+    result = ContentAnalyzerTool()._analyze_batch(documents, ["summary"])
+
+    assert result["duplicates"] == 1
+    assert result["documents"][1] == {"source": "https://b.example/tesla", "duplicate_of": "https://a.example/tesla"}
+    assert result["analyzed"] == 2
+
+
+def test_summary_and_key_points_tokenize_each_sentence_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr(content_analyzer_tool, "tokenize", lambda text: calls.append(text) or text.split())
+    sentences = [f"Sentence {index} is important for topic {index % 3}." for index in range(8)]
+    document = AnalysisDocument(" ".join(sentences + sentences[:2]))
+    tool = ContentAnalyzerTool()
+
+    assert len(tool._generate_summary(document).split(". ")) == 3
+    assert tool._extract_key_points(document)
+    assert len(calls) == 10
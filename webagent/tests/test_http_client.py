@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+from urllib3.exceptions import ConnectTimeoutError, MaxRetryError, ReadTimeoutError
+
+from webagent.tools import http_client
+
+
+def test_post_is_not_retried_on_status_or_read_errors():
+    retry = http_client._build_adapter().max_retries
+
+    assert retry.is_retry("GET", 503)
+    assert not retry.is_retry("POST", 503)
+    with pytest.raises(ReadTimeoutError):
+        retry.increment(method="POST", url="/search", error=ReadTimeoutError(None, "/search", "timed out"))
+
+
+def test_post_is_retried_when_the_connection_fails():
+    retry = http_client._build_adapter().max_retries
+
+    retry = retry.increment(method="POST", url="/search", error=ConnectTimeoutError())
+    assert retry.connect == http_client._settings["max_retries"] - 1
+    with pytest.raises(MaxRetryError):
+        for _ in range(http_client._settings["max_retries"]):
+            retry = retry.increment(method="POST", url="/search", error=ConnectTimeoutError())
+
+
+@pytest.mark.parametrize("method, attempts", [("POST", 1), ("GET", 4)])
+def test_async_send_only_retries_safe_methods(monkeypatch, method, attempts):
+    httpx = pytest.importorskip("httpx")
+    monkeypatch.setitem(http_client._settings, "max_retries", 3)
+    monkeypatch.setitem(http_client._settings, "backoff_factor", 0)
+    requests = []
+
+    def handler(request):
+        requests.append(request.method)
+        return httpx.Response(503)
+
+    async def send():
+        loop = asyncio.get_running_loop()
+        http_client._async_clients[loop] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await http_client.async_send(method, "https://api.example.com/search")
+        finally:
+            await http_client.aclose_async_client()
+
+    assert asyncio.run(send()).status_code == 503
+    assert requests == [method] * attempts
@@ -0,0 +1,128 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from webagent import jobs
+from webagent.artifacts import REPORT, ArtifactStore
+from webagent.checkpoints import CheckpointStore
+from webagent.jobs import CANCELLED, RUNNING, SUCCEEDED, JobManager
+from webagent.report_cache import CachedReport
+
+
+class StubFactory:
+    """Crew factory whose runs finish when the test releases them."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.kickoffs = 0
+
+    def kickoff(self, query, days, task_callbacks=(), start_callbacks=(), cancel_event=None, completed=None):
+        self.kickoffs += 1
+        self.release.wait(5)
+        if cancel_event is not None and cancel_event.is_set():
+            raise jobs.RunCancelled()
+        for callback in task_callbacks:
+            callback(SimpleNamespace(raw="results"), SimpleNamespace(name="web_search_task"))
+        return SimpleNamespace(raw=f"report on {query}")
+
+
+@pytest.fixture
+def factory(monkeypatch, tmp_path):
+    factory = StubFactory()
+    artifacts = ArtifactStore(None)
+    checkpoints = CheckpointStore(str(tmp_path / "checkpoints.sqlite3"))
+    monkeypatch.setattr(jobs, "get_crew_factory", lambda: factory)
+    monkeypatch.setattr(jobs, "get_artifact_store", lambda: artifacts)
+    monkeypatch.setattr(jobs, "get_checkpoint_store", lambda: checkpoints)
+    monkeypatch.setattr(jobs, "get_report_cache", lambda: None)
+    return factory
+
+
+def wait_until_done(manager, job_id):
+    deadline = time.time() + 5
+    while not manager.get(job_id).done:
+        assert time.time() < deadline
+        time.sleep(0.01)
+    return manager.get(job_id)
+
+
+def wait_until_running(manager, job_id):
+    deadline = time.time() + 5
+    while manager.get(job_id).status != RUNNING:
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+
+def test_identical_questions_share_one_run(factory):
+    manager = JobManager(max_workers=4)
+    first = manager.submit("Why did Tesla stock fall?", 7)
+    wait_until_running(manager, first)
+    second = manager.submit("why did tesla stock fall", 7)
+    other = manager.submit("When did Tesla stock fall?", 7)
+
+    assert manager.get(second).follows == first
+    assert manager.get(second).status == RUNNING
+    factory.release.set()
+
+    for job_id in (first, second, other):
+        assert wait_until_done(manager, job_id).status == SUCCEEDED
+    assert factory.kickoffs == 2
+    assert jobs.get_artifact_store().get(second, REPORT) == "report on Why did Tesla stock fall?"
+    assert jobs.get_artifact_store().get(second, "web_search_task") == "results"
+    assert manager.stats()["followed"] == 1
+
+
+def test_cancelling_a_follower_leaves_the_run_going(factory):
+    manager = JobManager(max_workers=4)
+    first = manager.submit("question", 7)
+    second = manager.submit("question", 7)
+
+    assert manager.cancel(second)
+    assert manager.get(second).status == CANCELLED
+    factory.release.set()
+    assert wait_until_done(manager, first).status == SUCCEEDED
+
+
+def test_cancelling_the_leader_keeps_researching_for_followers(factory):
+    manager = JobManager(max_workers=4)
+    first = manager.submit("question", 7)
+    wait_until_running(manager, first)
+    second = manager.submit("question", 7)
+
+    assert manager.cancel(first)
+    assert manager.get(first).status == CANCELLED
+    factory.release.set()
+
+    assert wait_until_done(manager, second).status == SUCCEEDED
+    assert wait_until_done(manager, first).status == CANCELLED
+
+
+def test_run_stops_once_everyone_cancelled(factory):
+    manager = JobManager(max_workers=4)
+    first = manager.submit("question", 7)
+    wait_until_running(manager, first)
+    second = manager.submit("question", 7)
+
+    manager.cancel(first)
+    manager.cancel(second)
+    factory.release.set()
+
+    assert wait_until_done(manager, first).status == CANCELLED
+    assert manager.stats()["succeeded"] == 0
+
+
+def test_resumed_job_answered_from_the_cache_drops_its_checkpoint(factory, monkeypatch):
+    cached = CachedReport(query="question", days=7, report="cached report", created_at=time.time())
+    monkeypatch.setattr(jobs, "get_report_cache", lambda: SimpleNamespace(get=lambda query, days: cached))
+    checkpoints = jobs.get_checkpoint_store()
+    checkpoints.start("job", "question", 7)
+    checkpoints.save("job", "web_search_task", "results")
+    manager = JobManager()
+
+    assert manager.resume("job")
+    assert wait_until_done(manager, "job").status == SUCCEEDED
+    assert jobs.get_artifact_store().get("job", REPORT) == "cached report"
+    assert checkpoints.load("job") is None
+    assert factory.kickoffs == 0
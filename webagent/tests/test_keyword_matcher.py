@@ -0,0 +1,49 @@
+import pytest
+
+from webagent.tools.keyword_matcher import KeywordMatcher, load_lexicon, tokenize
+
+
+def test_tokenize_keeps_inner_apostrophes():
+    assert tokenize("don't stop, it's 2025!") == ["don't", "stop", "it's", "2025"]
+
+
+def test_matches_whole_words_only():
+    matcher = KeywordMatcher({"sad": -1.0})
+
+    assert list(matcher.iter_matches(tokenize("a crusade"))) == []
+    assert list(matcher.iter_matches(tokenize("a sad day"))) == [(1, "sad", -1.0)]
+
+
+def test_matches_overlapping_multi_word_terms():
+    matcher = KeywordMatcher({"interest": 1.0, "interest rates": 2.0, "rates rise": 3.0, "central bank": 1.5})
+
+    matches = list(matcher.iter_matches(tokenize("the central bank says interest rates rise")))
+    assert sorted(matches) == [
+        (1, "central bank", 1.5), (4, "interest", 1.0), (4, "interest rates", 2.0), (5, "rates rise", 3.0),
+    ]
+
+
+def test_falls_back_after_a_partial_match():
+    matcher = KeywordMatcher({"new york times": 1.0, "york": 2.0})
+
+    assert list(matcher.iter_matches(tokenize("new york city"))) == [(1, "york", 2.0)]
+    assert matcher.contains_any(tokenize("the new york times"))
+    assert not matcher.contains_any(tokenize("boston"))
+
+
+def test_terms_and_empty_terms():
+    matcher = KeywordMatcher({"good": 1.0, "  ": 5.0})
+
+    assert len(matcher) == 1
+    assert matcher.terms() == {"good": 1.0}
+
+
+@pytest.mark.parametrize("name, content", [
+    ("lexicon.json", '{"upbeat": 0.5, "dismal": -1}'),
+    ("lexicon.tsv", "# sentiment\nupbeat\t0.5\n\ndismal\t-1\n"),
+])
+def test_load_lexicon(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content, encoding="utf-8")
+
+    assert load_lexicon(str(path)) == {"upbeat": 0.5, "dismal": -1.0}
@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+from webagent import main
+from webagent.artifacts import ArtifactStore
+from webagent.checkpoints import CheckpointStore
+from webagent.report_cache import CachedReport
+
+
+class FailingFactory:
+    def kickoff(self, query, days, task_callbacks=(), completed=None):
+        for callback in task_callbacks:
+            callback("results", SimpleNamespace(name="web_search_task"))
+        raise RuntimeError("model unavailable")
+
+
+@pytest.fixture
+def stores(monkeypatch, tmp_path):
+    checkpoints = CheckpointStore(str(tmp_path / "checkpoints.sqlite3"))
+    monkeypatch.setenv("NVIDIA_NIM_API_KEY", "test")
+    monkeypatch.setattr(main, "get_artifact_store", lambda: ArtifactStore(None))
+    monkeypatch.setattr(main, "get_checkpoint_store", lambda: checkpoints)
+    monkeypatch.setattr(main, "get_report_cache", lambda: None)
+    return checkpoints
+
+
+def test_failed_run_reports_its_run_id(monkeypatch, stores):
+    monkeypatch.setattr(main, "get_crew_factory", lambda: FailingFactory())
+
+    with pytest.raises(main.ResearchFailed) as error:
+        main.run_web_research("question")
+
+    assert error.value.run_id in str(error.value)
+    assert stores.load(error.value.run_id).outputs == {"web_search_task": "results"}
+
+
+def test_resumed_run_answered_from_the_cache_drops_its_checkpoint(monkeypatch, stores):
+    cached = CachedReport(query="question", days=7, report="cached report")
+    monkeypatch.setattr(main, "get_report_cache", lambda: SimpleNamespace(get=lambda query, days: cached))
+    stores.start("run", "question", 7)
+
+    assert main.run_web_research("question", run_id="run") == "cached report"
+    assert stores.load("run") is None
@@ -0,0 +1,48 @@
+from webagent.tools.near_duplicates import NearDuplicateIndex, hamming_distance, simhash
+
+ARTICLE = (
+    "Tesla shares fell 12 percent on Thursday after the carmaker reported quarterly deliveries well below "
+    "analyst estimates. The company blamed production changes at its largest factories and weaker demand in "
+    "Europe and China, where competition from cheaper electric vehicles has intensified over the past year. "
+    "Analysts said the miss raised questions about the growth targets the chief executive set in January, "
+    "and several lowered their price targets for the stock after the announcement."
+)
+
+
+def test_similar_texts_have_close_fingerprints():
+    mirrored = ARTICLE.upper().replace(" The company", " Meanwhile, the company")
+
+    assert simhash(ARTICLE) == simhash(ARTICLE.lower() + "  ")
+    assert hamming_distance(simhash(ARTICLE), simhash(mirrored)) <= 3
+    assert hamming_distance(simhash(ARTICLE), simhash("The central bank raised interest rates again.")) > 10
+
+
+def test_index_reports_the_first_copy():
+    index = NearDuplicateIndex(min_words=50)
+
+    assert index.check("https://a.example/tesla", ARTICLE) is None
+    assert index.check("https://b.example/tesla", ARTICLE + " Reporting by a staff writer.") == "https://a.example/tesla"
+    assert index.check("https://c.example/rates", ARTICLE.replace("Tesla", "Ford").replace("shares", "bonds")) is None
+
+
+def test_short_texts_are_never_reported():
+    index = NearDuplicateIndex(min_words=50)
+    headline = "Tesla shares fall after delivery miss"
+
+    assert index.check("a", headline) is None
+    assert index.check("b", headline) is None
+
+    index = NearDuplicateIndex(min_words=5)
+    assert index.check("a", headline) is None
+    assert index.check("b", headline) == "a"
+
+
+def test_find_uses_every_band():
+    index = NearDuplicateIndex(max_distance=3)
+    fingerprint = simhash(ARTICLE)
+    index.add("original", fingerprint)
+
+    # Flip one bit in each of three different bands
+    for bit in (0, 20, 40):
+        assert index.find(fingerprint ^ (1 << bit)) == "original"
+    assert index.find(fingerprint ^ 0b1111) is None
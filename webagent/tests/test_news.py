@@ -0,0 +1,102 @@
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from webagent.tools import news_aggregator_tool
+from webagent.tools.news_aggregator_tool import NewsAggregatorTool
+from webagent.tools.news_feeds import FeedPoller, fetch_feed, parse_date, parse_feed
+from webagent.tools.news_store import NewsStore
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+# Long enough for the fixtures' 2025 dates to stay inside the look-back window and retention period
+ALL_TIME = 100000
+
+
+@pytest.fixture
+def store(tmp_path):
+    return NewsStore(str(tmp_path / "news.sqlite3"), retention_days=ALL_TIME)
+
+
+def test_parse_rss_feed():
+    articles = parse_feed((FIXTURES / "rss.xml").read_bytes(), "https://markets.example.com/rss")
+
+    assert [article["title"] for article in articles] == [
+        "Tesla shares fall after delivery miss", "Central bank raises interest rates",
+    ]
+    tesla, rates = articles
+    assert tesla["summary"] == "Tesla stock fell 12 percent on Thursday after the carmaker missed quarterly delivery estimates."
+    assert tesla["entry_id"] == "markets-1001"
+    assert tesla["source"] == "Example Markets"
+    assert tesla["published_at"] == parse_date("2025-01-02T15:30:00Z")
+    # Without a GUID the link identifies the entry
+    assert rates["entry_id"] == "https://markets.example.com/rates"
+
+
+def test_parse_atom_feed():
+    (article,) = parse_feed((FIXTURES / "atom.xml").read_bytes())
+
+    assert article["url"] == "https://tech.example.com/ai-chip"
+    assert article["entry_id"] == "tag:tech.example.com,2025:42"
+    assert article["source"] == "Example Tech"
+    assert article["published_at"] == parse_date("Fri, 03 Jan 2025 08:00:00 GMT")
+
+
+def test_parse_feed_skips_seen_entries_and_rejects_invalid_xml():
+    assert len(parse_feed((FIXTURES / "rss.xml").read_bytes(), seen={"markets-1001"})) == 1
+    with pytest.raises(ValueError):
+        parse_feed(b"<rss><channel>", "https://broken.example.com/rss")
+
+
+def test_fetch_local_feed_is_conditional():
+    url = (FIXTURES / "rss.xml").as_uri()
+
+    fetched = fetch_feed(url)
+    assert fetched.body == (FIXTURES / "rss.xml").read_bytes()
+
+    assert fetch_feed(url, last_modified=fetched.last_modified).body is None
+
+
+def test_poll_indexes_feeds_once(store):
+    poller = FeedPoller(feeds=[(FIXTURES / "rss.xml").as_uri(), (FIXTURES / "atom.xml").as_uri()], store=store)
+
+    assert poller.poll_once() == 3
+    assert poller.poll_once() == 0
+    assert poller.stats()["feeds_not_modified"] == 2
+
+
+def test_search_ranks_matches_within_the_window(store):
+    now = time.time()
+    store.add_articles([
+        {"title": "Tesla shares fall", "summary": "Deliveries missed estimates.", "url": "https://a.example/1",
+         "source": "A", "published_at": now - 3600},
+        {"title": "Rates rise", "summary": "Tesla is not mentioned in the headline here.", "url": "https://a.example/2",
+         "source": "A", "published_at": now - 7200},
+        {"title": "Tesla opens a factory", "summary": "An older story.", "url": "https://a.example/3",
+         "source": "A", "published_at": now - 10 * 86400},
+    ])
+
+    assert [article["url"] for article in store.search("tesla", 7, 5)] == ["https://a.example/1", "https://a.example/2"]
+    assert [article["url"] for article in store.search("tesla", 7, 1, page=2)] == ["https://a.example/2"]
+    assert store.search("volcano", 7, 5) == []
+
+
+def test_is_empty_until_articles_are_added(store):
+    assert store.is_empty()
+
+    store.add_articles([{"title": "Tesla shares fall", "url": "https://a.example/1", "published_at": time.time()}])
+    assert not store.is_empty()
+
+
+def test_lookup_does_not_wait_for_the_poll_when_the_index_has_articles(monkeypatch, store):
+    poller = FeedPoller(feeds=[(FIXTURES / "rss.xml").as_uri()], store=store)
+    poller.poll_once()
+    monkeypatch.setattr(poller, "start", lambda: None)
+    monkeypatch.setattr(poller, "wait_until_ready", lambda: pytest.fail("waited for the first poll"))
+    monkeypatch.setattr(news_aggregator_tool, "get_feed_poller", lambda: poller)
+    monkeypatch.setattr(news_aggregator_tool, "get_news_store", lambda: store)
+
+    articles = json.loads(NewsAggregatorTool()._run("interest rates", days=ALL_TIME))
+    assert articles[0]["url"] == "https://markets.example.com/rates"
@@ -0,0 +1,63 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from webagent.tools.politeness import HostScheduler
+
+
+@pytest.fixture
+def server():
+    """A local host whose robots.txt answers with the status and body the test sets."""
+
+    class Handler(BaseHTTPRequestHandler):
+        status = 200
+        body = b"User-agent: *\nCrawl-delay: 4\n"
+        requests = []
+
+        def do_GET(self):
+            Handler.requests.append(self.path)
+            self.send_response(Handler.status)
+            self.send_header("Content-Length", str(len(Handler.body)))
+            self.end_headers()
+            self.wfile.write(Handler.body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}", Handler
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_crawl_delay_spaces_requests(server):
+    host, _ = server
+    scheduler = HostScheduler(min_interval=1.0)
+
+    assert scheduler.reserve(f"{host}/a") == 0
+    assert scheduler.reserve(f"{host}/b") == pytest.approx(4.0, abs=0.5)
+
+
+def test_robots_txt_is_fetched_once_and_its_lock_dropped(server):
+    host, handler = server
+    scheduler = HostScheduler(min_interval=0.0)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda index: scheduler.reserve(f"{host}/{index}"), range(8)))
+
+    assert handler.requests == ["/robots.txt"]
+    assert scheduler._robots_locks == {}
+
+
+def test_failed_robots_txt_is_not_retried(server):
+    host, handler = server
+    handler.status = 503
+    scheduler = HostScheduler(min_interval=0.5)
+
+    scheduler.reserve(f"{host}/a")
+    assert scheduler.reserve(f"{host}/b") == pytest.approx(0.5, abs=0.2)
+    assert handler.requests == ["/robots.txt"]
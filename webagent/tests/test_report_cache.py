@@ -0,0 +1,86 @@
+import hashlib
+import time
+
+import numpy as np
+
+from webagent.report_cache import DEFAULT_MAX_DISTANCE, ReportCache, normalize_question
+
+SYNONYMS = {"drop": "fall", "dropped": "fall", "shares": "stock"}
+
+
+def blind_embed(query):
+    """Bag-of-words embedding that, like small sentence models, ignores question and negation words."""
+    vector = np.zeros(64, dtype=np.float32)
+    for word in normalize_question(query).split():
+        if word not in ("why", "when", "how", "not", "didn", "t", "did", "does"):
+            word = SYNONYMS.get(word, word)
+            vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % 64] += 1
+    return vector.tolist()
+
+
+def test_normalize_question_keeps_question_and_negation_words():
+    assert normalize_question("Why did Tesla stock fall?") != normalize_question("When did Tesla stock fall?")
+    assert normalize_question("Why did Tesla stock fall?") != normalize_question("Why didn't Tesla stock fall?")
+    assert normalize_question("Could you tell me why the Tesla stock fell") == normalize_question("why Tesla stock fell")
+
+
+def test_exact_wording_hits(tmp_path):
+    cache = ReportCache(str(tmp_path / "reports.sqlite3"), max_distance=0)
+    cache.put("Why did Tesla stock fall?", 7, "report", {"web_search_task": "results"})
+
+    cached = cache.get("why did tesla stock fall", 7)
+    assert cached.report == "report"
+    assert cached.outputs == {"web_search_task": "results"}
+    assert not cached.stale
+
+
+def test_different_questions_and_windows_miss(tmp_path):
+    cache = ReportCache(str(tmp_path / "reports.sqlite3"), max_distance=0)
+    cache.put("Why did Tesla stock fall?", 7, "report")
+
+    assert cache.get("When did Tesla stock fall?", 7) is None
+    assert cache.get("Why did Tesla stock fall?", 1) is None
+    assert cache.stats()["misses"] == 2
+
+
+def test_expired_reports_are_stale_then_dropped(tmp_path):
+    cache = ReportCache(str(tmp_path / "reports.sqlite3"), ttl_minutes_per_day=1, stale_factor=2, max_distance=0)
+    cache.put("question", 1, "report")
+    cache._connection.execute("UPDATE reports SET created_at = ?", (time.time() - 90,))
+
+    assert cache.get("question", 1).stale
+
+    cache._connection.execute("UPDATE reports SET created_at = ?", (time.time() - 150,))
+    assert cache.get("question", 1) is None
+
+
+def test_paraphrases_match_by_embedding(tmp_path):
+    vectors = {"why did tesla stock fall": [1.0, 0.0], "why did tesla shares drop": [0.99, 0.1]}
+    cache = ReportCache(
+        str(tmp_path / "reports.sqlite3"), max_distance=0.05, embed=lambda query: vectors.get(query, [0.0, 1.0])
+    )
+    cache.put("why did tesla stock fall", 7, "report")
+
+    assert cache.get("why did tesla shares drop", 7).query == "why did tesla stock fall"
+    assert cache.get("something else", 7) is None
+    assert cache.stats()["paraphrase_hits"] == 1
+
+
+def test_only_one_refresh_is_claimed(tmp_path):
+    cache = ReportCache(str(tmp_path / "reports.sqlite3"), max_distance=0)
+
+    assert cache.claim_refresh("question", 7)
+    assert not cache.claim_refresh("Question?", 7)
+    cache.release_refresh("question", 7)
+    assert cache.claim_refresh("question", 7)
+
+
+def test_paraphrases_must_ask_the_same_kind_of_question(tmp_path):
+    cache = ReportCache(str(tmp_path / "reports.sqlite3"), max_distance=DEFAULT_MAX_DISTANCE, embed=blind_embed)
+    cache.put("Why did Tesla stock fall?", 7, "why report")
+
+    assert cache.get("Why did Tesla shares drop?", 7).report == "why report"
+    assert cache.get("When did Tesla stock fall?", 7) is None
+    assert cache.get("Why didn't Tesla stock fall?", 7) is None
+    assert cache.get("How did Tesla stock fall?", 7) is None
+    assert cache.stats()["paraphrase_hits"] == 1
@@ -0,0 +1,103 @@
+import hashlib
+import threading
+import time
+
+import numpy as np
+import pytest
+
+chromadb = pytest.importorskip("chromadb")
+from chromadb import EmbeddingFunction
+
+from webagent.tools.research_memory import ResearchMemory, chunk_text, describe_age
+
+
+class HashEmbeddingFunction(EmbeddingFunction):
+    """Bag-of-words embedding that needs no model download."""
+
+    def __init__(self):
+        pass
+
+    def __call__(self, input):
+        vectors = []
+        for text in input:
+            vector = np.zeros(256, dtype=np.float32)
+            for word in text.lower().split():
+                vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % 256] += 1
+            vectors.append(vector / (np.linalg.norm(vector) or 1))
+        return vectors
+
+    @staticmethod
+    def name():
+        return "hash"
+
+    def get_config(self):
+        return {}
+
+    @staticmethod
+    def build_from_config(config):
+        return HashEmbeddingFunction()
+
+
+@pytest.fixture
+def memory(tmp_path):
+    return ResearchMemory(path=str(tmp_path), embedding_function=HashEmbeddingFunction())
+
+
+def test_chunks_overlap():
+    chunks = chunk_text(" ".join(map(str, range(450))), size=200, overlap=40)
+
+    assert [len(chunk.split()) for chunk in chunks] == [200, 200, 130]
+    assert chunks[1].split()[0] == "160"
+
+
+def test_describe_age():
+    assert describe_age(100.0, now=130.0) == "just now"
+    assert describe_age(0.0, now=3 * 3600 + 5) == "3 hours ago"
+    assert describe_age(0.0, now=86400) == "1 day ago"
+
+
+def test_recall_skips_news_older_than_the_look_back_window(memory):
+    memory.remember("tesla stock fell after the earnings call", "https://old", "news", "tesla")
+    memory.remember("tesla stock fell after the delivery numbers", "https://new", "news", "tesla")
+    memory.remember("tesla stock history and how its shares are traded", "https://page", "page", "tesla")
+    old = memory._collection.get(where={"source": "https://old"})
+    memory._collection.update(
+        ids=old["ids"], metadatas=[dict(metadata, stored_at=time.time() - 10 * 86400) for metadata in old["metadatas"]]
+    )
+
+    sources = {chunk["source"] for chunk in memory.recall("tesla stock fell", max_distance=2)}
+    assert sources == {"https://old", "https://new", "https://page"}
+
+    sources = {chunk["source"] for chunk in memory.recall("tesla stock fell", max_distance=2, days=7)}
+    assert sources == {"https://new", "https://page"}
+
+
+def test_notes_show_their_age(memory):
+    memory.remember("the central bank raised interest rates", "https://rates", "news", "rates")
+
+    notes = memory.recall_notes("central bank interest rates", days=7)
+    assert notes.startswith("[news: https://rates, stored just now]")
+
+
+def test_recall_does_not_wait_for_a_write(tmp_path):
+    embedding, release = threading.Event(), threading.Event()
+
+    class SlowEmbeddingFunction(HashEmbeddingFunction):
+        def __call__(self, input):
+            if any("slow" in text for text in input):
+                embedding.set()
+                release.wait(10)
+            return super().__call__(input)
+
+    memory = ResearchMemory(path=str(tmp_path), embedding_function=SlowEmbeddingFunction())
+    memory.remember("the central bank raised interest rates", "https://rates", "news", "rates")
+    writer = threading.Thread(target=memory.remember, args=("a slow page to embed", "https://slow", "page"))
+    writer.start()
+    try:
+        assert embedding.wait(5)
+        started = time.time()
+        assert memory.recall("central bank interest rates")
+        assert time.time() - started < 5
+    finally:
+        release.set()
+        writer.join()
@@ -0,0 +1,16 @@
+from webagent.tools.search_cache import SearchCache, normalize_query
+
+
+def test_normalize_query_keeps_question_and_negation_words():
+    assert normalize_query("The latest AI news") == normalize_query("latest ai news!")
+    assert normalize_query("Why did Tesla stock fall?") != normalize_query("When did Tesla stock fall?")
+    assert normalize_query("Why did Tesla stock fall?") != normalize_query("Why didn't Tesla stock fall?")
+    assert normalize_query("Who is the CEO of Tesla") != normalize_query("Where is the CEO of Tesla")
+
+
+def test_different_questions_do_not_share_results(tmp_path):
+    cache = SearchCache(str(tmp_path / "search.sqlite3"))
+    cache.put("Why did Tesla stock fall?", 5, [{"title": "why"}])
+
+    assert cache.get("why did tesla stock fall", 5) == [{"title": "why"}]
+    assert cache.get("When did Tesla stock fall?", 5) is None
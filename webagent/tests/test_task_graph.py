@@ -0,0 +1,105 @@
+import threading
+import time
+
+import pytest
+from crewai import Task
+from crewai.crews.crew_output import CrewOutput
+from crewai.tasks.task_output import TaskOutput
+from crewai.types.usage_metrics import UsageMetrics
+
+from webagent.task_graph import RunCancelled, TaskGraph
+
+
+class StubGraph(TaskGraph):
+    """Task graph whose tasks return their name instead of calling an LLM."""
+
+    def __init__(self, tasks, run=None, **kwargs):
+        super().__init__([], tasks, verbose=False, **kwargs)
+        self.run = run or {}
+        self.executed = []
+        self.contexts = {}
+
+    def _execute(self, task, inputs):
+        with self._lock:
+            self.executed.append(task.name)
+            self.contexts[task.name] = [other.output.raw for other in self._dependencies[id(task)]]
+        if task.name in self.run:
+            self.run[task.name]()
+        task.output = TaskOutput(description=task.description, name=task.name, raw=f"{task.name} output", agent="")
+        return CrewOutput(raw=task.output.raw, tasks_output=[task.output], token_usage=UsageMetrics())
+
+
+def make_task(name, context=None):
+    return Task(name=name, description=f"Do {name}", expected_output=f"{name} output", context=context or [])
+
+
+@pytest.fixture
+def tasks():
+    search = make_task("search")
+    news = make_task("news")
+    report = make_task("report", [search, news])
+    return search, news, report
+
+
+def test_independent_tasks_run_concurrently_and_join(tasks):
+    both_started = threading.Barrier(2, timeout=5)
+    graph = StubGraph(tasks, run={"search": both_started.wait, "news": both_started.wait})
+
+    result = graph.kickoff()
+
+    assert graph.executed[-1] == "report"
+    assert sorted(graph.contexts["report"]) == ["news output", "search output"]
+    assert result.raw == "report output"
+    assert [output.raw for output in result.tasks_output] == ["search output", "news output", "report output"]
+
+
+def test_tasks_may_only_depend_on_earlier_tasks():
+    later = make_task("later")
+    with pytest.raises(ValueError):
+        StubGraph([make_task("first", [later]), later])
+
+
+def test_completed_tasks_are_restored_instead_of_run(tasks):
+    graph = StubGraph(tasks)
+    finished = []
+
+    result = graph.kickoff(
+        task_callbacks=[lambda output, task: finished.append((task.name, output.raw))],
+        completed={"search": "saved search output"},
+    )
+
+    assert sorted(graph.executed) == ["news", "report"]
+    assert sorted(graph.contexts["report"]) == ["news output", "saved search output"]
+    assert finished[0] == ("search", "saved search output")
+    assert result.tasks_output[0].raw == "saved search output"
+
+
+def test_a_fully_completed_run_only_restores(tasks):
+    graph = StubGraph(tasks)
+
+    result = graph.kickoff(completed={"search": "s", "news": "n", "report": "r"})
+
+    assert graph.executed == []
+    assert result.raw == "r"
+
+
+def test_cancelling_skips_tasks_not_yet_started(tasks):
+    cancel = threading.Event()
+    graph = StubGraph(tasks, run={"search": cancel.set, "news": lambda: time.sleep(0.1)})
+
+    with pytest.raises(RunCancelled):
+        graph.kickoff(cancel_event=cancel)
+    assert "report" not in graph.executed
+
+
+def test_a_failing_task_fails_the_run(tasks):
+    def fail():
+        raise RuntimeError("search failed")
+
+    graph = StubGraph(tasks, run={"search": fail})
+    started = []
+
+    with pytest.raises(RuntimeError, match="search failed"):
+        graph.kickoff(start_callbacks=[lambda task: started.append(task.name)])
+    assert "report" not in graph.executed
+    assert "report" not in started